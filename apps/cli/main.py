@@ -17,9 +17,7 @@ from core.io import load_text_from_file
 from pyfiglet import Figlet
 from colorama import Fore, Style, init
 from datetime import datetime
-import requests
 import json
-import torch
 import logging
 
 # Import configuration from the new config module
@@ -41,10 +39,8 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Created by core.export_pdf on first export, not at import
 OUTPUT_PATH = Path(OUTPUT_DIR)
-OUTPUT_PATH.mkdir(exist_ok=True)
-MODELS_DIR = Path("models")
-MODELS_DIR.mkdir(exist_ok=True)
 
 init(autoreset=True)
 
@@ -76,8 +72,8 @@ def print_mode_banner(mode):
     clear_terminal()
     f = Figlet(font='slant')
     print(Fore.CYAN + f.renderText("StudySage"))
-    mode_text = "OFFLINE MODE" if mode == "offline" else "ONLINE MODE"
-    mode_color = Fore.GREEN if mode == "offline" else Fore.BLUE
+    mode_text = f"{mode.upper()} MODE"
+    mode_color = {"offline": Fore.GREEN, "online": Fore.BLUE}.get(mode, Fore.MAGENTA)
     print(mode_color + "=" * 50)
     print(mode_color + f"🎯 {mode_text} ACTIVATED")
     print(mode_color + "=" * 50 + "\n")
@@ -159,9 +155,10 @@ def setup_mode():
         print(Fore.YELLOW + "\nSelect processing mode:")
         print("1. Offline (slower, no API key)")
         print("2. Online (faster, requires API key)")
-        print("3. Exit")
+        print("3. Fast (instant key-sentence summary, no model)")
+        print("4. Exit")
         
-        choice = input(Fore.CYAN + "\nEnter choice (1-3): ")
+        choice = input(Fore.CYAN + "\nEnter choice (1-4): ")
         
         if choice == "1":
             config["mode"] = "offline"
@@ -182,6 +179,12 @@ def setup_mode():
             return config
         
         elif choice == "3":
+            config["mode"] = "fast"
+            save_config(config)
+            print_mode_banner("fast")
+            return config
+        
+        elif choice == "4":
             print(Fore.YELLOW + "Goodbye!")
             sys.exit(0)
         
@@ -23,7 +23,12 @@ from core.export_pdf import export_summary_to_pdf
 from core.io import load_text_from_file
 
 OUTPUT_PATH = Path(OUTPUT_DIR)
-OUTPUT_PATH.mkdir(exist_ok=True)
+
+MODES = {
+    "Offline (Private)": "offline",
+    "Online (Requires API Key)": "online",
+    "Fast (Key Sentences)": "fast",
+}
 
 
 class StudySageApp(ctk.CTk):
@@ -43,6 +48,15 @@ class StudySageApp(ctk.CTk):
         self.textbox = ctk.CTkTextbox(self, width=800, height=300)
         self.textbox.pack(pady=10)
 
+        options = ctk.CTkFrame(self)
+        options.pack(pady=4)
+        self.mode_menu = ctk.CTkOptionMenu(options, values=list(MODES))
+        self.mode_menu.set(next(iter(MODES)))
+        self.mode_menu.pack(side="left", padx=5)
+        self.api_key_entry = ctk.CTkEntry(options, width=260, show="*",
+                                          placeholder_text="Hugging Face API key (online mode)")
+        self.api_key_entry.pack(side="left", padx=5)
+
         ctk.CTkButton(self, text="🧠 Generate Summary", command=self.do_summary).pack(pady=4)
         ctk.CTkButton(self, text="🖼 OCR (Image to Text)", command=self.do_ocr).pack(pady=4)
         ctk.CTkButton(self, text="📄 Export as PDF", command=self.export_pdf).pack(pady=4)
@@ -74,9 +88,14 @@ class StudySageApp(ctk.CTk):
             messagebox.showwarning("⚠️ No text", "Please load a file first.")
             return
 
+        mode = MODES[self.mode_menu.get()]
+        api_key = self.api_key_entry.get().strip() if mode == "online" else ""
+        if mode == "online" and not api_key:
+            messagebox.showwarning("⚠️ No API key", "Online mode needs a Hugging Face API key.")
+            return
+
         try:
-            # Simple config for offline mode
-            config = {"mode": "offline", "api_key": ""}
+            config = {"mode": mode, "api_key": api_key}
             summary = summarize_text(self.text_data, 30, 150, config)
             self.textbox.delete("1.0", "end")
             self.textbox.insert("1.0", summary)
@@ -119,6 +138,7 @@ class StudySageApp(ctk.CTk):
             messagebox.showwarning("⚠️ No text", "Nothing to save.")
             return
         try:
+            OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
             name = OUTPUT_PATH / f"text_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
             with open(name, 'w', encoding='utf-8') as f:
                 f.write(self.text_data)
@@ -16,7 +16,8 @@ try:
 except ImportError:
     OUTPUT_DIR = "output"
 
-from core.io import load_text_from_file, process_file
+from core.io import load_text_from_file
+from core.summarize import summarize_iter
 from core.quiz_gen import generate_questions
 from core.export_pdf import export_summary_to_pdf, export_quiz_to_pdf
 
@@ -70,8 +71,13 @@ if uploaded_file is not None:
     st.markdown("### Processing Options")
     
     # Mode selection
-    mode = st.radio("Processing Mode", ["Offline (Private)", "Online (Requires API Key)"], index=0)
-    selected_mode = "offline" if mode == "Offline (Private)" else "online"
+    modes = {
+        "Offline (Private)": "offline",
+        "Online (Requires API Key)": "online",
+        "Fast (Key Sentences)": "fast",
+    }
+    mode = st.radio("Processing Mode", list(modes), index=0)
+    selected_mode = modes[mode]
     
     # Summary length
     st.markdown("#### Summary Length")
@@ -85,14 +91,22 @@ if uploaded_file is not None:
     if st.button("🧠 Process Document"):
         try:
             with st.spinner("Processing..."):
-                # Process the file
-                summary = process_file(
-                    file_path, 
-                    mode=selected_mode, 
-                    api_key=st.session_state.api_key if selected_mode == "online" else "",
-                    min_length=min_length,
-                    max_length=max_length
-                )
+                # Process the file, showing each chunk summary as it arrives
+                text = load_text_from_file(file_path)
+                if not text.strip():
+                    summary = "No text could be extracted from the file."
+                else:
+                    config = {
+                        "mode": selected_mode,
+                        "api_key": st.session_state.api_key if selected_mode == "online" else "",
+                    }
+                    partial = st.empty()
+                    parts = {}
+                    for result in summarize_iter(text, min_length, max_length, config):
+                        parts[result.index] = result.summary
+                        partial.info(" ".join(parts[i] for i in sorted(parts)))
+                    partial.empty()
+                    summary = " ".join(parts[i] for i in sorted(parts)).strip()
                 
                 st.session_state.summary = summary
                 st.session_state.file_processed = True
@@ -21,15 +21,15 @@ from telegram.ext import (
 )
 
 # --- use shared core modules (do NOT import from apps/cli) ---
-from core.io import process_file, load_text_from_file
+from core.io import process_file_async, load_text_from_file
 from core.quiz_gen import generate_questions
 from core.export_pdf import export_summary_to_pdf, export_quiz_to_pdf
 
 # optional: prewarm offline model if available
 try:
-    from core.summarize import get_model_path  # if you exposed it from core
+    from core.summarize import warmup
 except Exception:
-    get_model_path = None
+    warmup = None
 
 import json
 
@@ -52,7 +52,6 @@ logger = logging.getLogger(__name__)
 CONFIG_FILE = "bot_config.json"
 from pathlib import Path as _P
 OUTPUT_DIR_PATH = _P(OUTPUT_DIR)
-OUTPUT_DIR_PATH.mkdir(exist_ok=True)
 
 def _escape(s: str) -> str:
     return html.escape(s or "")
@@ -145,7 +144,7 @@ class StudySageBot:
             "• Max file size: 20MB\n\n"
             "Commands:\n"
             "/start /help /settings /status /clear /mode\n"
-            "Use '/mode offline' or '/mode online' to switch processing mode.\n\n"
+            "Use '/mode offline', '/mode online' or '/mode fast' to switch processing mode.\n\n"
             "After processing:\n"
             "• <b>📄 Export Summary PDF</b> or <b>📄 Export Quiz PDF</b>\n"
             "• <b>📋 View All Questions</b> for the full quiz"
@@ -168,13 +167,15 @@ class StudySageBot:
             f"<b>API Status:</b> {'✅ Configured' if self.config.get('hf_api_key') else '❌ Not Set'}\n\n"
             "Processing Modes:\n"
             "• Offline — private, no API needed\n"
-            "• Online — faster, requires Hugging Face API key (/setapi)\n\n"
+            "• Online — faster, requires Hugging Face API key (/setapi)\n"
+            "• Fast — instant extractive summary (key sentences), no model\n\n"
             "Tip: set API with /setapi &lt;YOUR_API_KEY&gt;"
         )
         keyboard = _kb([
             [
                 InlineKeyboardButton("🔄 Offline", callback_data='mode_offline'),
-                InlineKeyboardButton("🌐 Online", callback_data='mode_online')
+                InlineKeyboardButton("🌐 Online", callback_data='mode_online'),
+                InlineKeyboardButton("⚡ Fast", callback_data='mode_fast')
             ],
             [InlineKeyboardButton("🏠 Back to Start", callback_data='start')]
         ])
@@ -225,11 +226,11 @@ class StudySageBot:
         chat_id = self._chat_id(update)
         user_id = update.effective_user.id
         if not context.args:
-            await self._send_html(context, chat_id, "Usage: /mode &lt;offline|online&gt;")
+            await self._send_html(context, chat_id, "Usage: /mode &lt;offline|online|fast&gt;")
             return
         mode = context.args[0].lower().strip()
-        if mode not in ("offline", "online"):
-            await self._send_html(context, chat_id, "❌ Invalid mode. Use 'offline' or 'online'.")
+        if mode not in ("offline", "online", "fast"):
+            await self._send_html(context, chat_id, "❌ Invalid mode. Use 'offline', 'online' or 'fast'.")
             return
         self.user_sessions.setdefault(user_id, {})['mode'] = mode
         await self._send_html(context, chat_id, f"✅ Mode set to <b>{_escape(mode)}</b>.", _processing_kb())
@@ -304,11 +305,7 @@ class StudySageBot:
             mode = session.get('mode', 'offline')
             api_key = self.config.get('hf_api_key') if mode == 'online' else None
 
-            loop = asyncio.get_running_loop()
-            summary = await loop.run_in_executor(
-                None,
-                lambda: process_file(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
-            )
+            summary = await process_file_async(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
             self.user_sessions[user_id]['summary'] = summary
 
             summary_text = (
@@ -360,10 +357,7 @@ class StudySageBot:
             if not session.get('summary'):
                 mode = session.get('mode', 'offline')
                 api_key = self.config.get('hf_api_key') if mode == 'online' else None
-                summary = await loop.run_in_executor(
-                    None,
-                    lambda: process_file(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
-                )
+                summary = await process_file_async(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
                 self.user_sessions[user_id]['summary'] = summary
 
             summary = self.user_sessions[user_id]['summary']
@@ -615,10 +609,7 @@ class StudySageBot:
                 mode = session.get('mode', 'offline')
                 api_key = self.config.get('hf_api_key') if mode == 'online' else None
 
-                summary = await loop.run_in_executor(
-                    None,
-                    lambda: process_file(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
-                )
+                summary = await process_file_async(session['file_path'], mode=mode, api_key=api_key, min_length=30, max_length=200)
                 self.user_sessions[user_id]['summary'] = summary
 
                 summary_text = (
@@ -700,10 +691,14 @@ def main():
 
     # Pre-warm offline model to avoid first-use stall
     try:
-        if bot.config.get('default_mode', 'offline') == 'offline':
-            get_model_path()
+        if warmup and bot.config.get('default_mode', 'offline') == 'offline':
+            from core.inference_server import is_running
+            if is_running():
+                logger.info("Using the shared inference daemon; skipping in-process warmup")
+            else:
+                warmup()
     except Exception:
-        pass
+        logger.exception("Offline model warmup failed")
 
     if not bot.config.get('bot_token'):
         token = input("Enter your Telegram Bot Token: ").strip()
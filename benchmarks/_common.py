@@ -0,0 +1,63 @@
+"""
+Shared helpers for the benchmark scripts: a synthetic study-notes document
+and dependency-free ROUGE-1 / ROUGE-L F1 for comparing summaries.
+"""
+import re
+import sys
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+SAMPLE = (
+    "Photosynthesis converts light energy into chemical energy stored in glucose. "
+    "It takes place in the chloroplasts of plant cells, mainly in the leaves. "
+    "The light-dependent reactions split water and release oxygen as a by-product. "
+    "The Calvin cycle then fixes carbon dioxide into three-carbon sugars. "
+    "Factors such as light intensity, temperature and CO2 concentration limit the rate. "
+    "Cellular respiration reverses the process, releasing energy from glucose as ATP. "
+    "Glycolysis happens in the cytoplasm and does not require oxygen. "
+    "The Krebs cycle and the electron transport chain take place in the mitochondria. "
+)
+
+
+def make_document(words: int) -> str:
+    per = len(SAMPLE.split())
+    return (SAMPLE * (words // per + 1)).strip()
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def rouge1(reference: str, candidate: str) -> float:
+    ref, cand = _tokens(reference), _tokens(candidate)
+    if not ref or not cand:
+        return 0.0
+    counts = {}
+    for t in ref:
+        counts[t] = counts.get(t, 0) + 1
+    overlap = 0
+    for t in cand:
+        if counts.get(t, 0) > 0:
+            counts[t] -= 1
+            overlap += 1
+    p, r = overlap / len(cand), overlap / len(ref)
+    return 2 * p * r / (p + r) if p + r else 0.0
+
+
+def rouge_l(reference: str, candidate: str) -> float:
+    ref, cand = _tokens(reference), _tokens(candidate)
+    if not ref or not cand:
+        return 0.0
+    prev = [0] * (len(cand) + 1)
+    for a in ref:
+        cur = [0]
+        for j, b in enumerate(cand, 1):
+            cur.append(prev[j - 1] + 1 if a == b else max(prev[j], cur[j - 1]))
+        prev = cur
+    lcs = prev[-1]
+    p, r = lcs / len(cand), lcs / len(ref)
+    return 2 * p * r / (p + r) if p + r else 0.0
@@ -0,0 +1,65 @@
+"""
+Benchmark: cold import time of the core modules and app entry points.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 600] [--modules core.summarize,core.io,...]
+
+Each module is imported in a fresh interpreter with `python -X importtime`;
+the script prints the cumulative time of the top-level import and which
+heavy dependencies (torch, transformers, cv2, ...) got pulled in. It exits
+with status 1 if any module exceeds the budget or loads a heavy dependency,
+so it can gate CI against startup regressions.
+"""
+import argparse
+import subprocess
+import sys
+
+from _common import PROJECT_ROOT
+
+from core import HEAVY_DEPENDENCIES
+
+MODULES = "core.summarize,core.io,core.ocr_reader,core.quiz_gen,core.export_pdf,apps.cli.main"
+
+
+def import_profile(module: str):
+    """Return ({top-level package: cumulative us}, cumulative us for module) from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    packages = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        name = name.strip()
+        packages.setdefault(name.split(".")[0], int(cumulative))
+        if name == module:
+            total = int(cumulative)
+    return packages, total
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modules", default=MODULES)
+    ap.add_argument("--budget-ms", type=float, default=600.0)
+    args = ap.parse_args()
+
+    failed = False
+    print(f"{'module':<20} {'ms':>8}  heavy imports")
+    for module in args.modules.split(","):
+        packages, total = import_profile(module)
+        heavy = [p for p in HEAVY_DEPENDENCIES if p in packages]
+        over = total / 1000 > args.budget_ms
+        failed |= over or bool(heavy)
+        print(f"{module:<20} {total / 1000:8.1f}  {', '.join(heavy) or '-'}{'  OVER BUDGET' if over else ''}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
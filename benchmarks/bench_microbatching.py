@@ -0,0 +1,63 @@
+"""
+Benchmark: concurrent offline callers with and without cross-request
+micro-batching.
+
+Usage:
+    python benchmarks/bench_microbatching.py [--callers 8] [--chunks 1] [--wait-ms 0,5]
+
+Each caller is a thread summarizing its own chunks with batch_size 1, like
+concurrent bot users. For each OFFLINE_MICROBATCH_WAIT_MS value this reports
+the wall time for all callers, chunks/sec, and the latency of one caller
+running alone.
+"""
+import argparse
+import threading
+import time
+
+from _common import make_document
+import core.summarize as summarize
+from core.summarize import _iter_offline_spans, _summarize_batched, warmup
+
+
+def _run_callers(jobs, min_length, max_length):
+    barrier = threading.Barrier(len(jobs))
+
+    def one(chunks):
+        barrier.wait()
+        _summarize_batched(chunks, min_length, max_length, 1)
+
+    threads = [threading.Thread(target=one, args=(chunks,)) for chunks in jobs]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--callers", type=int, default=8)
+    ap.add_argument("--chunks", type=int, default=1, help="chunks per caller")
+    ap.add_argument("--wait-ms", default="0,5")
+    ap.add_argument("--min-length", type=int, default=30)
+    ap.add_argument("--max-length", type=int, default=120)
+    args = ap.parse_args()
+
+    spans = list(_iter_offline_spans(make_document(800 * args.callers * args.chunks)))
+    chunks = [c for c, _, _ in spans][: args.callers * args.chunks]
+    jobs = [chunks[k::args.callers] for k in range(args.callers)]
+    warmup()
+    print(f"{args.callers} callers x {args.chunks} chunk(s)\n")
+    print(f"{'wait ms':>7} {'all (s)':>8} {'chunks/s':>9} {'alone (s)':>10}")
+
+    for wait_ms in (float(x) for x in args.wait_ms.split(",")):
+        summarize.OFFLINE_MICROBATCH_WAIT_MS = wait_ms
+        summarize._BATCHERS.clear()
+        alone = _run_callers(jobs[:1], args.min_length, args.max_length)
+        together = _run_callers(jobs, args.min_length, args.max_length)
+        print(f"{wait_ms:7.1f} {together:8.2f} {len(chunks) / together:9.2f} {alone:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: per-call OCR overhead, pytesseract (CLI process per call) vs.
+tesserocr (pooled in-process libtesseract handles).
+
+Usage:
+    python benchmarks/bench_ocr_engine.py [--calls 16] [--lang eng] [--engines pytesseract,tesserocr]
+
+Renders a page of the sample notes to an image, then times `--calls` OCR
+calls per engine, alternating psm 6 and 3 as extract_text_from_image does.
+Reports ms/call and ROUGE-1 of each engine's text against the first one.
+"""
+import argparse
+import textwrap
+import time
+
+from _common import make_document, rouge1
+from core.ocr_reader import get_engine
+
+
+def _render_page(words: int):
+    from PIL import Image, ImageDraw
+
+    lines = textwrap.wrap(make_document(words), 70)
+    img = Image.new("L", (1400, 40 + 32 * len(lines)), 255)
+    draw = ImageDraw.Draw(img)
+    for k, line in enumerate(lines):
+        draw.text((40, 20 + 32 * k), line, fill=0)
+    return img.resize((img.width * 2, img.height * 2))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=16)
+    ap.add_argument("--words", type=int, default=150)
+    ap.add_argument("--lang", default="eng")
+    ap.add_argument("--engines", default="pytesseract,tesserocr")
+    args = ap.parse_args()
+
+    page = _render_page(args.words)
+    print(f"{args.calls} calls on a {page.width}x{page.height} page\n")
+    print(f"{'engine':<12} {'first (ms)':>10} {'ms/call':>8} {'ROUGE-1':>8}")
+
+    reference = None
+    for name in args.engines.split(","):
+        engine = get_engine(name)
+        t0 = time.perf_counter()
+        text = engine.recognize(page, args.lang, 6).text  # includes handle creation for tesserocr
+        first = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for k in range(args.calls):
+            engine.recognize(page, args.lang, (6, 3)[k % 2])
+        per_call = (time.perf_counter() - t0) / args.calls
+        reference = reference if reference is not None else text
+        print(f"{name:<12} {first * 1000:10.1f} {per_call * 1000:8.1f} {rouge1(reference, text):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
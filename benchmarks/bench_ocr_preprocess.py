@@ -0,0 +1,98 @@
+"""
+Benchmark: OCR preprocessing profiles (fast / screen / scan / auto).
+
+Usage:
+    python benchmarks/bench_ocr_preprocess.py [--dir fixtures/] [--profiles fast,screen,scan,auto] [--no-ocr]
+
+Without --dir, a synthetic fixture set is rendered: a clean scan, a dark-UI
+screenshot, a phone photo of a screen (moire + colour noise) and a grainy,
+tinted photo of a page. With --dir, every image there that has a matching
+.txt ground truth is used instead.
+
+For each fixture and profile this reports preprocessing time, the profile
+"auto" picks, and (unless --no-ocr, or if Tesseract is missing) OCR
+accuracy as ROUGE-1 against the ground truth.
+"""
+import argparse
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+from _common import make_document, rouge1
+from core.ocr_reader import _cv2_preprocess_screen, _image_stats, _tesseract, choose_profile
+
+
+def _render(text, dark=False):
+    import cv2
+    import numpy as np
+
+    lines = textwrap.wrap(text, 60)
+    fg, bg = (230, 230, 230) if dark else (20, 20, 20), (30, 30, 35) if dark else (250, 250, 250)
+    img = np.full((80 + 50 * len(lines), 1600, 3), bg, np.uint8)
+    for k, line in enumerate(lines):
+        cv2.putText(img, line, (40, 60 + 50 * k), cv2.FONT_HERSHEY_SIMPLEX, 1.0, fg, 2, cv2.LINE_AA)
+    return img
+
+
+def synthetic_fixtures(out_dir: Path, words: int = 90):
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    text = make_document(words)
+    page = _render(text)
+    h, w = page.shape[:2]
+    yy, xx = np.mgrid[0:h, 0:w]
+    moire = (18 * np.sin(xx * 0.9 + yy * 0.35))[..., None]
+    fixtures = {
+        "scan": page,
+        "dark_ui": _render(text, dark=True),
+        "screen_photo": np.clip(page * [0.85, 0.9, 1.0] + moire + rng.normal(0, 14, page.shape), 0, 255),
+        "page_photo": np.clip(page * [0.8, 0.85, 0.95] + 25 + rng.normal(0, 4, page.shape), 0, 255),
+    }
+    paths = []
+    for name, img in fixtures.items():
+        path = out_dir / f"{name}.png"
+        cv2.imwrite(path.as_posix(), img.astype(np.uint8))
+        path.with_suffix(".txt").write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", help="directory of images with .txt ground truth next to them")
+    ap.add_argument("--profiles", default="fast,screen,scan,auto")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--no-ocr", action="store_true", help="only time preprocessing")
+    args = ap.parse_args()
+
+    import cv2
+
+    tmp = tempfile.TemporaryDirectory()
+    if args.dir:
+        paths = sorted(p for p in Path(args.dir).iterdir() if p.suffix.lower() in {".png", ".jpg", ".jpeg"}
+                       and p.with_suffix(".txt").exists())
+    else:
+        paths = synthetic_fixtures(Path(tmp.name))
+
+    print(f"{'fixture':<14} {'auto':<7} {'profile':<7} {'ms':>8} {'ROUGE-1':>8}")
+    for path in paths:
+        truth = path.with_suffix(".txt").read_text(encoding="utf-8")
+        picked = choose_profile(_image_stats(cv2.imread(path.as_posix())))
+        for profile in args.profiles.split(","):
+            best = float("inf")
+            for _ in range(args.repeats):
+                t0 = time.perf_counter()
+                pil = _cv2_preprocess_screen(path.as_posix(), profile)
+                best = min(best, time.perf_counter() - t0)
+            score = "-"
+            if not args.no_ocr and pil is not None:
+                result = _tesseract(pil, "eng", 6)
+                score = f"{rouge1(truth, result.text):.3f}" if result.text else "n/a"
+            print(f"{path.stem:<14} {picked:<7} {profile:<7} {best * 1000:8.1f} {score:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: per-chunk offline summarization vs. batched inference.
+
+Usage:
+    python benchmarks/bench_offline_batching.py [--words 20000] [--batch-sizes 1,2,4,8]
+
+The first timing is the old behavior (one pipeline call per chunk); the rest
+go through core.summarize._summarize_batched at each batch size.
+"""
+import argparse
+import time
+
+from _common import make_document
+from core.summarize import _chunk_text, _get_entry, _summarize_batched, warmup
+
+
+def _per_chunk(chunks, min_length, max_length):
+    summarizer, lock = _get_entry()
+    out = []
+    for chunk in chunks:
+        with lock:
+            out.append(summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)[0]["summary_text"])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=20000)
+    ap.add_argument("--batch-sizes", default="1,2,4,8")
+    ap.add_argument("--min-length", type=int, default=30)
+    ap.add_argument("--max-length", type=int, default=200)
+    args = ap.parse_args()
+
+    chunks = _chunk_text(make_document(args.words), max_words=800)
+    print(f"{len(chunks)} chunks from a {args.words}-word document")
+    warmup()
+
+    t0 = time.perf_counter()
+    baseline = _per_chunk(chunks, args.min_length, args.max_length)
+    base_s = time.perf_counter() - t0
+    print(f"per-chunk loop      : {base_s:8.2f}s")
+
+    for bs in (int(x) for x in args.batch_sizes.split(",")):
+        t0 = time.perf_counter()
+        got = _summarize_batched(chunks, args.min_length, args.max_length, bs)
+        dt = time.perf_counter() - t0
+        same = sum(a == b for a, b in zip(baseline, got))
+        print(f"batched (size={bs:<3}) : {dt:8.2f}s  speedup x{base_s / dt:4.2f}  identical chunks {same}/{len(chunks)}")
+
+
+if __name__ == "__main__":
+    main()
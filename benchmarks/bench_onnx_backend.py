@@ -0,0 +1,47 @@
+"""
+Benchmark: offline inference backends (torch vs. ONNX Runtime vs. ONNX int8).
+
+Usage:
+    python benchmarks/bench_onnx_backend.py [--words 6000] [--backends torch,onnx,onnx-int8]
+
+For each backend this reports generated tokens/sec over the same chunks and
+ROUGE-1 / ROUGE-L drift of its summaries against the torch output. The ONNX
+backends export (and quantize) the local model on first use.
+"""
+import argparse
+import time
+
+from _common import make_document, rouge1, rouge_l
+from core.summarize import _get_tokenizer, _iter_offline_spans, _summarize_batched, warmup
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=6000)
+    ap.add_argument("--backends", default="torch,onnx,onnx-int8")
+    ap.add_argument("--batch-size", type=int, default=4)
+    ap.add_argument("--min-length", type=int, default=30)
+    ap.add_argument("--max-length", type=int, default=200)
+    args = ap.parse_args()
+
+    chunks = [c for c, _, _ in _iter_offline_spans(make_document(args.words))]
+    tokenizer, _ = _get_tokenizer()
+    print(f"{len(chunks)} chunks from a {args.words}-word document\n")
+    print(f"{'backend':<10} {'seconds':>8} {'tok/s':>8} {'ROUGE-1':>8} {'ROUGE-L':>8}")
+
+    reference = None
+    for backend in args.backends.split(","):
+        warmup(backend=backend)
+        t0 = time.perf_counter()
+        summaries = _summarize_batched(chunks, args.min_length, args.max_length, args.batch_size, backend=backend)
+        dt = time.perf_counter() - t0
+        generated = sum(len(tokenizer(s, add_special_tokens=False)["input_ids"]) for s in summaries)
+        if reference is None:
+            reference = summaries  # first backend (torch by default) is the baseline
+        r1 = sum(rouge1(a, b) for a, b in zip(reference, summaries)) / len(chunks)
+        rl = sum(rouge_l(a, b) for a, b in zip(reference, summaries)) / len(chunks)
+        print(f"{backend:<10} {dt:8.2f} {generated / dt:8.1f} {r1:8.3f} {rl:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
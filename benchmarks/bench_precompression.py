@@ -0,0 +1,49 @@
+"""
+Benchmark: extractive pre-compression before abstractive summarization.
+
+Usage:
+    python benchmarks/bench_precompression.py [--words 6000] [--ratios 1.0,0.75,0.5,0.3]
+
+For each compress_ratio this reports end-to-end offline latency, the number
+of chunks sent to the model, and ROUGE-1 / ROUGE-L of the summary against the
+uncompressed (ratio 1.0) summary. The summary cache is disabled so every
+ratio does real inference.
+"""
+import argparse
+import time
+
+from _common import make_document, rouge1, rouge_l
+from core.summarize import _iter_offline_spans, _precompress, summarize_text, warmup
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=6000)
+    ap.add_argument("--ratios", default="1.0,0.75,0.5,0.3")
+    ap.add_argument("--min-length", type=int, default=30)
+    ap.add_argument("--max-length", type=int, default=200)
+    args = ap.parse_args()
+
+    text = make_document(args.words)
+    warmup()
+    print(f"{'ratio':>6} {'select s':>9} {'total s':>8} {'chunks':>7} {'ROUGE-1':>8} {'ROUGE-L':>8}")
+
+    reference = None
+    for ratio in (float(r) for r in args.ratios.split(",")):
+        config = {"mode": "offline", "cache": False, "compress_ratio": ratio}
+        t0 = time.perf_counter()
+        compressed, _ = _precompress(text, config)
+        select_s = time.perf_counter() - t0
+        chunks = sum(1 for _ in _iter_offline_spans(compressed))
+
+        t0 = time.perf_counter()
+        summary = summarize_text(text, args.min_length, args.max_length, config)
+        dt = time.perf_counter() - t0
+        if reference is None:
+            reference = summary  # first ratio (1.0 by default) is the baseline
+        print(f"{ratio:6.2f} {select_s:9.3f} {dt:8.2f} {chunks:7d} "
+              f"{rouge1(reference, summary):8.3f} {rouge_l(reference, summary):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,99 @@
 MODEL_NAME = "sshleifer/distilbart-cnn-12-6"
 API_URL = "https://api-inference.huggingface.co/models/sshleifer/distilbart-cnn-12-6"
 
+# Online mode: concurrent Inference API requests per document and retries on 429/503
+ONLINE_MAX_CONCURRENCY = 4
+ONLINE_MAX_RETRIES = 5
+
 # Text limits for different modes
 ONLINE_MODE_MAX_CHARS = 4000
 ONLINE_MODE_MAX_WORDS = 800
 OFFLINE_MODE_MAX_CHARS = 100000
 OFFLINE_MODE_MAX_WORDS = 20000
 
+# Offline inference: number of chunks sent through the model per forward pass
+OFFLINE_BATCH_SIZE = 4
+# Offline inference backend: "torch", "onnx" or "onnx-int8" (dynamic int8 weights).
+# The ONNX backends export the local model once next to it and need optimum[onnxruntime].
+OFFLINE_BACKEND = "torch"
+# Offline worker processes, each with its own model copy: 1 = in-process,
+# N > 1 = fixed pool size, "auto" = pick from CPU cores and free RAM
+OFFLINE_WORKERS = 1
+
+# Offline chunks from concurrent callers (bot users, daemon clients) share
+# forward passes: wait up to this many ms for more work before running a
+# partial batch (0 = each caller runs its own batches). A shared pass holds
+# up to OFFLINE_MICROBATCH_MAX_SIZE chunks, at most batch_size from each caller
+OFFLINE_MICROBATCH_WAIT_MS = 5
+OFFLINE_MICROBATCH_MAX_SIZE = 8
+
+# Persistent chunk-summary cache (SQLite, LRU-evicted by total size)
+SUMMARY_CACHE_ENABLED = True
+SUMMARY_CACHE_PATH = "models/summary_cache.sqlite3"
+SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Extractive pre-compression before abstractive summarization: share of words
+# (most central sentences, in order) to keep; 1.0 disables the stage
+PRECOMPRESS_RATIO = 1.0
+
+# Per-chunk generation lengths: "fixed" gives every chunk min/max_length,
+# "proportional" scales them by the chunk's token count
+LENGTH_POLICY = "fixed"
+
+# Chunk boundaries: "greedy" packs sentences from the start, "content" places
+# them by a rolling hash so edits only change nearby chunks
+CHUNKING = "greedy"
+
+# Shared inference daemon (python -m core.inference_server): offline inference
+# goes to it when it is running; INFERENCE_SOCKET "" = per-user temp path
+INFERENCE_DAEMON = True
+INFERENCE_SOCKET = ""
+
+# Unload the offline model (and worker pool) after this many idle minutes;
+# it reloads on the next request. 0 keeps it loaded for the process lifetime
+MODEL_IDLE_TIMEOUT = 30
+
+# Offline torch runtime on CPU: intra-op / inter-op threads (0 = torch default)
+# and precision "fp32", "bf16" (autocast) or "int8" (dynamic quantization).
+# `python -m core.summarize calibrate` saves the fastest profile for this
+# machine to RUNTIME_PROFILE_PATH, which then takes precedence over these
+TORCH_INTRA_OP_THREADS = 0
+TORCH_INTER_OP_THREADS = 0
+TORCH_PRECISION = "fp32"
+RUNTIME_PROFILE_PATH = "models/runtime_profile.json"
+
+# Hierarchical (map-reduce) summarization: final summary length target in words
+REDUCE_TARGET_WORDS = 500
+
+# Async front-ends: threads reserved for blocking offline summarization
+OFFLINE_ASYNC_THREADS = 2
+
+# Clean extracted text before summarization: drop repeated page headers/footers,
+# duplicate paragraphs and OCR hyphenation breaks
+TEXT_NORMALIZE = True
+
+# OCR engine: "tesserocr" runs libtesseract in-process with pooled per-language
+# handles (pip install tesserocr), "pytesseract" spawns the tesseract CLI per
+# call, "auto" prefers tesserocr when installed
+OCR_ENGINE = "auto"
+OCR_ENGINE_POOL_SIZE = 2
+# OCR passes (PSMs, candidate languages in auto mode) run concurrently on up to
+# this many threads
+OCR_MAX_WORKERS = 4
+# Auto-language OCR: identify the script first (Tesseract OSD, needs
+# osd.traineddata) and OCR with that one language, falling back to trying
+# each candidate language when the result doesn't match the script
+OCR_SCRIPT_DETECT = True
+# OCR passes are ranked by mean word confidence (0-100); the search stops once
+# one reaches OCR_CONFIDENCE_STOP. One image / one document (all PDF pages)
+# returns the best text found so far after this many seconds (0 = no limit)
+OCR_CONFIDENCE_STOP = 85
+OCR_IMAGE_DEADLINE_S = 60
+OCR_DOCUMENT_DEADLINE_S = 300
+# Image cleanup before OCR: "screen" (colour denoise for photos of screens,
+# slow), "fast" (grayscale median filter), "scan" (grayscale only), or "auto"
+# to pick per image from cheap statistics
+OCR_PREPROCESS = "auto"
+
 # Output directory
 OUTPUT_DIR = "output"
\ No newline at end of file
@@ -0,0 +1,7 @@
+# Heavy third-party packages the core modules import on first use rather than
+# at import time; tests/test_import_time.py and benchmarks/bench_import_time.py
+# both check this list
+HEAVY_DEPENDENCIES = (
+    "torch", "transformers", "cv2", "fitz", "pymupdf", "reportlab", "nltk", "pytesseract", "tesserocr",
+    "numpy", "PIL",
+)
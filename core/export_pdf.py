@@ -1,12 +1,12 @@
 # core/export_pdf.py
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
+from __future__ import annotations
 from pathlib import Path
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
 # Import configuration
 try:
     from config import OUTPUT_DIR
@@ -15,17 +15,27 @@ except ImportError:
 
 LOGO = Path("assets/images/logo.png")  # single place
 OUTDIR = Path(OUTPUT_DIR)
-OUTDIR.mkdir(exist_ok=True)
 
-# Define colors for better visual design
-PRIMARY_COLOR = HexColor("#4A90E2")  # StudySage blue
-ACCENT_COLOR = HexColor("#50C878")   # Green for correct answers
-TEXT_COLOR = HexColor("#333333")
-LIGHT_GRAY = HexColor("#EEEEEE")
-DARK_GRAY = HexColor("#666666")
+# Define colors for better visual design (reportlab accepts hex strings, so
+# reportlab itself is only imported when a PDF is written)
+PRIMARY_COLOR = "#4A90E2"  # StudySage blue
+ACCENT_COLOR = "#50C878"   # Green for correct answers
+TEXT_COLOR = "#333333"
+LIGHT_GRAY = "#EEEEEE"
+DARK_GRAY = "#666666"
+
+def _new_canvas(name: str):
+    """Create a canvas for OUTDIR/name (created on first export)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    OUTDIR.mkdir(parents=True, exist_ok=True)
+    out = OUTDIR / name
+    return out, canvas.Canvas(out.as_posix(), pagesize=A4)
 
 def _draw_header(cnv: canvas.Canvas, title: str, page_num: int = 1):
     """Draw an enhanced header with logo, title, and page information."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
     width, height = A4
     
     # Draw a subtle header background
@@ -40,7 +50,7 @@ def _draw_header(cnv: canvas.Canvas, title: str, page_num: int = 1):
             pass
     
     # Draw title
-    cnv.setFillColor(HexColor("#FFFFFF"))  # White text
+    cnv.setFillColor("#FFFFFF")  # White text
     cnv.setFont("Helvetica-Bold", 20)
     cnv.drawString(100, height - 45, "StudySage")
     cnv.setFont("Helvetica", 14)
@@ -59,6 +69,7 @@ def _draw_header(cnv: canvas.Canvas, title: str, page_num: int = 1):
 
 def _draw_footer(cnv: canvas.Canvas, text: str = "Generated by StudySage AI Assistant"):
     """Draw a footer with additional information."""
+    from reportlab.lib.pagesizes import A4
     width, height = A4
     cnv.setFillColor(DARK_GRAY)
     cnv.setFont("Helvetica", 8)
@@ -94,8 +105,8 @@ def _wrap_text(text: str, max_width: int = 80) -> List[str]:
 
 def export_summary_to_pdf(summary: str) -> str:
     """Export summary to a professionally designed PDF."""
-    out = OUTDIR / "summary.pdf"
-    cnv = canvas.Canvas(out.as_posix(), pagesize=A4)
+    from reportlab.lib.pagesizes import A4
+    out, cnv = _new_canvas("summary.pdf")
     
     # Set document metadata
     cnv.setTitle("StudySage Summary")
@@ -148,8 +159,8 @@ def export_summary_to_pdf(summary: str) -> str:
 
 def export_quiz_to_pdf(questions: List[Dict[str, object]]) -> str:
     """Export quiz to a professionally designed PDF."""
-    out = OUTDIR / "quiz.pdf"
-    cnv = canvas.Canvas(out.as_posix(), pagesize=A4)
+    from reportlab.lib.pagesizes import A4
+    out, cnv = _new_canvas("quiz.pdf")
     
     # Set document metadata
     cnv.setTitle("StudySage Quiz")
@@ -0,0 +1,166 @@
+# core/extractive.py
+from __future__ import annotations
+import math
+import re
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+Progress = Optional[Callable[[str, int, int], None]]
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WORD = re.compile(r"[^\W\d_]{3,}")
+# Small built-in list so the fast path doesn't need NLTK's stopword corpus
+_STOP = frozenset(
+    "the and for are but not you all any can had her was one our out has have him his how its may new now "
+    "old see two who did get let put say she too use that with this from they will would there their what "
+    "about which when make like time just know take into your some could them than then these other more "
+    "also been were such only over most very much many each those where while after before between both "
+    "because through during under again further once here same should being does doing".split()
+)
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """
+    Return (start, end) character spans of sentences. Blank lines also end a
+    sentence, so headings and unpunctuated OCR blocks don't merge into one.
+    """
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    for m in _SENTENCE_BOUNDARY.finditer(text):
+        if text[pos:m.start()].strip():
+            spans.append((pos, m.start()))
+        pos = m.end()
+    if text[pos:].strip():
+        spans.append((pos, len(text.rstrip())))
+    return spans
+
+
+def _tfidf(sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Sparse, L2-normalized TF-IDF sentence vectors as COO arrays
+    (rows, cols, values) plus the vocabulary size.
+    """
+    vocab = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, s in enumerate(sentences):
+        for w in _WORD.findall(s.lower()):
+            if w in _STOP:
+                continue
+            rows.append(i)
+            cols.append(vocab.setdefault(w, len(vocab)))
+    n, v = len(sentences), max(1, len(vocab))
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0), v
+
+    # collapse repeated (sentence, term) pairs into term frequencies
+    keys, tf = np.unique(np.asarray(rows, dtype=np.int64) * v + np.asarray(cols, dtype=np.int64), return_counts=True)
+    r, c = keys // v, keys % v
+    df = np.bincount(c, minlength=v)
+    vals = (1.0 + np.log(tf)) * np.log((1.0 + n) / (1.0 + df[c]))
+    norms = np.sqrt(np.bincount(r, weights=vals * vals, minlength=n))
+    vals = vals / np.where(norms > 0, norms, 1.0)[r]
+    return r, c, vals, v
+
+
+def rank_sentences(sentences: List[str], damping: float = 0.85, iterations: int = 50, tol: float = 1e-6) -> np.ndarray:
+    """
+    TextRank scores for sentences: PageRank over the cosine-similarity graph
+    of their TF-IDF vectors.
+
+    The n x n similarity matrix S = X X^T is never built; each power
+    iteration computes S p as X (X^T p) with two bincount passes over the
+    sparse entries, so a step costs O(nonzeros) rather than O(n^2).
+    """
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+    rows, cols, vals, v = _tfidf(sentences)
+    if vals.size == 0:
+        return np.full(n, 1.0 / n)
+
+    def sim(p: np.ndarray) -> np.ndarray:
+        # S p with the self-similarity diagonal (1 for non-empty rows) removed
+        xt_p = np.bincount(cols, weights=vals * p[rows], minlength=v)
+        return np.bincount(rows, weights=vals * xt_p[cols], minlength=n) - has_terms * p
+
+    has_terms = (np.bincount(rows, minlength=n) > 0).astype(float)
+    degree = sim(np.ones(n))
+    dangling = degree <= 1e-12
+    inv_degree = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, degree))
+
+    p = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        leaked = p[dangling].sum()
+        nxt = (1.0 - damping) / n + damping * (sim(p * inv_degree) + leaked / n)
+        if np.abs(nxt - p).sum() < tol:
+            p = nxt
+            break
+        p = nxt
+    return p
+
+
+def centrality_scores(sentences: List[str]) -> np.ndarray:
+    """
+    Cheap salience: cosine similarity of each sentence's TF-IDF vector to the
+    document centroid. One pass over the sparse entries, no graph.
+    """
+    n = len(sentences)
+    rows, cols, vals, v = _tfidf(sentences)
+    if vals.size == 0:
+        return np.zeros(n)
+    centroid = np.bincount(cols, weights=vals, minlength=v) / n
+    return np.bincount(rows, weights=vals * centroid[cols], minlength=n)
+
+
+def select_salient(text: str, ratio: float) -> List[Tuple[int, int]]:
+    """
+    Spans of the most central sentences covering about `ratio` of the
+    document's words, returned in document order.
+    """
+    spans = split_sentences(text)
+    if ratio >= 1.0 or len(spans) <= 1:
+        return spans
+    lengths = np.array([len(text[a:b].split()) for a, b in spans])
+    order = np.argsort(-centrality_scores([text[a:b] for a, b in spans]), kind="stable")
+    k = int(np.searchsorted(np.cumsum(lengths[order]), ratio * lengths.sum())) + 1
+    return [spans[i] for i in np.sort(order[:k])]
+
+
+def summarize_extractive(
+    text: str,
+    target_words: int,
+    progress_callback: Progress = None,
+) -> str:
+    """
+    Pick the highest-ranked sentences until target_words is reached and
+    return them in document order.
+    """
+    if progress_callback:
+        progress_callback("Ranking sentences (fast)", 0, 1)
+    spans = split_sentences(text)
+    sentences = [" ".join(text[a:b].split()) for a, b in spans]
+    scores = rank_sentences(sentences)
+
+    chosen: List[int] = []
+    words = 0
+    for i in np.argsort(-scores, kind="stable"):
+        if words >= target_words:
+            break
+        chosen.append(int(i))
+        words += len(sentences[i].split())
+
+    if progress_callback:
+        progress_callback("Summarization done", 1, 1)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def default_target_words(text: str, min_length: int, max_length: int, chunk_words: int = 800) -> int:
+    """
+    Word budget matching what offline abstractive summarization would produce:
+    about max_length tokens (~3/4 as many words) per 800-word chunk.
+    """
+    chunks = max(1, math.ceil(len(text.split()) / chunk_words))
+    return max((min_length * 3) // 4, chunks * (max_length * 3) // 4, 1)
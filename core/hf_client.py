@@ -0,0 +1,246 @@
+# core/hf_client.py
+from __future__ import annotations
+import asyncio
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from config import API_URL, ONLINE_MAX_CONCURRENCY, ONLINE_MAX_RETRIES
+except ImportError:
+    API_URL = "https://api-inference.huggingface.co/models/sshleifer/distilbart-cnn-12-6"
+    ONLINE_MAX_CONCURRENCY = 4
+    ONLINE_MAX_RETRIES = 5
+
+# 503 = model still loading on the HF side, 429 = rate limited
+RETRY_STATUSES = {429, 503}
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+# one httpx.AsyncClient per event loop; clients can't be shared across loops
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _payload(text: str, min_length: int, max_length: int) -> Dict[str, Any]:
+    return {
+        "inputs": text,
+        "parameters": {"max_length": max_length, "min_length": min_length, "do_sample": False},
+    }
+
+
+def _parse_summary(status: int, body: str, data: Any) -> str:
+    if status != 200:
+        raise RuntimeError(f"HF API error: {status} {body[:200]}")
+    # Some HF hosts return a list of dicts [{'summary_text': ...}]
+    if isinstance(data, list) and data and "summary_text" in data[0]:
+        return data[0]["summary_text"]
+    raise RuntimeError(f"Unexpected HF response: {str(data)[:200]}")
+
+
+def _retry_delay(attempt: int, base: float, cap: float, headers: Optional[Mapping[str, str]], data: Any) -> float:
+    """
+    Exponential backoff with jitter; a Retry-After header or the API's
+    estimated_time (sent while the model loads) raises the delay, up to cap.
+    """
+    delay = random.uniform(0.5, 1.0) * min(cap, base * (2 ** attempt))
+    hint = headers.get("Retry-After") if headers is not None else None
+    if hint is None and isinstance(data, dict):
+        hint = data.get("estimated_time")
+    try:
+        delay = min(cap, max(delay, float(hint)))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+
+def _json_or_none(response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session, sized for ONLINE_MAX_CONCURRENCY connections."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, ONLINE_MAX_CONCURRENCY))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+class HFInferenceClient:
+    """
+    Summarization client for the Hugging Face Inference API.
+
+    Requests share one pooled session, run up to max_concurrency at a time,
+    and are retried with exponential backoff plus jitter on 429/503 and
+    connection errors. A server-provided Retry-After or estimated_time
+    (sent while the model loads) takes precedence over the computed delay.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = API_URL,
+        max_concurrency: int = ONLINE_MAX_CONCURRENCY,
+        max_retries: int = ONLINE_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        timeout: float = 60,
+        session: Optional[requests.Session] = None,
+    ):
+        self.api_url = api_url
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = session or get_session()
+
+    def summarize(self, text: str, min_length: int, max_length: int) -> str:
+        payload = _payload(text, min_length, max_length)
+        attempt = 0
+        while True:
+            try:
+                r = self.session.post(self.api_url, headers=self.headers, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(_retry_delay(attempt, self.backoff_base, self.backoff_max, None, None))
+                attempt += 1
+                continue
+            data = _json_or_none(r)
+            if r.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(_retry_delay(attempt, self.backoff_base, self.backoff_max, r.headers, data))
+                attempt += 1
+                continue
+            return _parse_summary(r.status_code, r.text, data)
+
+    def summarize_many(
+        self,
+        texts: List[str],
+        min_length: int,
+        max_length: int,
+        lengths: Optional[List[Tuple[int, int]]] = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Summarize texts concurrently, yielding (index, summary) in completion
+        order. lengths optionally gives a (min_length, max_length) per text.
+        The first failure cancels requests that haven't started yet.
+        """
+        if not texts:
+            return
+        lengths = lengths or [(min_length, max_length)] * len(texts)
+        pool = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(texts)))
+        try:
+            futures = {pool.submit(self.summarize, t, *lengths[i]): i for i, t in enumerate(texts)}
+            for fut in as_completed(futures):
+                yield futures[fut], fut.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncHFInferenceClient:
+    """
+    asyncio counterpart of HFInferenceClient built on httpx, with the same
+    retry policy. Concurrency is bounded by a semaphore instead of threads,
+    so many documents can be in flight on one event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = API_URL,
+        max_concurrency: int = ONLINE_MAX_CONCURRENCY,
+        max_retries: int = ONLINE_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        timeout: float = 60,
+    ):
+        self.api_url = api_url
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+    @staticmethod
+    def _client():
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+            _ASYNC_CLIENTS[loop] = client
+        return client
+
+    async def summarize(self, text: str, min_length: int, max_length: int) -> str:
+        import httpx
+
+        client = self._client()
+        payload = _payload(text, min_length, max_length)
+        attempt = 0
+        while True:
+            try:
+                r = await client.post(self.api_url, headers=self.headers, json=payload, timeout=self.timeout)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(_retry_delay(attempt, self.backoff_base, self.backoff_max, None, None))
+                attempt += 1
+                continue
+            data = _json_or_none(r)
+            if r.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(_retry_delay(attempt, self.backoff_base, self.backoff_max, r.headers, data))
+                attempt += 1
+                continue
+            return _parse_summary(r.status_code, r.text, data)
+
+    async def summarize_all(
+        self,
+        texts: List[str],
+        min_length: int,
+        max_length: int,
+        lengths: Optional[List[Tuple[int, int]]] = None,
+    ) -> List[str]:
+        """
+        Summarize texts concurrently and return the summaries in input order.
+        lengths optionally gives a (min_length, max_length) per text. The
+        first failure cancels the requests still queued or in flight.
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+        lengths = lengths or [(min_length, max_length)] * len(texts)
+
+        async def _one(text: str, lo: int, hi: int) -> str:
+            async with sem:
+                return await self.summarize(text, lo, hi)
+
+        tasks = [asyncio.ensure_future(_one(t, *lengths[i])) for i, t in enumerate(texts)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+async def aclose() -> None:
+    """Close the shared httpx client for the running event loop, if any."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
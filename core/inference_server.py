@@ -0,0 +1,321 @@
+# core/inference_server.py
+"""
+Local inference daemon: keeps the offline model resident in one process and
+serves summarize requests to every StudySage front-end on the machine over a
+Unix domain socket.
+
+Run it with `python -m core.inference_server`. core.summarize sends offline
+inference here when the socket answers and falls back to in-process
+inference when it doesn't.
+
+Protocol: each frame is a 4-byte big-endian length followed by that many
+bytes of UTF-8 JSON. A client sends one request frame and reads frames until
+one has "end" (or "error"):
+
+    -> {"op": "summarize", "chunks": [...], "min_length": 30, "max_length": 200,
+        "batch_size": 4, "backend": "torch", "lengths": [[min, max], ...] | null}
+    <- {"results": [[index, summary], ...], "done": 4, "total": 9, "model": "..."}   (one per batch)
+    <- {"end": true}
+
+    -> {"op": "ping"}
+    <- {"end": true, "pid": 1234, "requests": 7, "models": {...},   (see summarize.model_stats)
+        "model_ids": {"torch": "...", ...}}
+
+"model" and "model_ids" are the daemon's summarize._model_id values, which
+depend on its own runtime profile; clients key cached summaries with them.
+
+A connection may carry several requests in sequence.
+
+The socket lives in a per-user 0700 directory ($XDG_RUNTIME_DIR, or
+studysage-<uid> in the temp directory) and clients only talk to a socket
+owned by their own user, so other local users can neither read the
+documents nor answer with forged summaries.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from config import INFERENCE_SOCKET
+except ImportError:
+    INFERENCE_SOCKET = ""
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+CONNECT_TIMEOUT = 1.0
+
+
+def _owned_private_dir(path: str) -> bool:
+    """True if path is a real directory owned by this user with no group/other access."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _socket_dir() -> str:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and _owned_private_dir(runtime):
+        return runtime
+    path = os.path.join(tempfile.gettempdir(), f"studysage-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    if not _owned_private_dir(path):
+        raise RuntimeError(f"{path} is not a private directory owned by this user; set INFERENCE_SOCKET")
+    return path
+
+
+def default_socket_path() -> str:
+    """INFERENCE_SOCKET, or studysage.sock in a per-user 0700 directory."""
+    if INFERENCE_SOCKET:
+        return INFERENCE_SOCKET
+    return os.path.join(_socket_dir(), "studysage.sock")
+
+
+def _trusted_socket(path: str) -> bool:
+    # a socket someone else created could read our documents and forge replies
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def send_frame(sock: socket.socket, obj: Dict[str, Any]) -> None:
+    data = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        part = sock.recv(n - len(buf))
+        if not part:
+            raise ConnectionError("Inference daemon connection closed")
+        buf += part
+    return bytes(buf)
+
+
+def recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame of {size} bytes exceeds the {MAX_FRAME_BYTES}-byte limit")
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+# ---------- client ----------
+class InferenceClient:
+    """One connection to the daemon; see the module docstring for the protocol."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "InferenceClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def request(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Send one request and yield its response frames up to (excluding) the end frame."""
+        send_frame(self.sock, payload)
+        while True:
+            frame = recv_frame(self.sock)
+            if "error" in frame:
+                raise RuntimeError(f"Inference daemon error: {frame['error']}")
+            if frame.get("end"):
+                return
+            yield frame
+
+    def ping(self) -> Dict[str, Any]:
+        send_frame(self.sock, {"op": "ping"})
+        frame = recv_frame(self.sock)
+        if "error" in frame:
+            raise RuntimeError(f"Inference daemon error: {frame['error']}")
+        return frame
+
+    def model_id(self, backend: str) -> Optional[str]:
+        """The daemon's cache model id for `backend`, or None if it doesn't report one."""
+        return (self.ping().get("model_ids") or {}).get(backend)
+
+    def summarize(
+        self,
+        chunks: List[str],
+        min_length: int,
+        max_length: int,
+        batch_size: int,
+        backend: str,
+        lengths: Optional[List[Tuple[int, int]]] = None,
+    ) -> Iterator[Tuple[int, str, int, int, Optional[str]]]:
+        """Yield (chunk index, summary, done, total, model id) as the daemon finishes each batch."""
+        payload = {
+            "op": "summarize",
+            "chunks": chunks,
+            "min_length": min_length,
+            "max_length": max_length,
+            "batch_size": batch_size,
+            "backend": backend,
+            "lengths": lengths,
+        }
+        for frame in self.request(payload):
+            for i, summary in frame["results"]:
+                yield i, summary, frame["done"], frame["total"], frame.get("model")
+
+
+def connect(path: Optional[str] = None, timeout: float = CONNECT_TIMEOUT) -> Optional[InferenceClient]:
+    """Connect to a running daemon owned by this user, or return None if there isn't one."""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    try:
+        path = path or default_socket_path()
+    except RuntimeError:
+        return None
+    if not _trusted_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)  # inference can take minutes
+    return InferenceClient(sock)
+
+
+def is_running(path: Optional[str] = None) -> bool:
+    """True if a daemon answers on `path` (default socket if None)."""
+    client = connect(path)
+    if client is None:
+        return False
+    with client:
+        try:
+            client.ping()
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+
+# ---------- server ----------
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                req = recv_frame(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            try:
+                with self.server.lock:
+                    self.server.requests += 1
+                op = req.get("op")
+                if op == "ping":
+                    from core.summarize import BACKENDS, _model_id, model_stats
+                    send_frame(self.request, {
+                        "end": True, "pid": os.getpid(), "requests": self.server.requests, "models": model_stats(),
+                        "model_ids": {b: _model_id(b) for b in BACKENDS},
+                    })
+                elif op == "summarize":
+                    self._summarize(req)
+                else:
+                    send_frame(self.request, {"error": f"unknown op {op!r}"})
+            except (BrokenPipeError, ConnectionError):
+                return
+            except Exception as e:
+                try:
+                    send_frame(self.request, {"error": str(e)})
+                except OSError:
+                    return
+
+    def _summarize(self, req: Dict[str, Any]) -> None:
+        from core.summarize import _iter_batch_results, _model_id, _resolve_backend
+
+        chunks = req["chunks"]
+        model = _model_id(_resolve_backend(req.get("backend")))
+        lengths = [tuple(x) for x in req["lengths"]] if req.get("lengths") else None
+        done = 0
+        # one frame per finished batch, so clients can report progress
+        for batch in _iter_batch_results(
+            chunks, int(req["min_length"]), int(req["max_length"]), int(req.get("batch_size") or 1),
+            backend=req.get("backend"), lengths=lengths,
+        ):
+            done += len(batch)
+            send_frame(self.request, {"results": batch, "done": done, "total": len(chunks), "model": model})
+        send_frame(self.request, {"end": True})
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class InferenceServer(socketserver.ThreadingUnixStreamServer):
+        """Threaded Unix-socket server; requests share the process-wide model registry."""
+        daemon_threads = True
+
+        def __init__(self, path: str):
+            self.requests = 0
+            self.lock = threading.Lock()
+            # bind under a restrictive umask: the socket is never reachable by others, not even briefly
+            old = os.umask(0o177)
+            try:
+                super().__init__(path, _Handler)
+            finally:
+                os.umask(old)
+            os.chmod(path, 0o600)
+
+
+def serve(path: Optional[str] = None, backend: Optional[str] = None, warm: bool = True) -> None:
+    """Load the model and serve requests on `path` until interrupted."""
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise RuntimeError("The inference daemon needs Unix domain sockets, which this platform lacks.")
+    path = path or default_socket_path()
+    probe = connect(path)
+    if probe is not None:
+        probe.close()
+        raise RuntimeError(f"An inference daemon is already listening on {path}")
+    if os.path.lexists(path):
+        if not _trusted_socket(path):
+            raise RuntimeError(f"{path} exists and is not a socket owned by this user")
+        os.unlink(path)  # stale socket from a daemon that didn't exit cleanly
+
+    if warm:
+        from core.summarize import warmup
+        warmup(backend=backend)
+    server = InferenceServer(path)
+    try:
+        print(f"StudySage inference daemon listening on {path}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="StudySage local inference daemon")
+    ap.add_argument("--socket", default=None, help="socket path (default: INFERENCE_SOCKET or a per-user temp path)")
+    ap.add_argument("--backend", default=None, help='offline backend to preload: "torch", "onnx" or "onnx-int8"')
+    ap.add_argument("--no-warmup", action="store_true", help="load the model on the first request instead")
+    args = ap.parse_args()
+    serve(args.socket, args.backend, warm=not args.no_warmup)
+
+
+if __name__ == "__main__":
+    main()
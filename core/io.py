@@ -1,40 +1,185 @@
 # core/io.py
 import os
+import re
+import asyncio
+import functools
+import time
+from collections import Counter
 from pathlib import Path
-import fitz  # PyMuPDF
-from typing import Callable, Optional
-from core.ocr_reader import extract_text_from_image
+from typing import Callable, List, Optional, Tuple
 
 # Import configuration
 try:
-    from config import OUTPUT_DIR
+    from config import OUTPUT_DIR, TEXT_NORMALIZE, OCR_DOCUMENT_DEADLINE_S
 except ImportError:
     OUTPUT_DIR = "output"
+    TEXT_NORMALIZE = True
+    OCR_DOCUMENT_DEADLINE_S = 300
 
 Progress = Optional[Callable[[str, int, int], None]]
 
-def load_text_from_file(file_path: str, lang: str = "auto", force_ocr: bool = False, progress_callback: Progress = None) -> str:
+# ---------- text normalization ----------
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u2000-\u200a\u3000]+")
+_INVISIBLE = re.compile(r"[\u00ad\u200b\ufeff]")
+_DIGITS = re.compile(r"\d+")
+_PAGE_NUMBER = re.compile(r"(?:page\s*)?#(?:\s*(?:of|/)\s*#)?|-\s*#\s*-", re.IGNORECASE)
+_WORD = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+_HYPHEN_BREAK = re.compile(r"(" + _WORD.pattern + r")-\n([a-z][^\W\d_]*)")
+# first halves of common hyphenated compounds, kept hyphenated across a line break
+# (no prefixes like "pre"/"sub": "pre-\nsent" is the word "present")
+_COMPOUND_HEADS = frozenset({"all", "half", "ill", "self", "well"})
+_COMPOUND_PART = 4      # shortest word that counts as half of a compound
+_PARAGRAPH_BREAK = re.compile(r"\n{2,}")
+_EDGE_LINES = 3         # lines at the top/bottom of a page that count as header/footer
+_WATERMARK_WORDS = 6    # repeated lines this short anywhere on a page are treated as watermarks
+
+
+def _join_hyphen_breaks(text: str) -> str:
+    """
+    Undo hyphenation at line ends: "infor-\nmation" -> "information", but
+    "well-\nknown" -> "well-known". A break keeps its hyphen when the
+    hyphenated form occurs elsewhere in the text. Otherwise it is joined if
+    the joined word occurs elsewhere, and kept if the left part is already
+    hyphenated, ends in a common compound head, or both parts are words of
+    _COMPOUND_PART+ letters used elsewhere ("with-\nout" still joins).
+    """
+    vocab = set(_WORD.findall(_HYPHEN_BREAK.sub(" ", text).lower()))
+
+    def _join(m: re.Match) -> str:
+        left, right = m.group(1), m.group(2)
+        lo = left.lower()
+        if f"{lo}-{right}" in vocab:
+            return f"{left}-{right}"
+        if lo + right in vocab:
+            return left + right
+        head = lo.rsplit("-", 1)[-1]
+        if "-" in lo or head in _COMPOUND_HEADS:
+            return f"{left}-{right}"
+        if min(len(head), len(right)) >= _COMPOUND_PART and head in vocab and right in vocab:
+            return f"{left}-{right}"
+        return left + right
+
+    return _HYPHEN_BREAK.sub(_join, text)
+
+
+def _line_key(line: str) -> str:
+    # page numbers, dates and slide counters differ per page, so short lines
+    # are compared without digits; longer lines must repeat verbatim
+    line = line.lower()
+    return _DIGITS.sub("#", line) if len(line.split()) <= _WATERMARK_WORDS else line
+
+
+def normalize_pages(pages: List[str]) -> Tuple[str, int]:
+    """
+    Clean per-page extracted text and join it. Returns (text, characters removed).
+
+    - Lines repeated at the top/bottom of at least half the pages (headers,
+      footers, page numbers; digits ignored in short lines) are dropped, as
+      are short lines repeated verbatim anywhere on most pages (watermarks).
+      Pages of 2 * _EDGE_LINES lines or fewer only lose page numbers.
+    - Hyphenated line breaks ("infor-\nmation") are re-joined; compounds
+      ("well-\nknown") keep their hyphen.
+    - Repeated paragraphs are kept once.
+    - Whitespace is normalized: runs of spaces collapse, lines are stripped
+      and blank-line runs shrink to one paragraph break.
+
+    Line counting and filtering are each a single pass over the lines.
+    """
+    original = sum(len(p) for p in pages) + max(0, len(pages) - 1)
+    split = [[_SPACES.sub(" ", ln).strip() for ln in _INVISIBLE.sub("", p).splitlines()] for p in pages]
+
+    # how many pages each line occurs on, at the page edges and anywhere
+    edge_counts: Counter = Counter()
+    any_counts: Counter = Counter()
+    for lines in split:
+        content = [i for i, ln in enumerate(lines) if ln]
+        # on a page with no more lines than both edges together (a short
+        # slide) every line would be an edge, so only long pages count
+        if len(content) > 2 * _EDGE_LINES:
+            edges = set(content[:_EDGE_LINES] + content[-_EDGE_LINES:])
+            edge_counts.update({_line_key(lines[i]) for i in edges})
+        any_counts.update({lines[i].lower() for i in content})
+
+    n = len(split)
+    edge_min = max(2, (n + 1) // 2)
+    any_min = max(3, (n * 4 + 4) // 5)
+    kept_pages = []
+    for lines in split:
+        content = [i for i, ln in enumerate(lines) if ln]
+        if len(content) > 2 * _EDGE_LINES:
+            edges = set(content[:_EDGE_LINES] + content[-_EDGE_LINES:])
+            repeated = edge_counts
+        else:
+            # short pages only lose a page number on their first or last line
+            edges, repeated = set(content[:1] + content[-1:]), Counter()
+        kept = []
+        for i, ln in enumerate(lines):
+            if ln and n > 1:
+                key = _line_key(ln)
+                if i in edges and (repeated[key] >= edge_min or _PAGE_NUMBER.fullmatch(key)):
+                    continue
+                if any_counts[ln.lower()] >= any_min and len(ln.split()) <= _WATERMARK_WORDS:
+                    continue
+            kept.append(ln)
+        kept_pages.append("\n".join(kept).strip())
+
+    text = _join_hyphen_breaks("\n".join(p for p in kept_pages if p))
+    seen = set()
+    paragraphs = []
+    for para in _PARAGRAPH_BREAK.split(text):
+        key = " ".join(para.lower().split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        paragraphs.append(para)
+    text = "\n\n".join(paragraphs)
+    return text, original - len(text)
+
+
+def normalize_text(text: str) -> Tuple[str, int]:
+    """normalize_pages for text without page structure (no header/footer detection)."""
+    return normalize_pages([text])
+
+def load_text_from_file(file_path: str, lang: str = "auto", force_ocr: bool = False, progress_callback: Progress = None,
+                        normalize: Optional[bool] = None) -> str:
     """
     Unified loader for .txt/.md/.csv, images, and PDFs.
     - PDFs: try text layer first; if empty OR force_ocr=True, rasterize @300 DPI and OCR.
     - Images: aggressive OCR pipeline (screen-photo friendly) with auto language re-run.
+    Extracted prose is cleaned with normalize_pages unless normalize=False
+    (default TEXT_NORMALIZE); .py/.json/.csv files are returned verbatim.
     """
     p = Path(file_path)
     ext = p.suffix.lower()
 
-    if ext in {".txt", ".md", ".py", ".json", ".csv"}:
+    if ext in {".py", ".json", ".csv"}:
         return p.read_text(encoding="utf-8", errors="ignore")
 
-    if ext in {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}:
+    if ext in {".txt", ".md"}:
+        pages = [p.read_text(encoding="utf-8", errors="ignore")]
+    elif ext in {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}:
         if progress_callback: progress_callback("Running OCR on image", 0, 0)
-        return extract_text_from_image(p.as_posix(), lang=lang) or ""
+        from core.ocr_reader import extract_text_from_image
+        pages = [extract_text_from_image(p.as_posix(), lang=lang, deadline=_ocr_deadline()) or ""]
+    elif ext == ".pdf":
+        pages = _extract_pdf_pages(p, lang=lang, force_ocr=force_ocr, progress_callback=progress_callback)
+    else:
+        raise ValueError(f"Unsupported file format: {ext}")
 
-    if ext == ".pdf":
-        return _extract_pdf_text_or_ocr(p, lang=lang, force_ocr=force_ocr, progress_callback=progress_callback)
+    if not (TEXT_NORMALIZE if normalize is None else normalize):
+        return "\n".join(pages).strip()
+    text, removed = normalize_pages(pages)
+    if progress_callback: progress_callback(f"Normalized text ({removed} characters removed)", removed, removed + len(text))
+    return text
 
-    raise ValueError(f"Unsupported file format: {ext}")
+def _ocr_deadline() -> Optional[float]:
+    """time.monotonic() value at which OCR of the current document should wrap up."""
+    return time.monotonic() + OCR_DOCUMENT_DEADLINE_S if OCR_DOCUMENT_DEADLINE_S > 0 else None
 
-def _extract_pdf_text_or_ocr(pdf_path: Path, lang: str, force_ocr: bool, progress_callback: Progress) -> str:
+def _extract_pdf_pages(pdf_path: Path, lang: str, force_ocr: bool, progress_callback: Progress) -> List[str]:
+    """Per-page text: the text layer if any page has one, otherwise OCR of every page."""
+    import fitz  # PyMuPDF
+    from core.ocr_reader import extract_text_from_image
     if progress_callback: progress_callback("Extracting PDF (text layer)", 0, 0)
     doc = fitz.open(pdf_path.as_posix())
 
@@ -47,26 +192,31 @@ def _extract_pdf_text_or_ocr(pdf_path: Path, lang: str, force_ocr: bool, progres
             if t.strip():
                 text_chunks.append(t.strip())
         if text_chunks:
-            return "\n".join(text_chunks).strip()
+            return text_chunks
 
     # 2) Forced/fallback OCR
     if progress_callback: progress_callback("OCR PDF pages", 0, len(doc))
     out = []
     tmp_dir = Path(OUTPUT_DIR); tmp_dir.mkdir(exist_ok=True)
+    deadline = _ocr_deadline()
     for i in range(len(doc)):
+        if deadline is not None and time.monotonic() >= deadline:
+            # time budget spent: keep the pages read so far
+            if progress_callback: progress_callback("OCR time budget reached", i, len(doc))
+            break
         if progress_callback: progress_callback("OCR PDF pages", i + 1, len(doc))
         page = doc.load_page(i)
         pix = page.get_pixmap(dpi=300)
         tmp = tmp_dir / f"_page_{i}.png"
         pix.save(tmp.as_posix())
         try:
-            txt = extract_text_from_image(tmp.as_posix(), lang=lang) or ""
+            txt = extract_text_from_image(tmp.as_posix(), lang=lang, deadline=deadline) or ""
             if txt.strip():
                 out.append(txt.strip())
         finally:
             try: tmp.unlink()
             except: pass
-    return "\n".join(out).strip()
+    return out
 
 def process_file(file_path: str, mode: str = "offline", api_key: str = None,
                  min_length: int = 30, max_length: int = 200,
@@ -79,4 +229,20 @@ def process_file(file_path: str, mode: str = "offline", api_key: str = None,
         return "No text could be extracted from the file."
     from core.summarize import summarize_text
     config = {"mode": mode, "api_key": api_key or ""}
-    return summarize_text(text, min_length, max_length, config, progress_callback=progress_callback)
\ No newline at end of file
+    return summarize_text(text, min_length, max_length, config, progress_callback=progress_callback)
+
+async def process_file_async(file_path: str, mode: str = "offline", api_key: str = None,
+                             min_length: int = 30, max_length: int = 200,
+                             lang: str = "auto", progress_callback: Progress = None) -> str:
+    """
+    Async process_file: text extraction runs in the loop's default executor,
+    summarization goes through core.summarize.summarize_text_async.
+    """
+    loop = asyncio.get_running_loop()
+    load = functools.partial(load_text_from_file, file_path, lang=lang, force_ocr=False, progress_callback=progress_callback)
+    text = await loop.run_in_executor(None, load)
+    if not text.strip():
+        return "No text could be extracted from the file."
+    from core.summarize import summarize_text_async
+    config = {"mode": mode, "api_key": api_key or ""}
+    return await summarize_text_async(text, min_length, max_length, config, progress_callback=progress_callback)
\ No newline at end of file
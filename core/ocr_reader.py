@@ -1,19 +1,48 @@
 # core/ocr_reader.py
+from __future__ import annotations
+import functools
 import os
-from typing import Optional, Tuple
-from PIL import Image
-import numpy as np
-import pytesseract
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 
-# Windows Tesseract autodetect
-if os.name == "nt":
-    try:
-        if not getattr(pytesseract.pytesseract, "tesseract_cmd", None):
-            p = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-            if os.path.exists(p):
-                pytesseract.pytesseract.tesseract_cmd = p
-    except Exception:
-        pass
+try:
+    from config import (
+        OCR_ENGINE, OCR_ENGINE_POOL_SIZE, OCR_MAX_WORKERS, OCR_SCRIPT_DETECT,
+        OCR_CONFIDENCE_STOP, OCR_IMAGE_DEADLINE_S, OCR_PREPROCESS
+    )
+except ImportError:
+    OCR_ENGINE = "auto"
+    OCR_ENGINE_POOL_SIZE = 2
+    OCR_MAX_WORKERS = 4
+    OCR_SCRIPT_DETECT = True
+    OCR_CONFIDENCE_STOP = 85
+    OCR_IMAGE_DEADLINE_S = 60
+    OCR_PREPROCESS = "auto"
+
+# PIL, numpy, cv2, tesserocr and pytesseract are imported on first OCR call
+if TYPE_CHECKING:
+    from PIL import Image
+
+@functools.lru_cache(maxsize=None)
+def _pytesseract():
+    import pytesseract
+
+    # Windows Tesseract autodetect
+    if os.name == "nt":
+        try:
+            if not getattr(pytesseract.pytesseract, "tesseract_cmd", None):
+                p = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+                if os.path.exists(p):
+                    pytesseract.pytesseract.tesseract_cmd = p
+        except Exception:
+            pass
+    return pytesseract
 
 _LANG_MAP = {
     "en": "eng", "hi": "hin", "gu": "guj", "bn": "ben", "ta": "tam",
@@ -21,6 +50,44 @@ _LANG_MAP = {
     "ml": "mal", "or": "ori", "sa": "san"
 }
 
+# Tesseract OSD script name -> _LANG_MAP key. Devanagari is read as Hindi,
+# the most common of hi/mr/sa; its traineddata covers the shared script.
+_SCRIPT_LANG = {
+    "Latin": "en", "Devanagari": "hi", "Gujarati": "gu", "Bengali": "bn", "Tamil": "ta",
+    "Telugu": "te", "Gurmukhi": "pa", "Arabic": "ur", "Kannada": "kn", "Malayalam": "ml", "Oriya": "or",
+}
+# Unicode blocks used to check that OCR output is really in the detected script
+_SCRIPT_BLOCKS = {
+    "Devanagari": (0x0900, 0x097F), "Bengali": (0x0980, 0x09FF), "Gurmukhi": (0x0A00, 0x0A7F),
+    "Gujarati": (0x0A80, 0x0AFF), "Oriya": (0x0B00, 0x0B7F), "Tamil": (0x0B80, 0x0BFF),
+    "Telugu": (0x0C00, 0x0C7F), "Kannada": (0x0C80, 0x0CFF), "Malayalam": (0x0D00, 0x0D7F),
+    "Arabic": (0x0600, 0x06FF),
+}
+_SCRIPT_MIN_CONF = 1.0    # OSD script_conf below this counts as undetected
+_OSD_MAX_SIDE = 1600      # OSD runs on a downsampled copy
+
+_STATS = {
+    "passes": 0, "osd_passes": 0, "early_stops": 0, "deadline_hits": 0,
+    "script_detected": 0, "script_confirmed": 0, "script_rejected": 0, "script_undetected": 0,
+}
+_STATS_LOCK = threading.Lock()
+
+
+def _count(key: str) -> None:
+    with _STATS_LOCK:
+        _STATS[key] += 1
+
+
+def ocr_stats() -> Dict[str, int]:
+    """
+    Counters since process start: full OCR passes, OSD passes, searches cut
+    short by a confident pass or by a deadline, and how often the script
+    detector picked a language, was confirmed by the OCR output, was
+    rejected (falling back to the candidate search), or found nothing.
+    """
+    with _STATS_LOCK:
+        return dict(_STATS)
+
 def _detect_lang_code(sample_text: str) -> Tuple[Optional[str], float]:
     sample = (sample_text or "").strip()
     if not sample:
@@ -36,9 +103,113 @@ def _detect_lang_code(sample_text: str) -> Tuple[Optional[str], float]:
     except Exception:
         return None, 0.0
 
-def _cv2_preprocess_screen(image_path: str) -> Optional[Image.Image]:
+# ---------- preprocessing ----------
+PREPROCESS_PROFILES = ("auto", "fast", "screen", "scan")
+_MAX_SIDE = 2200          # huge photos are shrunk to this first
+_STATS_CROP = 512         # noise is measured on a full-resolution centre crop
+
+
+@functools.lru_cache(maxsize=None)
+def _gamma_lut(inv_gamma: float):
+    import numpy as np
+    return (((np.arange(256) / 255.0) ** inv_gamma) * 255).astype("uint8")
+
+
+def _image_stats(img) -> Dict[str, float]:
+    """
+    Cheap statistics for picking a profile: brightness, colour saturation,
+    share of near-black/near-white pixels, and high-frequency noise (moire,
+    sensor grain) as the mean deviation from a 3x3 median.
+    """
+    import cv2
+    import numpy as np
+
+    small = cv2.resize(img, (256, 256), interpolation=cv2.INTER_AREA)
+    gray_small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    h, w = img.shape[:2]
+    y, x = max(0, (h - _STATS_CROP) // 2), max(0, (w - _STATS_CROP) // 2)
+    crop = cv2.cvtColor(img[y:y + _STATS_CROP, x:x + _STATS_CROP], cv2.COLOR_BGR2GRAY)
+    return {
+        "mean": float(gray_small.mean()),
+        "saturation": float(cv2.cvtColor(small, cv2.COLOR_BGR2HSV)[..., 1].mean()),
+        "bilevel": float(((crop < 60) | (crop > 190)).mean()),
+        "noise": float(np.abs(crop.astype(np.int16) - cv2.medianBlur(crop, 3)).mean()),
+    }
+
+
+def choose_profile(stats: Dict[str, float]) -> str:
+    """
+    "scan" for clean, nearly two-tone, colourless pages; "screen" (with the
+    expensive colour denoise) only for visibly noisy photos; "fast" otherwise.
+    """
+    if stats["noise"] >= 6.0:
+        return "screen"
+    if stats["bilevel"] >= 0.9 and stats["saturation"] < 25 and stats["noise"] < 2.0:
+        return "scan"
+    return "fast"
+
+
+def _binarize(gray, dark_ui: bool):
+    import cv2
+
+    # Unsharp mask
+    blur = cv2.GaussianBlur(gray, (0, 0), 1.2)
+    sharp = cv2.addWeighted(gray, 1.6, blur, -0.6, 0)
+
+    # Gamma boost for dark UIs
+    if dark_ui:
+        sharp = cv2.LUT(sharp, _gamma_lut(1.0 / 1.3))
+
+    # Adaptive threshold; invert for dark UI
+    th = cv2.adaptiveThreshold(sharp, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
+    if dark_ui:
+        th = cv2.bitwise_not(th)
+
+    # Light morphology
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 1))
+    return cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel, iterations=1)
+
+
+def _prep_screen(img):
+    """Photos of screens: colour non-local-means denoise (moire), then binarize."""
+    import cv2
+
+    img = cv2.fastNlMeansDenoisingColored(img, None, 5, 5, 7, 21)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return _binarize(gray, float(gray.mean()) < 110)  # heuristic
+
+
+def _prep_fast(img):
+    """Grayscale first, a 3x3 median instead of the colour denoise, then binarize."""
+    import cv2
+
+    gray = cv2.medianBlur(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), 3)
+    return _binarize(gray, float(gray.mean()) < 110)
+
+
+def _prep_scan(img):
+    """Clean scans: grayscale only (light text on dark flipped); Tesseract binarizes itself."""
+    import cv2
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return cv2.bitwise_not(gray) if float(gray.mean()) < 110 else gray
+
+
+_PROFILE_STEPS = {"fast": _prep_fast, "screen": _prep_screen, "scan": _prep_scan}
+
+
+def _cv2_preprocess_screen(image_path: str, profile: Optional[str] = None) -> Optional[Image.Image]:
+    """
+    Load and clean an image for OCR with a preprocessing profile ("fast",
+    "screen" or "scan"); "auto" (OCR_PREPROCESS default) picks one from
+    cheap image statistics. None if the image can't be read.
+    """
+    profile = (profile or OCR_PREPROCESS or "auto").lower()
+    if profile not in PREPROCESS_PROFILES:
+        raise ValueError(f"Unknown preprocessing profile '{profile}' (expected one of {', '.join(PREPROCESS_PROFILES)}).")
     try:
         import cv2
+        from PIL import Image
         img = cv2.imread(image_path)
         if img is None:
             return None
@@ -46,34 +217,15 @@ def _cv2_preprocess_screen(image_path: str) -> Optional[Image.Image]:
         # Pre-resize huge photos
         h0, w0 = img.shape[:2]
         max_side = max(h0, w0)
-        if max_side > 2200:
-            scale = 2200 / max_side
+        if max_side > _MAX_SIDE:
+            scale = _MAX_SIDE / max_side
             img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
 
-        # Denoise (helps moiré), then grayscale
-        img = cv2.fastNlMeansDenoisingColored(img, None, 5, 5, 7, 21)
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-        dark_ui = float(np.mean(gray)) < 110  # heuristic
-
-        # Unsharp mask
-        blur = cv2.GaussianBlur(gray, (0, 0), 1.2)
-        sharp = cv2.addWeighted(gray, 1.6, blur, -0.6, 0)
+        if profile == "auto":
+            profile = choose_profile(_image_stats(img))
+        th = _PROFILE_STEPS[profile](img)
 
-        # Gamma boost for dark UIs
-        if dark_ui:
-            inv_gamma = 1.0 / 1.3
-            table = (np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8"))
-            sharp = cv2.LUT(sharp, table)
-
-        # Adaptive threshold; invert for dark UI
-        th = cv2.adaptiveThreshold(sharp, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
-        if dark_ui:
-            th = cv2.bitwise_not(th)
-
-        # Light morphology + upscale if tiny
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 1))
-        th = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel, iterations=1)
+        # Upscale if tiny
         h, w = th.shape[:2]
         if min(h, w) < 900:
             th = cv2.resize(th, None, fx=1.7, fy=1.7, interpolation=cv2.INTER_CUBIC)
@@ -82,17 +234,291 @@ def _cv2_preprocess_screen(image_path: str) -> Optional[Image.Image]:
     except Exception:
         return None
 
-def _tesseract(pil_img: Image.Image, lang: str, psm: int) -> str:
-    cfg = f"--oem 3 --psm {psm} -c preserve_interword_spaces=1"
+# ---------- OCR engines ----------
+OCR_ENGINES = ("auto", "tesserocr", "pytesseract")
+_PASS_TIMEOUT = 30.0      # seconds, for any single engine call
+_MIN_CHARS = 10           # passes with less text never outrank ones with more
+
+
+@dataclass(frozen=True)
+class OcrResult:
+    """Text of one OCR pass and the mean confidence (0-100) of its words."""
+    text: str = ""
+    confidence: float = 0.0
+
+    def rank(self) -> Tuple[bool, float]:
+        return len(self.text.strip()) >= _MIN_CHARS, self.confidence
+
+    def confident(self) -> bool:
+        return self.rank() >= (True, OCR_CONFIDENCE_STOP)
+
+
+def _mean(values) -> float:
+    values = [float(v) for v in values if float(v) >= 0]  # -1 marks non-word boxes
+    return sum(values) / len(values) if values else 0.0
+
+
+def _result_from_data(data: Dict[str, list]) -> OcrResult:
+    """OcrResult from pytesseract's image_to_data dict: words joined into lines and paragraphs."""
+    paragraphs: Dict[Tuple[int, int], Dict[int, List[str]]] = {}
+    confs = []
+    for k, word in enumerate(data.get("text", [])):
+        if not (word or "").strip():
+            continue
+        para = paragraphs.setdefault((data["block_num"][k], data["par_num"][k]), {})
+        para.setdefault(data["line_num"][k], []).append(word.strip())
+        confs.append(data["conf"][k])
+    text = "\n\n".join("\n".join(" ".join(words) for words in lines.values()) for lines in paragraphs.values())
+    return OcrResult(text, _mean(confs))
+
+
+class PytesseractEngine:
+    """The tesseract CLI via pytesseract: one process (and traineddata load) per call."""
+    name = "pytesseract"
+
+    def recognize(self, pil_img: Image.Image, lang: str, psm: int, timeout: float = _PASS_TIMEOUT) -> OcrResult:
+        pt = _pytesseract()
+        cfg = f"--oem 3 --psm {psm} -c preserve_interword_spaces=1"
+        data = pt.image_to_data(pil_img, lang=lang, config=cfg, output_type=pt.Output.DICT, timeout=timeout)
+        return _result_from_data(data)
+
+    def detect_script(self, pil_img: Image.Image, timeout: float = _PASS_TIMEOUT) -> Tuple[Optional[str], float]:
+        pt = _pytesseract()
+        osd = pt.image_to_osd(pil_img, config="--psm 0", output_type=pt.Output.DICT, timeout=timeout)
+        return osd.get("script"), float(osd.get("script_conf") or 0.0)
+
+
+class TesserocrEngine:
+    """
+    libtesseract in-process via tesserocr. Initialized API handles are kept
+    in a pool of up to pool_size per language, so traineddata is loaded once
+    and images are passed from memory instead of through temp files.
+    """
+    name = "tesserocr"
+
+    def __init__(self, pool_size: int = OCR_ENGINE_POOL_SIZE):
+        import tesserocr  # ImportError here lets get_engine fall back
+
+        self._tesserocr = tesserocr
+        self.pool_size = max(1, pool_size)
+        self._pools: Dict[str, queue.LifoQueue] = {}
+        self._created: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _handle(self, lang: str) -> Iterator[object]:
+        with self._lock:
+            pool = self._pools.setdefault(lang, queue.LifoQueue())
+            create = pool.empty() and self._created.get(lang, 0) < self.pool_size
+            if create:
+                self._created[lang] = self._created.get(lang, 0) + 1
+        if create:
+            # OSD only exists in the legacy engine
+            oem = self._tesserocr.OEM.TESSERACT_ONLY if lang == "osd" else self._tesserocr.OEM.DEFAULT
+            try:
+                api = self._tesserocr.PyTessBaseAPI(lang=lang, oem=oem)
+                api.SetVariable("preserve_interword_spaces", "1")
+            except Exception:
+                with self._lock:
+                    self._created[lang] -= 1
+                raise
+        else:
+            api = pool.get()  # every handle for this language is busy; wait for one
+        try:
+            yield api
+        finally:
+            api.Clear()
+            pool.put(api)
+
+    def recognize(self, pil_img: Image.Image, lang: str, psm: int, timeout: float = _PASS_TIMEOUT) -> OcrResult:
+        with self._handle(lang) as api:
+            api.SetPageSegMode(psm)
+            api.SetImage(pil_img)
+            if not api.Recognize(int(timeout * 1000)):
+                return OcrResult()  # timed out; reading the text now would recognize again
+            return OcrResult(api.GetUTF8Text() or "", _mean(api.AllWordConfidences()))
+
+    def detect_script(self, pil_img: Image.Image, timeout: float = _PASS_TIMEOUT) -> Tuple[Optional[str], float]:
+        with self._handle("osd") as api:
+            api.SetPageSegMode(self._tesserocr.PSM.OSD_ONLY)
+            api.SetImage(pil_img)
+            osd = api.DetectOrientationScript() or {}
+        return osd.get("script_name"), float(osd.get("script_conf") or 0.0)
+
+    def close(self) -> None:
+        with self._lock:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    pool.get_nowait().End()
+            self._pools.clear()
+            self._created.clear()
+
+
+def get_engine(name: Optional[str] = None):
+    """
+    The shared OCR engine. "auto" (OCR_ENGINE default) uses tesserocr when
+    it is installed and pytesseract otherwise.
+    """
+    name = (name or OCR_ENGINE or "auto").lower()
+    if name not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine '{name}' (expected one of {', '.join(OCR_ENGINES)}).")
+    return _engine(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _engine(name: str):
+    if name != "pytesseract":
+        try:
+            return TesserocrEngine()
+        except ImportError as e:
+            if name == "tesserocr":
+                raise RuntimeError("The tesserocr OCR engine needs tesserocr: pip install tesserocr") from e
+    return PytesseractEngine()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _pass_timeout(deadline: Optional[float]) -> float:
+    left = _remaining(deadline)
+    return _PASS_TIMEOUT if left is None else min(_PASS_TIMEOUT, left)
+
+
+def _tesseract(pil_img: Image.Image, lang: str, psm: int, deadline: Optional[float] = None) -> OcrResult:
+    timeout = _pass_timeout(deadline)
+    if timeout <= 0:
+        return OcrResult()
+    _count("passes")
+    engine = get_engine()
     try:
-        return pytesseract.image_to_string(pil_img, lang=lang, config=cfg, timeout=30) or ""
+        return engine.recognize(pil_img, lang, psm, timeout)
     except Exception:
-        return ""
+        if engine.name == "pytesseract":
+            return OcrResult()
+    # in-process engine failed (e.g. traineddata not found where libtesseract looks)
+    try:
+        return get_engine("pytesseract").recognize(pil_img, lang, psm, _pass_timeout(deadline))
+    except Exception:
+        return OcrResult()
+
+# ---------- script detection ----------
+def _detect_script(pil_img: Image.Image, deadline: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Cheap pre-pass: Tesseract OSD on a downsampled copy. Returns (script,
+    traineddata combo), or (None, None) if the script is unknown, unmapped
+    or detected with low confidence.
+    """
+    _count("osd_passes")
+    sample = pil_img
+    if max(pil_img.size) > _OSD_MAX_SIDE:
+        sample = pil_img.copy()
+        sample.thumbnail((_OSD_MAX_SIDE, _OSD_MAX_SIDE))
+    script, conf = None, 0.0
+    for engine in dict.fromkeys((get_engine(), get_engine("pytesseract"))):
+        try:
+            script, conf = engine.detect_script(sample, _pass_timeout(deadline))
+            break
+        except Exception:  # e.g. too few characters, or no osd.traineddata
+            continue
+    tess = _LANG_MAP.get(_SCRIPT_LANG.get(script or "", ""))
+    if not tess or conf < _SCRIPT_MIN_CONF:
+        _count("script_undetected")
+        return None, None
+    _count("script_detected")
+    return script, ("eng" if tess == "eng" else "eng+" + tess)
+
+
+def _latin_ratio(stripped: str) -> float:
+    latin = re.sub(r"[^A-Za-z]+", "", stripped)
+    return len(latin) / max(len(stripped.replace(" ", "")), 1)
+
+
+def _confirms(text: str, script: str) -> bool:
+    """
+    True if OCR output in the detected script looks right: the same checks
+    the English pass uses to decide against trying other languages, or, for
+    other scripts, enough characters from that script's Unicode block.
+    """
+    stripped = (text or "").strip()
+    if len(stripped) < 30:
+        return False
+    if script == "Latin":
+        det_lang, prob = _detect_lang_code(stripped)
+        return _latin_ratio(stripped) >= 0.25 and not (det_lang and det_lang != "eng" and prob >= 0.70)
+    lo, hi = _SCRIPT_BLOCKS[script]
+    native = sum(lo <= ord(ch) <= hi for ch in stripped)
+    return native / max(len(stripped.replace(" ", "")), 1) >= 0.25
+
 
-def extract_text_from_image(image_path: str, lang: str = "auto") -> str:
+# ---------- concurrent passes ----------
+_OCR_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_OCR_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_ocr_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for OCR passes, bounded by OCR_MAX_WORKERS."""
+    global _OCR_EXECUTOR
+    with _OCR_EXECUTOR_LOCK:
+        if _OCR_EXECUTOR is None:
+            _OCR_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, min(OCR_MAX_WORKERS, os.cpu_count() or 1)), thread_name_prefix="studysage-ocr"
+            )
+        return _OCR_EXECUTOR
+
+
+def _best_pass(
+    pil_img: Image.Image,
+    passes: List[Tuple[str, int]],
+    baseline: OcrResult = OcrResult(),
+    deadline: Optional[float] = None,
+) -> OcrResult:
+    """
+    Run (lang, psm) passes concurrently and return the one with the highest
+    mean word confidence, or baseline if none beats it; ties go to the
+    earlier pass. The search stops as soon as a pass reaches
+    OCR_CONFIDENCE_STOP, or at the deadline with whatever has finished;
+    queued passes are then cancelled (running ones are bounded by their own
+    timeout and ignored).
+    """
+    if baseline.confident() or _remaining(deadline) == 0:
+        return baseline
+    pool = _get_ocr_executor()
+    futures = {pool.submit(_tesseract, pil_img, lang, psm, deadline): k for k, (lang, psm) in enumerate(passes)}
+    results: Dict[int, OcrResult] = {}
+    try:
+        for fut in as_completed(futures, timeout=_remaining(deadline)):
+            results[futures[fut]] = fut.result()
+            if results[futures[fut]].confident() and len(results) < len(futures):
+                _count("early_stops")
+                break
+    except TimeoutError:
+        _count("deadline_hits")
+    finally:
+        for fut in futures:
+            fut.cancel()
+    best = baseline
+    for k in sorted(results):
+        if results[k].rank() > best.rank():
+            best = results[k]
+    return best
+
+
+def extract_text_from_image(image_path: str, lang: str = "auto", deadline: Optional[float] = None) -> str:
+    """
+    OCR one image. Passes are ranked by mean word confidence; the search
+    ends early once one is confident enough, and returns the best text so
+    far after OCR_IMAGE_DEADLINE_S seconds or at `deadline` (a
+    time.monotonic() value, e.g. a whole document's budget), whichever
+    comes first.
+    """
+    if OCR_IMAGE_DEADLINE_S > 0:
+        own = time.monotonic() + OCR_IMAGE_DEADLINE_S
+        deadline = own if deadline is None else min(deadline, own)
     pil = _cv2_preprocess_screen(image_path)
     if pil is None:
         try:
+            from PIL import Image
             pil = Image.open(image_path).convert("L")
         except Exception:
             return ""
@@ -100,44 +526,44 @@ def extract_text_from_image(image_path: str, lang: str = "auto") -> str:
     psms = [6, 3]  # block-of-text, then auto-layout
 
     if lang != "auto":
+        best = OcrResult()
         for p in psms:
-            out = _tesseract(pil, lang, p)
-            if len(out.strip()) >= 10:
-                return out
-        return _tesseract(pil, lang, 6)
-
-    # AUTO: Pass 1: English
-    best = ""
-    for p in psms:
-        t = _tesseract(pil, "eng", p)
-        if len(t) > len(best):
-            best = t
-
-    stripped = (best or "").strip()
-    det_lang, prob = _detect_lang_code(stripped)
+            out = _tesseract(pil, lang, p, deadline)
+            if out.rank() > best.rank():
+                best = out
+            if best.confident():
+                break
+        return best.text
+
+    # AUTO: script detection picks one combo; if its output checks out, done
+    tried: Dict[str, OcrResult] = {}
+    if OCR_SCRIPT_DETECT:
+        script, combo = _detect_script(pil, deadline)
+        if combo:
+            result = _best_pass(pil, [(combo, p) for p in psms], deadline=deadline)
+            if _confirms(result.text, script):
+                _count("script_confirmed")
+                return result.text
+            _count("script_rejected")
+            tried[combo] = result
 
-    import re
-    latin = re.sub(r"[^A-Za-z]+", "", stripped or "")
-    latin_ratio = len(latin) / max(len((stripped or "").replace(" ", "")), 1)
+    # Pass 1: English
+    best = tried["eng"] if "eng" in tried else _best_pass(pil, [("eng", p) for p in psms], deadline=deadline)
+
+    stripped = best.text.strip()
+    det_lang, prob = _detect_lang_code(stripped)
+    latin_ratio = _latin_ratio(stripped)
 
     should_try_other = (len(stripped) < 30) or (latin_ratio < 0.25) or (det_lang and det_lang != "eng" and prob >= 0.70)
 
     if should_try_other:
-        tried = set()
+        # detected language first so it wins ties; all candidates run concurrently
+        combos = []
         if det_lang:
-            tried.add(det_lang)
-            combo = "eng+" + det_lang if det_lang != "eng" else "eng"
-            for p in psms:
-                t = _tesseract(pil, combo, p)
-                if len(t.strip()) > len(best.strip()):
-                    best = t
-        for guess in ("hin", "guj", "ben", "mar", "tam", "tel"):
-            if guess in tried:
-                continue
-            combo = "eng+" + guess
-            for p in psms:
-                t = _tesseract(pil, combo, p)
-                if len(t.strip()) > len(best.strip()):
-                    best = t
-
-    return best or ""
+            combos.append("eng+" + det_lang if det_lang != "eng" else "eng")
+        combos += ["eng+" + g for g in ("hin", "guj", "ben", "mar", "tam", "tel") if g != det_lang]
+        baseline = max([best] + [r for c, r in tried.items() if c != "eng"], key=OcrResult.rank)
+        combos = [c for c in combos if c not in tried]
+        best = _best_pass(pil, [(c, p) for c in combos for p in psms], baseline, deadline)
+
+    return best.text
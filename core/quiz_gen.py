@@ -1,9 +1,10 @@
 # core/quiz_gen.py
+import functools
 import random
-import nltk
 
 # Self-heal: ensure tokenizer/stopwords exist (no crashes on fresh envs)
 def _ensure_nltk():
+    import nltk
     try:
         nltk.data.find("tokenizers/punkt")
     except LookupError:
@@ -18,16 +19,18 @@ def _ensure_nltk():
     except LookupError:
         nltk.download("stopwords", quiet=True)
 
-_ensure_nltk()
-
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-
-STOP = set(stopwords.words("english"))
+@functools.lru_cache(maxsize=None)
+def _nltk():
+    """NLTK is imported (and its data checked) on first use, not at import."""
+    _ensure_nltk()
+    from nltk.corpus import stopwords
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    return sent_tokenize, word_tokenize, frozenset(stopwords.words("english"))
 
 def _keywords(text: str, k: int = 10):
+    _, word_tokenize, stop = _nltk()
     words = [w.lower() for w in word_tokenize(text) if w.isalpha()]
-    words = [w for w in words if w not in STOP and len(w) > 2]
+    words = [w for w in words if w not in stop and len(w) > 2]
     freq = {}
     for w in words: freq[w] = freq.get(w, 0) + 1
     top = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:max(3, k)]
@@ -41,6 +44,7 @@ def generate_questions(summary: str, num_questions: int = 5):
     Note: For more advanced, non-deterministic question generation, exploring a dedicated 
     Question Generation model (like a T5-based model) would be the next step.
     """
+    sent_tokenize = _nltk()[0]
     sents = [s.strip() for s in sent_tokenize(summary) if s.strip()]
     if not sents:
         return []
@@ -2,17 +2,41 @@
 from __future__ import annotations
 import os
 import re
-import requests
+import asyncio
+import atexit
+import functools
+import gc
+import hashlib
+import json
+import shutil
+import sys
+import threading
+import time
+import traceback
+import bisect
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Callable, Optional, Dict, List
+from typing import Callable, Optional, Dict, Iterator, List, Tuple, Union
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from core.summary_cache import SummaryCache, get_cache
+
+# transformers/torch, numpy (core.extractive) and the HTTP clients are
+# imported on first use so importing this module stays cheap for the apps.
 
 # Import configuration from the centralized config module
 try:
     from config import (
         MODEL_NAME, ONLINE_MODE_MAX_CHARS, ONLINE_MODE_MAX_WORDS,
-        OFFLINE_MODE_MAX_CHARS, OFFLINE_MODE_MAX_WORDS
+        OFFLINE_MODE_MAX_CHARS, OFFLINE_MODE_MAX_WORDS, OFFLINE_BATCH_SIZE,
+        OFFLINE_WORKERS, SUMMARY_CACHE_ENABLED, REDUCE_TARGET_WORDS,
+        OFFLINE_ASYNC_THREADS, OFFLINE_BACKEND, PRECOMPRESS_RATIO,
+        LENGTH_POLICY, CHUNKING, INFERENCE_DAEMON, MODEL_IDLE_TIMEOUT,
+        TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS, TORCH_PRECISION,
+        RUNTIME_PROFILE_PATH, OFFLINE_MICROBATCH_WAIT_MS, OFFLINE_MICROBATCH_MAX_SIZE
     )
 except ImportError:
     # Fallback configuration if config.py doesn't exist
@@ -21,37 +45,102 @@ except ImportError:
     ONLINE_MODE_MAX_WORDS = 800
     OFFLINE_MODE_MAX_CHARS = 100000
     OFFLINE_MODE_MAX_WORDS = 20000
+    OFFLINE_BATCH_SIZE = 4
+    OFFLINE_WORKERS = 1
+    SUMMARY_CACHE_ENABLED = True
+    REDUCE_TARGET_WORDS = 500
+    OFFLINE_ASYNC_THREADS = 2
+    OFFLINE_BACKEND = "torch"
+    PRECOMPRESS_RATIO = 1.0
+    LENGTH_POLICY = "fixed"
+    CHUNKING = "greedy"
+    INFERENCE_DAEMON = True
+    MODEL_IDLE_TIMEOUT = 30
+    TORCH_INTRA_OP_THREADS = 0
+    TORCH_INTER_OP_THREADS = 0
+    TORCH_PRECISION = "fp32"
+    RUNTIME_PROFILE_PATH = "models/runtime_profile.json"
+    OFFLINE_MICROBATCH_WAIT_MS = 5
+    OFFLINE_MICROBATCH_MAX_SIZE = 8
 
 # ---------- constants & dirs ----------
 MODELS_DIR = Path("models")
-MODELS_DIR.mkdir(exist_ok=True)
 
 LOCAL_MODEL_DIR = MODELS_DIR / "distilbart-cnn-12-6"
 
 Progress = Optional[Callable[[str, int, int], None]]
 
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+_LINE_BOUNDARY = re.compile(r"\n\s*")
+
+
+@dataclass
+class ChunkSummary:
+    """One chunk's result from summarize_iter; start/end index into the input text."""
+    index: int
+    summary: str
+    start: int
+    end: int
+    cached: bool = False
+
+
+@dataclass
+class IncrementalSummary:
+    """
+    Result of summarize_incremental. manifest is JSON-serializable; pass it
+    back on the next call for the same document.
+    """
+    summary: str
+    manifest: Dict[str, object] = field(default_factory=dict)
+    reused: int = 0
+    computed: int = 0
+
 
 # ---------- utilities ----------
-def _chunk_text(text: str, max_words: int = 600) -> List[str]:
+def _sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    lo = len(text) - len(text.lstrip())
+    hi = len(text.rstrip())
+    pos = lo
+    for m in _SENTENCE_BOUNDARY.finditer(text, lo, hi):
+        yield pos, m.start()
+        pos = m.end()
+    yield pos, max(pos, hi)
+
+
+def _iter_chunk_spans(text: str, max_words: int = 600) -> Iterator[Tuple[str, int, int]]:
     """
-    Split text into chunks ~max_words using sentence boundaries when possible.
+    Lazily yield (chunk, start, end) with the same chunking as _chunk_text,
+    plus each chunk's character span in the original text.
     """
-    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
-    chunks: List[str] = []
     cur: List[str] = []
+    cur_start = cur_end = 0
     cur_words = 0
 
-    for s in sentences:
+    for a, b in _sentence_spans(text):
+        s = text[a:b]
         w = len(s.split())
         if cur and cur_words + w > max_words:
-            chunks.append(" ".join(cur))
-            cur, cur_words = [s], w
+            yield " ".join(cur), cur_start, cur_end
+            cur, cur_words, cur_start = [s], w, a
         else:
+            if not cur:
+                cur_start = a
             cur.append(s)
             cur_words += w
+        cur_end = b
     if cur:
-        chunks.append(" ".join(cur))
-    return chunks if chunks else [text.strip()]
+        yield " ".join(cur), cur_start, cur_end
+
+
+def _chunk_spans(text: str, max_words: int = 600) -> List[Tuple[str, int, int]]:
+    return list(_iter_chunk_spans(text, max_words))
+
+
+def _chunk_text(text: str, max_words: int = 600) -> List[str]:
+    """
+    Split text into chunks ~max_words using sentence boundaries when possible.
+    """
+    return [c for c, _, _ in _chunk_spans(text, max_words)]
 
 
 def _count_words(text: str) -> int:
@@ -78,6 +167,8 @@ def download_model() -> Path:
     """
     Download the offline model locally so the pipeline can run without internet.
     """
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
     tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
     model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
     LOCAL_MODEL_DIR.mkdir(parents=True, exist_ok=True)
@@ -95,7 +186,1381 @@ def get_model_path() -> Path:
     return LOCAL_MODEL_DIR
 
 
+# ---------- ONNX Runtime backend ----------
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _atomic_build(target: Path, build: Callable[[Path], None]) -> Path:
+    # build into a temp dir and rename, so a crash or a concurrent process
+    # never sees a half-written export
+    if (target / "config.json").exists():
+        return target
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    try:
+        build(tmp)
+        try:
+            tmp.rename(target)
+        except OSError:
+            if not (target / "config.json").exists():
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def onnx_model_path(quantize: bool = False, model_dir: Optional[Path] = None) -> Path:
+    """
+    Export the local model to ONNX once and return the cached directory next
+    to it (<model>-onnx). With quantize=True, also apply dynamic int8 weight
+    quantization (<model>-onnx-int8). Requires optimum[onnxruntime].
+    """
+    src = Path(model_dir or get_model_path())
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError("The ONNX backend needs optimum: pip install optimum[onnxruntime]") from e
+
+    from transformers import AutoTokenizer
+
+    def _export(out: Path) -> None:
+        ORTModelForSeq2SeqLM.from_pretrained(src, export=True).save_pretrained(out)
+        AutoTokenizer.from_pretrained(src).save_pretrained(out)
+
+    onnx_dir = _atomic_build(src.with_name(src.name + "-onnx"), _export)
+    if not quantize:
+        return onnx_dir
+
+    def _quantize(out: Path) -> None:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        for f in onnx_dir.iterdir():
+            if f.suffix == ".onnx":
+                quantize_dynamic(f.as_posix(), (out / f.name).as_posix(), weight_type=QuantType.QInt8)
+            elif f.is_file():
+                shutil.copy2(f, out / f.name)
+
+    return _atomic_build(src.with_name(src.name + "-onnx-int8"), _quantize)
+
+
+def _resolve_backend(value: Optional[str]) -> str:
+    backend = (value or OFFLINE_BACKEND or "torch").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown offline backend '{backend}' (expected one of {', '.join(BACKENDS)}).")
+    return backend
+
+
+def _load_pipeline(model_dir: str, device: int, backend: str):
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "torch":
+        profile = get_runtime_profile()
+        _apply_threads(profile)
+        # device=-1 forces CPU; device=0 selects the first GPU
+        pipe = pipeline("summarization", model=model_dir, device=device)
+        return _with_precision(pipe, profile.precision) if device < 0 else pipe
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    onnx_dir = onnx_model_path(quantize=backend == "onnx-int8", model_dir=Path(model_dir))
+    provider = "CUDAExecutionProvider" if device >= 0 else "CPUExecutionProvider"
+    model = ORTModelForSeq2SeqLM.from_pretrained(onnx_dir, provider=provider)
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(onnx_dir))
+
+
+def _model_id(backend: str) -> str:
+    """Model name for cache keys; backends and precisions that can word things differently are kept apart."""
+    if backend == "torch":
+        precision = get_runtime_profile().precision
+        return MODEL_NAME if precision == "fp32" else f"{MODEL_NAME}@torch-{precision}"
+    return MODEL_NAME if backend == "api" else f"{MODEL_NAME}@{backend}"
+
+
+# ---------- CPU runtime profile ----------
+PRECISIONS = ("fp32", "bf16", "int8")
+
+
+@dataclass(frozen=True)
+class RuntimeProfile:
+    """
+    Torch CPU settings for offline inference. 0 threads keeps torch's
+    default. precision: "fp32", "bf16" (autocast) or "int8" (dynamic
+    quantization of the Linear layers).
+    """
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    precision: str = "fp32"
+
+
+_PROFILE: Optional[RuntimeProfile] = None
+_INTEROP_APPLIED = False
+
+
+def _check_profile(profile: RuntimeProfile) -> RuntimeProfile:
+    if profile.precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{profile.precision}' (expected one of {', '.join(PRECISIONS)}).")
+    return profile
+
+
+def load_runtime_profile(path: Optional[Path] = None) -> RuntimeProfile:
+    """
+    The profile saved by calibrate_runtime, or the TORCH_* config values if
+    there is none. A saved profile calibrated on a different core count is
+    ignored.
+    """
+    try:
+        data = json.loads(Path(path or RUNTIME_PROFILE_PATH).read_text(encoding="utf-8"))
+        if data.get("cpu_count") in (None, os.cpu_count()):
+            return _check_profile(RuntimeProfile(
+                int(data["intra_op_threads"]), int(data["inter_op_threads"]), str(data["precision"])
+            ))
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        pass
+    return _check_profile(RuntimeProfile(TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS, TORCH_PRECISION.lower()))
+
+
+def save_runtime_profile(profile: RuntimeProfile, path: Optional[Path] = None, **extra) -> Path:
+    """Write `profile` (plus any extra fields, e.g. timings) where load_runtime_profile finds it."""
+    target = Path(path or RUNTIME_PROFILE_PATH)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    data = {**extra, "intra_op_threads": profile.intra_op_threads, "inter_op_threads": profile.inter_op_threads,
+            "precision": profile.precision, "cpu_count": os.cpu_count()}
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def get_runtime_profile() -> RuntimeProfile:
+    """The profile this process uses, loaded on first call."""
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = load_runtime_profile()
+    return _PROFILE
+
+
+def set_runtime_profile(profile: RuntimeProfile) -> None:
+    """
+    Switch this process to `profile`. Thread counts apply immediately; idle
+    torch models are unloaded so they reload at the new precision.
+    """
+    global _PROFILE
+    _PROFILE = _check_profile(profile)
+    if "torch" in sys.modules:
+        _apply_threads(profile)
+    unload_models()
+
+
+def _apply_threads(profile: RuntimeProfile) -> None:
+    global _INTEROP_APPLIED
+    import torch
+
+    if profile.intra_op_threads > 0:
+        torch.set_num_threads(profile.intra_op_threads)
+    if profile.inter_op_threads > 0 and not _INTEROP_APPLIED:
+        try:
+            torch.set_num_interop_threads(profile.inter_op_threads)
+        except RuntimeError:
+            pass  # torch only allows this before its first inter-op parallel work
+        _INTEROP_APPLIED = True
+
+
+class _AutocastPipeline:
+    """Pipeline wrapper that runs every call under CPU bf16 autocast."""
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    def __call__(self, *args, **kwargs):
+        import torch
+
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            return self._pipe(*args, **kwargs)
+
+
+def _with_precision(pipe, precision: str):
+    if precision == "int8":
+        import torch
+
+        pipe.model = torch.ao.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif precision == "bf16":
+        return _AutocastPipeline(pipe)
+    return pipe
+
+
+# ---------- model registry ----------
+# One pipeline per (model path, device, backend) for the whole process.
+# Loading is serialized by _REGISTRY_LOCK so concurrent first calls don't
+# load twice; each entry also carries its own lock because the fast
+# tokenizer is not safe to call from several threads at once.
+_REGISTRY: Dict[Tuple[str, int, str], Tuple[object, threading.Lock]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _get_entry(
+    model_dir: Optional[Path] = None,
+    device: int = -1,
+    backend: Optional[str] = None,
+) -> Tuple[object, threading.Lock]:
+    key = (str(model_dir or get_model_path()), device, _resolve_backend(backend))
+    entry = _REGISTRY.get(key)
+    if entry is None:
+        with _REGISTRY_LOCK:
+            entry = _REGISTRY.get(key)
+            if entry is None:
+                entry = (_load_pipeline(*key), threading.Lock())
+                _REGISTRY[key] = entry
+                _MODEL_EVENTS["loads"] += 1
+                _ensure_reaper()
+    _LAST_USED[key] = time.monotonic()
+    return entry
+
+
+# ---------- idle eviction ----------
+# Models unused for MODEL_IDLE_TIMEOUT minutes are dropped by a background
+# thread and reloaded by the next _get_entry call.
+_LAST_USED: Dict[Tuple[str, int, str], float] = {}
+_MODEL_EVENTS = {"loads": 0, "unloads": 0}
+_REAPER: Optional[threading.Thread] = None
+
+
+def _ensure_reaper() -> None:
+    global _REAPER
+    if MODEL_IDLE_TIMEOUT and MODEL_IDLE_TIMEOUT > 0 and (_REAPER is None or not _REAPER.is_alive()):
+        _REAPER = threading.Thread(target=_reap_forever, name="studysage-model-reaper", daemon=True)
+        _REAPER.start()
+
+
+def _reap_forever() -> None:
+    timeout = MODEL_IDLE_TIMEOUT * 60
+    while True:
+        time.sleep(max(1.0, min(60.0, timeout / 4)))
+        try:
+            evict_idle(timeout)
+        except Exception:
+            pass  # never let the reaper die; the next round retries
+
+
+def _release_memory() -> None:
+    """Collect garbage and hand freed heap pages back to the OS where possible."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def evict_idle(max_idle_seconds: float) -> int:
+    """
+    Unload models (and the worker pool) unused for max_idle_seconds, then
+    release memory. Models in the middle of a request are left alone.
+    Returns the number of models unloaded.
+    """
+    now = time.monotonic()
+    victims = []
+    with _REGISTRY_LOCK:
+        for key, (pipe, lock) in list(_REGISTRY.items()):
+            if now - _LAST_USED.get(key, now) < max_idle_seconds or not lock.acquire(blocking=False):
+                continue
+            try:
+                del _REGISTRY[key]
+                _LAST_USED.pop(key, None)
+                victims.append(pipe)
+            finally:
+                lock.release()
+        _MODEL_EVENTS["unloads"] += len(victims)
+    unloaded = len(victims)
+    pool_idle = _shutdown_idle_pool(max_idle_seconds)
+    if victims or pool_idle:
+        del victims
+        _release_memory()
+    return unloaded
+
+
+def unload_models() -> int:
+    """Unload every idle model now; they reload on the next request."""
+    return evict_idle(0)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def model_stats() -> Dict[str, object]:
+    """
+    Current resident set size of this process, the loaded models with their
+    idle time, and load/unload counts, for tuning MODEL_IDLE_TIMEOUT.
+    """
+    now = time.monotonic()
+    return {
+        "rss_bytes": _rss_bytes(),
+        "loaded": {
+            f"{path}@{backend}": round(now - _LAST_USED.get((path, device, backend), now), 1)
+            for path, device, backend in list(_REGISTRY)
+        },
+        "loads": _MODEL_EVENTS["loads"],
+        "unloads": _MODEL_EVENTS["unloads"],
+        "worker_pool": _POOL_KEY[0] if _POOL_KEY else 0,
+        "idle_timeout_minutes": MODEL_IDLE_TIMEOUT,
+    }
+
+
+def get_summarizer(model_dir: Optional[Path] = None, device: int = -1, backend: Optional[str] = None):
+    """
+    Return the shared summarization pipeline for (model_dir, device, backend),
+    loading it on first use. Defaults to the local offline model on CPU with
+    OFFLINE_BACKEND ("torch", "onnx" or "onnx-int8").
+    """
+    return _get_entry(model_dir, device, backend)[0]
+
+
+def warmup(model_dir: Optional[Path] = None, device: int = -1, backend: Optional[str] = None) -> None:
+    """
+    Load the offline model and run one short generation so the first real
+    request doesn't pay for lazy initialization.
+    """
+    summarizer, lock = _get_entry(model_dir, device, backend)
+    with lock:
+        summarizer("StudySage warmup. This sentence primes the model.", max_length=16, min_length=1, do_sample=False)
+
+
+def _batches(chunks: List[str], batch_size: int, lengths: Optional[List[Tuple[int, int]]]) -> List[List[int]]:
+    """
+    Chunk indices grouped into batches, length-sorted so each batch pads to a
+    similar size. With per-chunk budgets a batch is also cut where max_length
+    grows by more than a quarter, since the whole batch decodes to its
+    largest budget.
+    """
+    if lengths is None:
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        return [order[k:k + batch_size] for k in range(0, len(order), batch_size)]
+    batches: List[List[int]] = []
+    for i in sorted(range(len(chunks)), key=lambda i: (lengths[i][1], len(chunks[i]))):
+        if not batches or len(batches[-1]) >= batch_size or lengths[i][1] * 4 > lengths[batches[-1][0]][1] * 5:
+            batches.append([])
+        batches[-1].append(i)
+    return batches
+
+
+def _batch_lengths(
+    idx: List[int],
+    min_length: int,
+    max_length: int,
+    lengths: Optional[List[Tuple[int, int]]],
+) -> Tuple[int, int]:
+    if lengths is None:
+        return min_length, max_length
+    return min(lengths[i][0] for i in idx), max(lengths[i][1] for i in idx)
+
+
+# ---------- cross-request micro-batching ----------
+# Concurrent callers (bot executor jobs, daemon connections) hand their chunks
+# to one scheduler thread per backend, which merges them into shared padded
+# batches instead of taking turns on the model lock.
+@dataclass
+class _Caller:
+    items: deque               # (chunk, min_length, max_length, future), in submission order
+    batch_size: int
+    arrived: float
+
+
+class _MicroBatcher:
+    """
+    Collects chunks from concurrent callers for up to max_wait seconds (or
+    until max_size chunks are queued) and runs them in shared forward
+    passes. Each caller contributes up to its own batch_size per round, and
+    rounds are filled round-robin, so a long document doesn't starve a
+    short one behind it. Only chunks with identical (min_length,
+    max_length) share a pass, so a summary never depends on what other
+    callers asked for.
+    """
+
+    def __init__(self, backend: str, max_wait: float, max_size: int):
+        self.backend = backend
+        self.max_wait = max_wait
+        self.max_size = max(1, max_size)
+        self._callers: deque = deque()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"studysage-microbatch-{backend}", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: List[Tuple[str, int, int]], batch_size: int) -> List[Future]:
+        futures = [Future() for _ in items]
+        if not futures:
+            return futures
+        with self._cond:
+            self._callers.append(_Caller(
+                deque((c, lo, hi, f) for (c, lo, hi), f in zip(items, futures)), max(1, batch_size), time.monotonic()
+            ))
+            self._cond.notify()
+        return futures
+
+    def _ready(self) -> int:
+        # chunks the next round could take, given each caller's quota
+        return sum(min(len(c.items), c.batch_size) for c in self._callers)
+
+    def _take(self) -> List[Tuple[str, int, int, Future]]:
+        with self._cond:
+            while not self._callers:
+                self._cond.wait()
+            # wait for concurrent arrivals until a full batch is queued or the oldest caller's window closes
+            deadline = min(c.arrived for c in self._callers) + self.max_wait
+            while self._ready() < self.max_size and time.monotonic() < deadline:
+                self._cond.wait(deadline - time.monotonic())
+            cap = self.max_size
+            taken = []
+            quota = {id(c): c.batch_size for c in self._callers}
+            skipped = 0
+            while self._callers and len(taken) < cap and skipped < len(self._callers):
+                caller = self._callers.popleft()
+                if not caller.items:
+                    continue
+                if not quota[id(caller)]:
+                    self._callers.append(caller)
+                    skipped += 1
+                    continue
+                skipped = 0
+                quota[id(caller)] -= 1
+                item = caller.items.popleft()
+                if item[3].set_running_or_notify_cancel():  # skip chunks whose caller gave up
+                    taken.append(item)
+                if caller.items:
+                    self._callers.append(caller)
+            return taken
+
+    def _run(self) -> None:
+        while True:
+            taken: List[Tuple[str, int, int, Future]] = []
+            try:
+                taken = self._take()
+                self._run_round(taken)
+            except Exception as e:
+                # a scheduler error must fail the work in hand, not end the
+                # thread and leave every later caller waiting forever
+                traceback.clear_frames(e.__traceback__)
+                with self._cond:
+                    stranded = [item for c in self._callers for item in c.items] if not taken else []
+                    if stranded:
+                        self._callers.clear()
+                for *_, fut in taken + stranded:
+                    if not fut.done():
+                        fut.set_exception(e)
+            del taken
+
+    def _run_round(self, taken: List[Tuple[str, int, int, Future]]) -> None:
+        groups: Dict[Tuple[int, int], List[Tuple[str, Future]]] = {}
+        for chunk, lo, hi, fut in taken:
+            groups.setdefault((lo, hi), []).append((chunk, fut))
+        for (lo, hi), items in groups.items():
+            try:
+                outs = _run_pass(self.backend, [c for c, _ in items], lo, hi)
+            except Exception as e:
+                traceback.clear_frames(e.__traceback__)  # don't let the error pin the model
+                for _, fut in items:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), summary in zip(items, outs):
+                fut.set_result(summary)
+
+
+def _run_pass(backend: str, chunks: List[str], min_length: int, max_length: int) -> List[str]:
+    # a separate frame, so the scheduler thread holds no reference to the
+    # pipeline between passes and idle eviction can free it
+    summarizer, lock = _get_entry(backend=backend)
+    with lock:
+        outs = summarizer(
+            chunks,
+            batch_size=len(chunks),
+            truncation=True,
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+        )
+    return [out["summary_text"] for out in outs]
+
+
+_BATCHERS: Dict[str, _MicroBatcher] = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def _get_batcher(backend: Optional[str]) -> _MicroBatcher:
+    backend = _resolve_backend(backend)
+    with _BATCHERS_LOCK:
+        batcher = _BATCHERS.get(backend)
+        if batcher is None:
+            batcher = _BATCHERS[backend] = _MicroBatcher(
+                backend, OFFLINE_MICROBATCH_WAIT_MS / 1000, OFFLINE_MICROBATCH_MAX_SIZE
+            )
+        return batcher
+
+
+def _iter_microbatched(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    progress_callback: Progress = None,
+    backend: Optional[str] = None,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> Iterator[List[Tuple[int, str]]]:
+    if not chunks:
+        return
+    # submitted in _batches order with each batch's lengths, so every chunk is
+    # decoded exactly as the unshared path would decode it
+    order: List[int] = []
+    items: List[Tuple[str, int, int]] = []
+    for idx in _batches(chunks, max(1, int(batch_size)), lengths):
+        lo, hi = _batch_lengths(idx, min_length, max_length, lengths)
+        order += idx
+        items += [(chunks[i], lo, hi) for i in idx]
+    futures = dict(zip(_get_batcher(backend).submit(items, int(batch_size)), order))
+    pending = set(futures)
+    done = 0
+    try:
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            batch = [(futures[f], f.result()) for f in finished]
+            done += len(batch)
+            if progress_callback:
+                progress_callback("Summarizing chunks (offline)", done, len(chunks))
+            yield batch
+    finally:
+        for f in pending:
+            f.cancel()
+
+
+def _iter_batch_results(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    progress_callback: Progress = None,
+    backend: Optional[str] = None,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Run the offline model over chunks in padded batches, yielding each
+    batch's [(chunk index, summary), ...] as it finishes.
+
+    Chunks are sorted by length first so each batch pads to a similar size.
+    lengths optionally gives a (min_length, max_length) per chunk; a batch
+    decodes with the largest max and smallest min of its members. With
+    OFFLINE_MICROBATCH_WAIT_MS > 0 the batches are shared with other
+    threads summarizing at the same time.
+    """
+    if OFFLINE_MICROBATCH_WAIT_MS > 0:
+        yield from _iter_microbatched(chunks, min_length, max_length, batch_size, progress_callback, backend, lengths)
+        return
+    total = len(chunks)
+    done = 0
+
+    for idx in _batches(chunks, max(1, int(batch_size)), lengths):
+        lo, hi = _batch_lengths(idx, min_length, max_length, lengths)
+        # fetched per batch so long jobs keep the model's idle clock fresh
+        summarizer, lock = _get_entry(backend=backend)
+        with lock:
+            outs = summarizer(
+                [chunks[i] for i in idx],
+                batch_size=len(idx),
+                truncation=True,
+                max_length=hi,
+                min_length=lo,
+                do_sample=False,
+            )
+        done += len(idx)
+        if progress_callback:
+            progress_callback("Summarizing chunks (offline)", done, total)
+        yield [(i, out["summary_text"]) for i, out in zip(idx, outs)]
+
+
+def _iter_batched(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    progress_callback: Progress = None,
+    backend: Optional[str] = None,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> Iterator[Tuple[int, str]]:
+    """_iter_batch_results flattened to (chunk index, summary) pairs."""
+    for batch in _iter_batch_results(chunks, min_length, max_length, batch_size, progress_callback, backend, lengths):
+        yield from batch
+
+
+def _summarize_batched(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    progress_callback: Progress = None,
+    backend: Optional[str] = None,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> List[str]:
+    """_iter_batched collected back into chunk order."""
+    results: List[str] = [""] * len(chunks)
+    for i, summary in _iter_batched(chunks, min_length, max_length, batch_size, progress_callback, backend, lengths):
+        results[i] = summary
+    return results
+
+
+# ---------- tokenizer-aware chunking ----------
+_TOKENIZERS: Dict[str, Tuple[object, threading.Lock]] = {}
+# Slack for tokens that merge differently once a chunk is cut out of the text
+_CHUNK_TOKEN_MARGIN = 8
+
+
+def _get_tokenizer(model_dir: Optional[Path] = None) -> Tuple[object, threading.Lock]:
+    key = str(model_dir or get_model_path())
+    entry = _TOKENIZERS.get(key)
+    if entry is not None:
+        return entry
+    with _REGISTRY_LOCK:
+        entry = _TOKENIZERS.get(key)
+        if entry is None:
+            from transformers import AutoTokenizer
+
+            entry = (AutoTokenizer.from_pretrained(key, use_fast=True), threading.Lock())
+            _TOKENIZERS[key] = entry
+    return entry
+
+
+def _chunk_token_budget(tokenizer) -> int:
+    limit = getattr(tokenizer, "model_max_length", 1024)
+    if not limit or limit > 100_000:  # "unlimited" sentinel on some tokenizers
+        limit = 1024
+    return max(16, limit - tokenizer.num_special_tokens_to_add() - _CHUNK_TOKEN_MARGIN)
+
+
+def _last_boundary(bounds: List[int], lo: int, hi: int) -> Optional[int]:
+    i = bisect.bisect_right(bounds, hi) - 1
+    return bounds[i] if i >= 0 and bounds[i] > lo else None
+
+
+def _iter_token_chunk_spans(
+    text: str,
+    offsets: List[Tuple[int, int]],
+    max_tokens: int,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (chunk, start, end) windows of at most max_tokens model tokens,
+    given the tokenizer's offset mapping for the whole text.
+
+    Each window is filled up to the budget and cut at the last sentence
+    boundary inside it, else the last line break, else the last whitespace
+    between tokens, else exactly at the budget (OCR text often has no
+    punctuation at all).
+    """
+    n = len(offsets)
+    if n == 0:
+        lo = len(text) - len(text.lstrip())
+        yield "", lo, lo
+        return
+
+    starts = [a for a, _ in offsets]
+    sentence_bounds = [m.end() for m in _SENTENCE_BOUNDARY.finditer(text)]
+    line_bounds = [m.end() for m in _LINE_BOUNDARY.finditer(text)]
+
+    t0 = 0
+    while t0 < n:
+        t1 = min(n, t0 + max_tokens)
+        if t1 < n:
+            lo, hi = starts[t0], starts[t1]
+            cut = _last_boundary(sentence_bounds, lo, hi) or _last_boundary(line_bounds, lo, hi)
+            if cut is not None:
+                t1 = bisect.bisect_left(starts, cut, t0 + 1, t1)
+            else:
+                t = t1
+                while t > t0 + 1 and not text[starts[t] - 1].isspace():
+                    t -= 1
+                if t > t0 + 1:
+                    t1 = t
+        a, b = offsets[t0][0], offsets[t1 - 1][1]
+        yield text[a:b], a, b
+        t0 = t1
+
+
+def _iter_offline_spans(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Offline chunking: token windows sized to the local model's input limit."""
+    tokenizer, lock = _get_tokenizer()
+    if not getattr(tokenizer, "is_fast", False):
+        # slow tokenizers have no offset mapping; fall back to word counts
+        yield from _iter_chunk_spans(text, max_words=800)
+        return
+    # one tokenizer pass over the whole text; the fast tokenizer isn't thread-safe
+    with lock:
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)["offset_mapping"]
+    yield from _iter_token_chunk_spans(text, offsets, _chunk_token_budget(tokenizer))
+
+
+# ---------- content-defined chunking ----------
+CHUNKING_MODES = ("greedy", "content")
+# Units are sentences, or lines for unpunctuated OCR/slide text
+_CDC_UNIT = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+_CDC_WINDOW = 4           # units hashed together when deciding a boundary
+_CDC_BASE = 1_000_003
+_CDC_MASK = (1 << 64) - 1
+
+
+def _unit_spans(text: str) -> Iterator[Tuple[int, int]]:
+    pos = 0
+    end = len(text.rstrip())
+    for m in itertools.chain(_CDC_UNIT.finditer(text, 0, end), [None]):
+        stop = m.start() if m is not None else end
+        seg = text[pos:stop]
+        if seg.strip():
+            yield pos + len(seg) - len(seg.lstrip()), pos + len(seg.rstrip())
+        if m is not None:
+            pos = m.end()
+
+
+def _fingerprint(unit: str) -> int:
+    return int.from_bytes(hashlib.blake2b(" ".join(unit.split()).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _iter_content_defined_spans(
+    text: str,
+    size: Callable[[int, int], int],
+    max_size: int,
+    split: Callable[[int, int], Iterator[Tuple[str, int, int]]],
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (chunk, start, end) with boundaries chosen by content rather than
+    position, so an edit only changes the chunks around it.
+
+    A polynomial rolling hash runs over the fingerprints of the last
+    _CDC_WINDOW units (sentences or lines). After each unit, once the chunk
+    holds max_size/2, a boundary is placed when the hash falls below a
+    threshold proportional to the unit's size, which makes chunks average
+    about 0.7 * max_size. Chunks never exceed max_size (about 8% of cuts are
+    forced there, and the next content boundary resynchronizes); a single
+    unit larger than that is cut with `split`.
+    """
+    min_size = max_size // 2
+    spread = max(1, max_size // 5)
+    drop = pow(_CDC_BASE, _CDC_WINDOW, 1 << 64)
+    window: deque = deque(maxlen=_CDC_WINDOW)
+    h = 0
+    start = end = -1
+    cur = 0
+
+    for a, b in _unit_spans(text):
+        n = size(a, b)
+        if start >= 0 and (n > max_size or cur + n > max_size):
+            yield text[start:end], start, end
+            start, cur = -1, 0
+        if n > max_size:
+            yield from split(a, b)
+            continue
+        if start < 0:
+            start = a
+        end, cur = b, cur + n
+
+        f = _fingerprint(text[a:b])
+        h = (h * _CDC_BASE + f) & _CDC_MASK
+        if len(window) == _CDC_WINDOW:
+            h = (h - window[0] * drop) & _CDC_MASK
+        window.append(f)
+        if cur >= min_size and (h >> 32) * spread < n << 32:
+            yield text[start:end], start, end
+            start, cur = -1, 0
+    if start >= 0:
+        yield text[start:end], start, end
+
+
+def _iter_content_spans(text: str, mode: str) -> Iterator[Tuple[str, int, int]]:
+    """Content-defined chunks sized in model tokens offline, words online."""
+    tokenizer = None
+    if mode == "offline":
+        tokenizer, lock = _get_tokenizer()
+        if not getattr(tokenizer, "is_fast", False):
+            tokenizer = None
+    if tokenizer is None:
+        max_words = 350 if mode == "online" else 800
+
+        def _split_words(a: int, b: int) -> Iterator[Tuple[str, int, int]]:
+            for chunk, x, y in _iter_chunk_spans(text[a:b], max_words):
+                yield chunk, a + x, a + y
+
+        yield from _iter_content_defined_spans(text, lambda a, b: len(text[a:b].split()), max_words, _split_words)
+        return
+
+    with lock:
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)["offset_mapping"]
+    starts = [a for a, _ in offsets]
+    max_tokens = _chunk_token_budget(tokenizer)
+
+    def _tokens(a: int, b: int) -> int:
+        return bisect.bisect_left(starts, b) - bisect.bisect_left(starts, a)
+
+    def _split_tokens(a: int, b: int) -> Iterator[Tuple[str, int, int]]:
+        yield from _iter_token_chunk_spans(text, offsets[bisect.bisect_left(starts, a):bisect.bisect_left(starts, b)], max_tokens)
+
+    yield from _iter_content_defined_spans(text, _tokens, max_tokens, _split_tokens)
+
+
+def _span_sizer(mode: str) -> Tuple[Callable[[str], int], int]:
+    """
+    (size, limit) for `mode`: a function measuring text in the units its
+    chunks are cut in (model tokens offline, words online or without a fast
+    tokenizer) and the most one chunk may hold.
+    """
+    if mode == "offline":
+        tokenizer, lock = _get_tokenizer()
+        if getattr(tokenizer, "is_fast", False):
+            def _tokens(s: str) -> int:
+                with lock:
+                    return len(tokenizer(s, add_special_tokens=False, verbose=False)["input_ids"])
+
+            return _tokens, _chunk_token_budget(tokenizer)
+    return (lambda s: len(s.split())), (350 if mode == "online" else 800)
+
+
+def _iter_spans(text: str, mode: str, config: Dict[str, str]) -> Iterator[Tuple[str, int, int]]:
+    """Chunk text for `mode` using config['chunking'] (default CHUNKING)."""
+    chunking = (config.get("chunking") or CHUNKING).lower()
+    if chunking not in CHUNKING_MODES:
+        raise ValueError(f"Unknown chunking '{chunking}' (expected one of {', '.join(CHUNKING_MODES)}).")
+    if chunking == "content":
+        return _iter_content_spans(text, mode)
+    # offline fills the model's token window, online uses smaller word-based
+    # chunks to respect the API's tighter limits
+    if mode == "online":
+        return _iter_chunk_spans(text, max_words=350)
+    return _iter_offline_spans(text)
+
+
+# ---------- multi-process engine ----------
+# Rough resident size of one worker holding its own distilbart copy.
+_WORKER_RAM_BYTES = 1_500_000_000
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_KEY: Optional[Tuple[int, str]] = None
+_POOL_LOCK = threading.Lock()
+_POOL_ACTIVE = 0          # _iter_sharded calls in flight
+_POOL_LAST_USED = 0.0
+# _iter_sharded calls holding each pool; a replaced pool keeps running until
+# its count drops to zero
+_POOL_USERS: Dict[ProcessPoolExecutor, int] = {}
+
+
+def _available_ram() -> Optional[int]:
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_worker_count() -> int:
+    """
+    Pick a worker count from CPU cores and free RAM: roughly four intra-op
+    threads per worker, and no more workers than fit in available memory.
+    """
+    n = max(1, (os.cpu_count() or 1) // 4)
+    ram = _available_ram()
+    if ram:
+        n = min(n, max(1, ram // _WORKER_RAM_BYTES))
+    return n
+
+
+def _resolve_workers(value: Union[int, str, None]) -> int:
+    if value is None:
+        return 1
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value == "auto":
+            return auto_worker_count()
+        value = int(value) if value.isdigit() else 1
+    return max(1, int(value))
+
+
+def _worker_init(threads: int, backend: str) -> None:
+    global _PROFILE
+    # workers split the cores between them, whatever the calibrated profile says
+    _PROFILE = replace(get_runtime_profile(), intra_op_threads=threads)
+    get_summarizer(backend=backend)
+
+
+def _worker_summarize(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    backend: str,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> List[str]:
+    return _summarize_batched(chunks, min_length, max_length, batch_size, backend=backend, lengths=lengths)
+
+
+def _get_pool(workers: int, backend: str) -> ProcessPoolExecutor:
+    """The pool for (workers, backend), registered as in use; pair with _release_pool."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_KEY != (workers, backend):
+            if _POOL is not None and not _POOL_USERS.get(_POOL):
+                _POOL.shutdown(wait=True)
+            # a pool still in use by other calls is left to its last user
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            # spawn: forking a process that already holds torch threads is unsafe
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_worker_init,
+                initargs=(threads, backend),
+            )
+            _POOL_KEY = (workers, backend)
+        _POOL_USERS[_POOL] = _POOL_USERS.get(_POOL, 0) + 1
+        return _POOL
+
+
+def _release_pool(pool: ProcessPoolExecutor) -> None:
+    with _POOL_LOCK:
+        _POOL_USERS[pool] -= 1
+        if _POOL_USERS[pool]:
+            return
+        del _POOL_USERS[pool]
+        retired = pool is not _POOL
+    if retired:
+        pool.shutdown(wait=True)
+
+
+def shutdown_workers() -> None:
+    """Stop the offline worker pool, if one was started."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        for pool in {_POOL, *_POOL_USERS} - {None}:
+            pool.shutdown(wait=True)
+        _POOL, _POOL_KEY = None, None
+        _POOL_USERS.clear()
+
+
+def _shutdown_idle_pool(max_idle_seconds: float) -> bool:
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_ACTIVE or time.monotonic() - _POOL_LAST_USED < max_idle_seconds:
+            return False
+        _POOL.shutdown(wait=True)
+        _POOL, _POOL_KEY = None, None
+    return True
+
+
+atexit.register(shutdown_workers)
+
+
+def _iter_sharded(
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    workers: int,
+    progress_callback: Progress = None,
+    backend: Optional[str] = None,
+    lengths: Optional[List[Tuple[int, int]]] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Spread chunks over a pool of worker processes, each with its own model,
+    yielding (chunk index, summary) as shards complete. Shards are
+    length-sorted batches; callers place results by index, so the final
+    order doesn't depend on which worker finishes first.
+    """
+    # download/export once here rather than racing in every worker
+    backend = _resolve_backend(backend)
+    if backend == "torch":
+        get_model_path()
+    else:
+        onnx_model_path(quantize=backend == "onnx-int8")
+    global _POOL_ACTIVE, _POOL_LAST_USED
+    with _POOL_LOCK:
+        _POOL_ACTIVE += 1  # keeps evict_idle off the pool while shards run
+    batch_size = max(1, int(batch_size))
+    total = len(chunks)
+    done = 0
+
+    futures = {}
+    pool = None
+    try:
+        pool = _get_pool(workers, backend)
+        for idx in _batches(chunks, batch_size, lengths):
+            shard_lengths = [lengths[i] for i in idx] if lengths is not None else None
+            fut = pool.submit(
+                _worker_summarize, [chunks[i] for i in idx], min_length, max_length, batch_size, backend, shard_lengths
+            )
+            futures[fut] = idx
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            summaries = fut.result()
+            done += len(idx)
+            if progress_callback:
+                progress_callback("Summarizing chunks (offline, multi-process)", done, total)
+            yield from zip(idx, summaries)
+    finally:
+        # consumer stopped early or a shard failed: drop work not yet started
+        for fut in futures:
+            fut.cancel()
+        if pool is not None:
+            _release_pool(pool)
+        with _POOL_LOCK:
+            _POOL_ACTIVE -= 1
+            _POOL_LAST_USED = time.monotonic()
+
+
+# ---------- inference daemon ----------
+def _connect_daemon(config: Dict[str, str]):
+    """A client for the local inference daemon if enabled and running, else None."""
+    use = config.get("daemon")
+    if not (INFERENCE_DAEMON if use is None else use):
+        return None
+    from core.inference_server import connect
+    return connect()
+
+
+def _iter_daemon(
+    client,
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    backend: str,
+    lengths: Optional[List[Tuple[int, int]]],
+    progress_callback: Progress = None,
+) -> Iterator[Tuple[int, str, str]]:
+    """
+    Offline inference in the shared daemon (core.inference_server) instead
+    of this process, yielding (chunk index, summary, model id that produced
+    it). If the daemon dies or reports an error mid-request, the chunks it
+    hasn't answered yet are summarized in-process.
+    """
+    finished = set()
+    local_id = _model_id(backend)
+    try:
+        with client:
+            last = 0
+            for i, summary, done, total, model in client.summarize(
+                chunks, min_length, max_length, int(batch_size), backend, lengths
+            ):
+                if progress_callback and done != last:
+                    progress_callback("Summarizing chunks (inference daemon)", done, total)
+                    last = done
+                finished.add(i)
+                yield i, summary, model or local_id
+            return
+    except (OSError, RuntimeError, ValueError):  # ConnectionError is an OSError
+        pass
+    rest = [i for i in range(len(chunks)) if i not in finished]
+    if progress_callback:
+        progress_callback("Inference daemon failed; continuing in-process", len(finished), len(chunks))
+    for j, summary in _iter_batched(
+        [chunks[i] for i in rest], min_length, max_length, batch_size, progress_callback, backend,
+        [lengths[i] for i in rest] if lengths else None,
+    ):
+        yield rest[j], summary, local_id
+
+
+# ---------- generation length policy ----------
+LENGTH_POLICIES = ("fixed", "proportional")
+# Floor for a proportional budget, so tiny chunks still get a usable sentence
+_MIN_GENERATION_TOKENS = 16
+
+
+def _generation_budgets(
+    chunks: List[str],
+    mode: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Per-chunk (min_length, max_length) under config['length_policy']
+    (default LENGTH_POLICY), or None for "fixed" (every chunk gets the same
+    lengths).
+
+    "proportional": a chunk gets max_length/min_length scaled by its share of
+    a full chunk's tokens, so a short tail chunk no longer decodes (and pads
+    to min_length) like a full one. The budgets are then scaled down to fit
+    the document target: what max_length per full chunk would give for this
+    many tokens, capped by config['target_words'] when set (for one window
+    of summarize_hierarchical, that window's share of the target).
+    """
+    policy = (config.get("length_policy") or LENGTH_POLICY).lower()
+    if policy not in LENGTH_POLICIES:
+        raise ValueError(f"Unknown length policy '{policy}' (expected one of {', '.join(LENGTH_POLICIES)}).")
+    if policy == "fixed" or not chunks:
+        return None
+
+    tokenizer = None
+    if mode == "offline":
+        tokenizer, lock = _get_tokenizer()
+        if not getattr(tokenizer, "is_fast", False):
+            tokenizer = None
+    if tokenizer is not None:
+        with lock:
+            counts = [len(ids) for ids in tokenizer(chunks, add_special_tokens=False)["input_ids"]]
+        full = _chunk_token_budget(tokenizer)
+    else:
+        counts = [_words_to_tokens(_count_words(c)) for c in chunks]
+        full = _words_to_tokens(350 if mode == "online" else 800)
+
+    floor = min(_MIN_GENERATION_TOKENS, max_length)
+    budgets = [max(floor, min(max_length, round(max_length * n / full))) for n in counts]
+    target = max(max_length, -(-max_length * sum(counts) // full))
+    if config.get("target_words"):
+        target = min(target, _words_to_tokens(int(config["target_words"])))
+    if sum(budgets) > target:
+        # shrink only the part above the floor, so the total lands on target
+        spare = sum(budgets) - floor * len(budgets)
+        scale = max(0, target - floor * len(budgets)) / spare if spare else 0
+        budgets = [floor + int((b - floor) * scale) for b in budgets]
+    return [(min(round(min_length * n / full), b // 2), b) for n, b in zip(counts, budgets)]
+
+
+def _plan_chunks(
+    chunks: List[str],
+    mode: str,
+    model_id: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    only: Optional[List[int]] = None,
+) -> Tuple[Optional[List[Tuple[int, int]]], Optional[SummaryCache], List[str], Dict[int, str]]:
+    """
+    Generation budgets and summary cache lookup shared by the sync and async
+    paths: (lengths, cache, cache keys, {chunk index: cached summary}).
+    Keys use model_id (see _model_id) of whoever will run the model. cache
+    is None (and keys empty) when caching is off. Budgets always cover the
+    whole chunk list; `only` limits the lookup to those indices.
+    """
+    lengths = _generation_budgets(chunks, mode, min_length, max_length, config)
+    use_cache = config.get("cache")
+    cache = get_cache() if (SUMMARY_CACHE_ENABLED if use_cache is None else use_cache) else None
+    if cache is None:
+        return lengths, None, [], {}
+    keys = [
+        SummaryCache.make_key(c, model_id, *(lengths[i] if lengths else (min_length, max_length)), mode)
+        for i, c in enumerate(chunks)
+    ]
+    hits = {}
+    for i in range(len(chunks)) if only is None else only:
+        hit = cache.get(keys[i])
+        if hit is not None:
+            hits[i] = hit
+    return lengths, cache, keys, hits
+
+
+def _summarize_spans(
+    spans: List[Tuple[str, int, int]],
+    mode: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    progress_callback: Progress = None,
+    only: Optional[List[int]] = None,
+) -> Iterator[ChunkSummary]:
+    """
+    Summarize already-chunked (chunk, start, end) spans in the given mode,
+    checking the summary cache first. Yields in completion order.
+
+    only: summarize just these span indices. Generation budgets are still
+    sized against all spans, so a chunk gets the same lengths as it would
+    in a full run.
+    """
+    chunks = [c for c, _, _ in spans]
+
+    def _result(i: int, summary: str, cached: bool = False) -> ChunkSummary:
+        return ChunkSummary(index=i, summary=summary, start=spans[i][1], end=spans[i][2], cached=cached)
+
+    backend = _resolve_backend(config.get("backend")) if mode == "offline" else "api"
+    model_id = _model_id(backend)
+    # the daemon may run another precision than this process; key the cache
+    # by the model that actually produces the summaries
+    daemon = _connect_daemon(config) if mode == "offline" else None
+    if daemon is not None:
+        try:
+            model_id = daemon.model_id(backend) or model_id
+        except (OSError, RuntimeError, ValueError):
+            daemon.close()
+            daemon = None
+    try:
+        lengths, cache, keys, hits = _plan_chunks(chunks, mode, model_id, min_length, max_length, config, only)
+        for i, hit in hits.items():
+            yield _result(i, hit, cached=True)
+        pending = [i for i in (range(len(chunks)) if only is None else only) if i not in hits]
+        todo = [chunks[i] for i in pending]
+        todo_lengths = [lengths[i] for i in pending] if lengths else None
+
+        if mode == "offline" and todo:
+            if progress_callback:
+                progress_callback("Preparing offline model", 0, len(todo))
+            batch_size = config.get("batch_size") or OFFLINE_BATCH_SIZE
+            workers = _resolve_workers(config.get("workers") or OFFLINE_WORKERS)
+            if daemon is not None:
+                results = _iter_daemon(
+                    daemon, todo, min_length, max_length, batch_size, backend, todo_lengths, progress_callback
+                )
+            elif workers > 1 and len(todo) > 1:
+                results = ((j, s, model_id) for j, s in _iter_sharded(
+                    todo, min_length, max_length, batch_size, workers, progress_callback, backend, todo_lengths
+                ))
+            else:
+                results = ((j, s, model_id) for j, s in _iter_batched(
+                    todo, min_length, max_length, batch_size, progress_callback, backend, todo_lengths
+                ))
+            for j, summary, produced_by in results:
+                i = pending[j]
+                if cache is not None:
+                    key = keys[i] if produced_by == model_id else SummaryCache.make_key(
+                        chunks[i], produced_by, *(lengths[i] if lengths else (min_length, max_length)), mode
+                    )
+                    cache.put(key, summary)
+                yield _result(i, summary)
+    finally:
+        if daemon is not None:
+            daemon.close()
+    if mode != "offline" and todo:
+        # online via HF Inference API
+        api_key = (config.get("api_key") or "").strip()
+        if not api_key:
+            raise ValueError("API key not set for online mode.")
+        from core.hf_client import HFInferenceClient
+
+        client = HFInferenceClient(api_key, api_url=f"https://api-inference.huggingface.co/models/{MODEL_NAME}")
+
+        if progress_callback:
+            progress_callback("Contacting HF API (online)", 0, len(todo))
+        for step, (j, summary) in enumerate(client.summarize_many(todo, min_length, max_length, todo_lengths), 1):
+            if progress_callback:
+                progress_callback("Contacting HF API (online)", step, len(todo))
+            i = pending[j]
+            if cache is not None:
+                cache.put(keys[i], summary)
+            yield _result(i, summary)
+
+
+def _precompress(
+    text: str,
+    config: Dict[str, str],
+    progress_callback: Progress = None,
+) -> Tuple[str, Optional[List[Tuple[int, int]]]]:
+    """
+    Optional extractive stage before abstractive summarization: keep only the
+    most central sentences (about config['compress_ratio'] of the words, in
+    order) so fewer chunks reach the model.
+
+    Returns the compressed text and (compressed offset, source offset) pairs
+    for mapping chunk spans back to the input, or (text, None) if disabled.
+    """
+    ratio = config.get("compress_ratio")
+    ratio = float(PRECOMPRESS_RATIO if ratio is None else ratio)
+    if not 0.0 < ratio <= 1.0:
+        raise ValueError(f"Invalid compress_ratio {ratio} (expected a value in (0, 1]).")
+    if ratio == 1.0:
+        return text, None
+    from core.extractive import select_salient
+
+    if progress_callback:
+        progress_callback("Selecting salient sentences", 0, 0)
+    parts: List[str] = []
+    offsets: List[Tuple[int, int]] = []
+    pos = 0
+    for a, b in select_salient(text, ratio):
+        offsets.append((pos, a))
+        parts.append(text[a:b])
+        pos += b - a + 1
+    return " ".join(parts), offsets
+
+
+def _summarize_fast(
+    text: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    progress_callback: Progress = None,
+) -> str:
+    from core.extractive import default_target_words, summarize_extractive
+
+    target = int(config.get("target_words") or default_target_words(text, min_length, max_length))
+    return summarize_extractive(text, target, progress_callback)
+
+
+def _to_source(pos: int, offsets: List[Tuple[int, int]], starts: List[int]) -> int:
+    i = max(0, bisect.bisect_right(starts, pos) - 1)
+    return offsets[i][1] + (pos - offsets[i][0])
+
+
+def _count_words_lazy(text: str) -> int:
+    return sum(1 for _ in re.finditer(r"\S+", text))
+
+
+def _words_to_tokens(words: int) -> int:
+    # distilbart averages roughly 4 tokens per 3 English words
+    return max(1, (words * 4) // 3)
+
+
 # ---------- main API ----------
+def summarize_iter(
+    text: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    progress_callback: Progress = None,
+) -> Iterator[ChunkSummary]:
+    """
+    Summarize text chunk by chunk, yielding a ChunkSummary as soon as each
+    chunk is done. Cached chunks come first; offline batches and worker
+    shards may finish out of document order, so use ChunkSummary.index
+    (or summarize_text) when order matters.
+
+    Arguments are the same as summarize_text. Validation errors are raised
+    on the first next() call. In "fast" mode the whole extractive summary is
+    yielded as a single result, and so is the summarize_hierarchical result
+    for text beyond the offline size limits or when config['target_words']
+    is set. summarize_text is this generator joined in document order.
+    """
+    mode = (config.get("mode") or "offline").lower()
+    if mode == "fast":
+        summary = _summarize_fast(text, min_length, max_length, config, progress_callback)
+        yield ChunkSummary(index=0, summary=summary, start=0, end=len(text))
+        return
+    if config.get("target_words") or not _within_limits(text, "offline")[0]:
+        # hierarchical pre-compresses itself; the size check uses the raw text
+        summary = summarize_hierarchical(text, min_length, max_length, config, progress_callback=progress_callback)
+        yield ChunkSummary(index=0, summary=summary, start=0, end=len(text))
+        return
+
+    text, offsets = _precompress(text, config, progress_callback)
+    if not _within_limits(text, mode)[0]:
+        # If online is too small, auto-fallback to offline (more permissive)
+        mode = "offline"
+        if progress_callback:
+            progress_callback("Switching to offline mode due to size limits", 0, 0)
+
+    # Chunk the text to keep each call within bounds and merge summaries
+    spans = list(_iter_spans(text, mode, config))
+    results = _summarize_spans(spans, mode, min_length, max_length, config, progress_callback)
+    if offsets is None:
+        yield from results
+    else:
+        starts = [c for c, _ in offsets]
+        for r in results:
+            r.start, r.end = _to_source(r.start, offsets, starts), _to_source(max(r.start, r.end - 1), offsets, starts) + 1
+            yield r
+
+    if progress_callback:
+        progress_callback("Summarization done", len(spans), len(spans))
+
+
 def summarize_text(
     text: str,
     min_length: int,
@@ -107,72 +1572,421 @@ def summarize_text(
     Summarize given text according to mode:
       - offline: uses local Transformers pipeline, downloads model if missing
       - online: uses Hugging Face Inference API (requires config['api_key'])
+      - fast: extractive TextRank (core.extractive), no model, well under a second
 
     Arguments:
       text: input text
       min_length, max_length: summary token lengths (roughly)
-      config: {'mode': 'offline'|'online', 'api_key': optional}
+      config: {'mode': 'offline'|'online'|'fast', 'api_key': optional,
+               'batch_size': optional offline batch size (default OFFLINE_BATCH_SIZE),
+               'workers': optional offline process count, int or "auto" (default OFFLINE_WORKERS),
+               'cache': optional bool, reuse cached chunk summaries (default SUMMARY_CACHE_ENABLED),
+               'target_words': optional int, use summarize_hierarchical with this target
+                               (in fast mode: the extractive summary length),
+               'backend': optional offline backend, "torch"|"onnx"|"onnx-int8" (default OFFLINE_BACKEND),
+               'compress_ratio': optional float in (0, 1], keep only the most central
+                                 sentences covering this share of words (default PRECOMPRESS_RATIO),
+               'length_policy': optional "fixed"|"proportional", per-chunk generation
+                                lengths scaled by chunk size (default LENGTH_POLICY),
+               'chunking': optional "greedy"|"content", content-defined chunk
+                           boundaries survive edits elsewhere (default CHUNKING),
+               'daemon': optional bool, send offline inference to a running
+                         core.inference_server (default INFERENCE_DAEMON)}
       progress_callback(stage: str, step: int, total: int): optional progress hook
+
+    Chunk summaries are looked up in core.summary_cache before inference;
+    only cache misses are sent to the model or API. Text beyond the offline
+    size limits (or any text when config['target_words'] is set) goes through
+    summarize_hierarchical instead of being rejected.
+    """
+    parts = sorted(summarize_iter(text, min_length, max_length, config, progress_callback), key=lambda r: r.index)
+    return " ".join(r.summary for r in parts).strip()
+
+
+
+def summarize_hierarchical(
+    text: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    target_words: Optional[int] = None,
+    progress_callback: Progress = None,
+) -> str:
+    """
+    Map-reduce summarization for inputs of any size.
+
+    Map: chunks are produced lazily from the text a window at a time and
+    summarized. Reduce: chunk summaries are buffered per tree level, and once
+    a level holds one chunk's worth of input (model tokens offline, words
+    online) it is re-summarized into a single entry on the level above. Only one partial buffer per level is
+    kept, so memory grows with log(number of chunks). Whatever is left is
+    reduced again until it fits target_words (config['target_words'] or
+    REDUCE_TARGET_WORDS).
     """
     mode = (config.get("mode") or "offline").lower()
+    text, _ = _precompress(text, config, progress_callback)
+    if mode == "online" and not _within_limits(text, mode)[0]:
+        mode = "offline"
+        if progress_callback:
+            progress_callback("Switching to offline mode due to size limits", 0, 0)
+
+    chunk_words = 350 if mode == "online" else 800
+    size, limit = _span_sizer(mode)
+    target = int(target_words or config.get("target_words") or REDUCE_TARGET_WORDS)
+    batch_size = int(config.get("batch_size") or OFFLINE_BATCH_SIZE)
+    window = max(4, batch_size * _resolve_workers(config.get("workers") or OFFLINE_WORKERS))
+    doc_words = _count_words_lazy(text)
+    est_total = max(1, -(-doc_words // chunk_words))
+    explicit_target = bool(target_words or config.get("target_words"))
+    # buffered summaries are kept with their size, in the units chunking uses
+    levels: List[List[Tuple[str, int]]] = []
+    reduces = 0
+
+    def _words(parts: List[Tuple[str, int]]) -> int:
+        return sum(len(p.split()) for p, _ in parts)
 
+    def _size(parts: List[Tuple[str, int]]) -> int:
+        return sum(n for _, n in parts)
+
+    def _reduce(parts: List[Tuple[str, int]], max_len: int = max_length, min_len: int = min_length) -> Tuple[str, int]:
+        nonlocal reduces
+        reduces += 1
+        if progress_callback:
+            progress_callback("Reducing summaries", reduces, 0)
+        merged = " ".join(p for p, _ in parts)
+        results = _summarize_spans([(merged, 0, len(merged))], mode, min_len, max_len, config)
+        summary = " ".join(r.summary for r in results).strip()
+        return summary, size(summary)
+
+    def _push(part: Tuple[str, int], level: int) -> None:
+        # Carry full buffers upward like a binary counter; higher levels
+        # always cover earlier text than lower ones.
+        while True:
+            if len(levels) == level:
+                levels.append([])
+            buf = levels[level]
+            if buf and _size(buf) + part[1] > limit:
+                levels[level] = [part]
+                part, level = _reduce(buf), level + 1
+                continue
+            buf.append(part)
+            return
+
+    spans = _iter_spans(text, mode, config)
+    done = 0
+    while True:
+        batch = list(itertools.islice(spans, window))
+        if not batch:
+            break
+        map_config = config
+        if explicit_target:
+            # each window gets its share of the document target, so the
+            # proportional length policy sizes map summaries for the whole text
+            share = target * sum(len(c.split()) for c, _, _ in batch) / max(1, doc_words)
+            map_config = {**config, "target_words": max(1, round(share))}
+        for r in sorted(_summarize_spans(batch, mode, min_length, max_length, map_config), key=lambda r: r.index):
+            _push((r.summary, size(r.summary)), 0)
+        done += len(batch)
+        if progress_callback:
+            progress_callback("Summarizing chunks (map)", done, max(done, est_total))
+
+    remaining = [s for buf in reversed(levels) for s in buf]
+    while _words(remaining) > target:
+        before = _words(remaining)
+        if _size(remaining) <= limit:
+            max_len = min(max_length, _words_to_tokens(target))
+            remaining = [_reduce(remaining, max_len, min(min_length, max_len))]
+        else:
+            groups: List[List[Tuple[str, int]]] = [[]]
+            for part in remaining:
+                if groups[-1] and _size(groups[-1]) + part[1] > limit:
+                    groups.append([])
+                groups[-1].append(part)
+            remaining = [_reduce(g) for g in groups]
+        if _words(remaining) >= before:
+            break  # the model can't shrink it further
+
+    if progress_callback:
+        progress_callback("Summarization done", done, done)
+    return " ".join(p for p, _ in remaining).strip()
+
+
+# ---------- incremental re-summarization ----------
+MANIFEST_VERSION = 2
+
+
+def summarize_incremental(
+    text: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    manifest: Optional[Dict[str, object]] = None,
+    progress_callback: Progress = None,
+) -> IncrementalSummary:
+    """
+    Summarize an edited version of a document, re-running inference only on
+    chunks that changed since the previous call.
+
+    The text is always chunked content-defined (config['chunking'] is
+    ignored), so unchanged regions produce identical chunks. Their summaries
+    are taken from `manifest`, the one returned by the previous call. Reuse
+    happens only if the manifest was made with the same model, mode,
+    lengths, length policy and target_words, and only for chunks whose
+    generation budget (sized against the whole document) is unchanged.
+    New chunks still go through the summary cache.
+    config['compress_ratio'] is ignored here: sentence selection is global,
+    so one edit could change every chunk.
+    """
+    mode = (config.get("mode") or "offline").lower()
+    if mode == "fast":
+        raise ValueError("Incremental summarization needs an abstractive mode (offline or online).")
     ok, msg = _within_limits(text, mode)
     if not ok:
-        # If online is too small, auto-fallback to offline (more permissive)
-        if mode == "online":
-            mode = "offline"
-            if progress_callback:
-                progress_callback("Switching to offline mode due to size limits", 0, 0)
-        else:
-            # Too large even for offline; caller should trim or chunk more aggressively
+        if mode != "online":
             raise ValueError(msg)
+        mode = "offline"
+        if progress_callback:
+            progress_callback("Switching to offline mode due to size limits", 0, 0)
 
-    # Chunk the text to keep each call within bounds and merge summaries
-    # Use smaller chunks online to respect tighter limits
-    chunk_words = 350 if mode == "online" else 800
-    chunks = _chunk_text(text, max_words=chunk_words)
-    summaries: List[str] = []
+    backend = _resolve_backend(config.get("backend")) if mode == "offline" else "api"
+    params = {
+        "model": _model_id(backend),
+        "mode": mode,
+        "min_length": min_length,
+        "max_length": max_length,
+        "length_policy": (config.get("length_policy") or LENGTH_POLICY).lower(),
+        "target_words": int(config["target_words"]) if config.get("target_words") else None,
+    }
+    previous: Dict[Tuple[str, Tuple[int, ...]], str] = {}
+    if manifest and manifest.get("version") == MANIFEST_VERSION and manifest.get("params") == params:
+        previous = {(c["hash"], tuple(c["lengths"])): c["summary"] for c in manifest.get("chunks", [])}
+
+    spans = list(_iter_content_spans(text, mode))
+    hashes = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk, _, _ in spans]
+    # proportional budgets depend on the whole document (and target_words),
+    # so an unchanged chunk can still need a different length
+    lengths = _generation_budgets([c for c, _, _ in spans], mode, min_length, max_length, config)
+    budgets = [tuple(lengths[i]) if lengths else (min_length, max_length) for i in range(len(spans))]
+    summaries: List[Optional[str]] = [previous.get(key) for key in zip(hashes, budgets)]
+    todo = [i for i, s in enumerate(summaries) if s is None]
+    if progress_callback:
+        progress_callback("Reusing unchanged chunks", len(spans) - len(todo), len(spans))
+
+    for r in _summarize_spans(spans, mode, min_length, max_length, config, progress_callback, only=todo):
+        summaries[r.index] = r.summary
+
+    if progress_callback:
+        progress_callback("Summarization done", len(spans), len(spans))
+    return IncrementalSummary(
+        summary=" ".join(summaries).strip(),
+        manifest={
+            "version": MANIFEST_VERSION,
+            "params": params,
+            "chunks": [
+                {"hash": h, "start": a, "end": b, "lengths": list(lh), "summary": s}
+                for h, (_, a, b), lh, s in zip(hashes, spans, budgets, summaries)
+            ],
+        },
+        reused=len(spans) - len(todo),
+        computed=len(todo),
+    )
+
+
+# ---------- asyncio API ----------
+_INFERENCE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_INFERENCE_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    """
+    Bounded executor for blocking summarization called from async code, kept
+    separate from the event loop's default pool so long offline jobs can't
+    starve other run_in_executor work.
+    """
+    global _INFERENCE_EXECUTOR
+    with _INFERENCE_EXECUTOR_LOCK:
+        if _INFERENCE_EXECUTOR is None:
+            _INFERENCE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, OFFLINE_ASYNC_THREADS), thread_name_prefix="studysage-inference"
+            )
+        return _INFERENCE_EXECUTOR
+
+
+async def summarize_text_async(
+    text: str,
+    min_length: int,
+    max_length: int,
+    config: Dict[str, str],
+    progress_callback: Progress = None,
+) -> str:
+    """
+    Async summarize_text. Online requests run on the event loop with
+    non-blocking HTTP; offline (and oversized or hierarchical) jobs run
+    summarize_text on the bounded inference executor. progress_callback is
+    called from whichever thread does the work.
+    """
+    mode = (config.get("mode") or "offline").lower()
+    if mode != "online" or config.get("target_words") or not _within_limits(text, mode)[0]:
+        loop = asyncio.get_running_loop()
+        job = functools.partial(summarize_text, text, min_length, max_length, config, progress_callback)
+        return await loop.run_in_executor(get_inference_executor(), job)
+
+    api_key = (config.get("api_key") or "").strip()
+    if not api_key:
+        raise ValueError("API key not set for online mode.")
+    text, _ = _precompress(text, config, progress_callback)
+    # same chunks, budgets and cache keys as the sync path; only the HTTP call differs
+    chunks = [c for c, _, _ in _iter_spans(text, mode, config)]
     total = len(chunks)
+    # SQLite can block for its busy timeout; keep cache I/O off the event loop
+    loop = asyncio.get_running_loop()
+    lengths, cache, keys, hits = await loop.run_in_executor(
+        None, _plan_chunks, chunks, mode, _model_id("api"), min_length, max_length, config
+    )
+    summaries: List[Optional[str]] = [hits.get(i) for i in range(total)]
+    pending = [i for i in range(total) if i not in hits]
 
-    if mode == "offline":
+    if pending:
         if progress_callback:
-            progress_callback("Preparing offline model", 0, total)
-        model_dir = get_model_path()
-        # device=-1 forces CPU; you can switch to device=0 for GPU if available
-        summarizer = pipeline("summarization", model=str(model_dir), device=-1)
-        for i, chunk in enumerate(chunks, 1):
-            if progress_callback:
-                progress_callback("Summarizing chunks (offline)", i, total)
-            out = summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-            summaries.append(out[0]["summary_text"])
-    else:
-        # online via HF Inference API
-        api_key = (config.get("api_key") or "").strip()
-        if not api_key:
-            raise ValueError("API key not set for online mode.")
-        headers = {"Authorization": f"Bearer {api_key}"}
-        api_url = f"https://api-inference.huggingface.co/models/{MODEL_NAME}"
+            progress_callback("Contacting HF API (online)", 0, len(pending))
+        from core.hf_client import AsyncHFInferenceClient
 
-        for i, chunk in enumerate(chunks, 1):
-            if progress_callback:
-                progress_callback("Contacting HF API (online)", i, total)
-            r = requests.post(
-                api_url,
-                headers=headers,
-                json={"inputs": chunk, "parameters": {"max_length": max_length, "min_length": min_length, "do_sample": False}},
-                timeout=60,
-            )
-            if r.status_code != 200:
-                raise RuntimeError(f"HF API error: {r.status_code} {r.text[:200]}")
-            data = r.json()
-            # Some HF hosts return a list of dicts [{'summary_text': ...}]
-            if isinstance(data, list) and data and "summary_text" in data[0]:
-                summaries.append(data[0]["summary_text"])
-            else:
-                # Fallback: try to parse other shapes or raise
-                raise RuntimeError(f"Unexpected HF response: {str(data)[:200]}")
+        client = AsyncHFInferenceClient(api_key, api_url=f"https://api-inference.huggingface.co/models/{MODEL_NAME}")
+        fresh = await client.summarize_all(
+            [chunks[i] for i in pending], min_length, max_length, [lengths[i] for i in pending] if lengths else None
+        )
+        for i, summary in zip(pending, fresh):
+            summaries[i] = summary
+        if cache is not None:
+            await loop.run_in_executor(None, lambda: [cache.put(keys[i], summaries[i]) for i in pending])
 
-    final = " ".join(summaries).strip()
     if progress_callback:
         progress_callback("Summarization done", total, total)
-    return final
\ No newline at end of file
+    return " ".join(summaries).strip()
+
+
+# ---------- runtime calibration ----------
+_CALIBRATION_TEXT = (
+    "Photosynthesis converts light energy into chemical energy stored in glucose. In the light-dependent "
+    "reactions, chlorophyll in the thylakoid membranes absorbs photons and splits water, releasing oxygen "
+    "and producing ATP and NADPH. The Calvin cycle in the stroma then uses these carriers to fix carbon "
+    "dioxide into three-carbon sugars. The rate of photosynthesis depends on light intensity, carbon "
+    "dioxide concentration and temperature, and the slowest of these factors limits the whole process. "
+    "Plants adapted to hot, dry climates use C4 or CAM pathways to reduce photorespiration, separating "
+    "carbon fixation from the Calvin cycle in space or in time.\n\n"
+)
+
+
+def _calibration_trial(
+    profile: RuntimeProfile,
+    chunks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int,
+    repeats: int,
+) -> float:
+    # runs in a fresh process: torch accepts inter-op threads once per process
+    global _PROFILE
+    _PROFILE = profile
+    warmup(backend="torch")
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        _summarize_batched(chunks, min_length, max_length, batch_size, backend="torch")
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def calibration_candidates(
+    threads: Optional[List[int]] = None,
+    interop: Optional[List[int]] = None,
+    precisions: Optional[List[str]] = None,
+) -> List[RuntimeProfile]:
+    """
+    Profiles to try: by default all, half and a quarter of the cores, one
+    inter-op thread (summarization runs one forward pass at a time), and
+    every precision.
+    """
+    cores = os.cpu_count() or 1
+    threads = threads or sorted({cores, max(1, cores // 2), max(1, cores // 4)}, reverse=True)
+    return [
+        _check_profile(RuntimeProfile(t, i, p))
+        for p in (precisions or PRECISIONS) for t in threads for i in (interop or [1])
+    ]
+
+
+def calibrate_runtime(
+    text: Optional[str] = None,
+    candidates: Optional[List[RuntimeProfile]] = None,
+    min_length: int = 30,
+    max_length: int = 120,
+    batch_size: Optional[int] = None,
+    repeats: int = 2,
+    save: bool = True,
+    progress_callback: Progress = None,
+) -> List[Tuple[RuntimeProfile, float]]:
+    """
+    Time offline torch summarization of a sample (or `text`) under each
+    candidate profile, each in a fresh process, and return (profile, best
+    seconds) fastest first. With save=True the fastest profile is written
+    to RUNTIME_PROFILE_PATH, where later runs pick it up.
+    """
+    batch_size = batch_size or OFFLINE_BATCH_SIZE
+    spans = _iter_offline_spans(text or _CALIBRATION_TEXT * 12)
+    chunks = [c for c, _, _ in itertools.islice(spans, 2 * batch_size)]
+    candidates = candidates or calibration_candidates()
+    results: List[Tuple[RuntimeProfile, float]] = []
+    for n, profile in enumerate(candidates):
+        if progress_callback:
+            progress_callback("Calibrating runtime profiles", n, len(candidates))
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            try:
+                seconds = pool.submit(
+                    _calibration_trial, profile, chunks, min_length, max_length, batch_size, repeats
+                ).result()
+            except Exception:
+                seconds = float("inf")  # e.g. no int8 kernels on this build
+        results.append((profile, seconds))
+    if progress_callback:
+        progress_callback("Calibrating runtime profiles", len(candidates), len(candidates))
+
+    results.sort(key=lambda r: r[1])
+    if save and results and results[0][1] != float("inf"):
+        save_runtime_profile(results[0][0], seconds=round(results[0][1], 3), chunks=len(chunks))
+    return results
+
+
+def main() -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="StudySage offline runtime tools")
+    sub = ap.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="benchmark CPU runtime profiles and save the fastest")
+    cal.add_argument("--file", help="sample document to time (default: built-in text)")
+    cal.add_argument("--threads", help="comma-separated intra-op thread counts (default: all/half/quarter cores)")
+    cal.add_argument("--interop", help="comma-separated inter-op thread counts (default: 1)")
+    cal.add_argument("--precisions", help=f"comma-separated subset of {','.join(PRECISIONS)}")
+    cal.add_argument("--repeats", type=int, default=2)
+    cal.add_argument("--no-save", action="store_true", help="only print the timings")
+    args = ap.parse_args()
+
+    def ints(value):
+        return [int(x) for x in value.split(",")] if value else None
+
+    text = None
+    if args.file:
+        from core.io import load_text_from_file
+        text = load_text_from_file(args.file)
+    candidates = calibration_candidates(
+        ints(args.threads), ints(args.interop), args.precisions.split(",") if args.precisions else None
+    )
+    results = calibrate_runtime(text, candidates, repeats=args.repeats, save=not args.no_save)
+    print(f"{'intra':>5} {'inter':>5} {'precision':<9} {'seconds':>8}")
+    for profile, seconds in results:
+        print(f"{profile.intra_op_threads:>5} {profile.inter_op_threads:>5} {profile.precision:<9} {seconds:8.2f}")
+    if not args.no_save and results[0][1] != float("inf"):
+        print(f"Saved fastest profile to {RUNTIME_PROFILE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# core/summary_cache.py
+from __future__ import annotations
+import atexit
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from config import SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_BYTES
+except ImportError:
+    SUMMARY_CACHE_PATH = "models/summary_cache.sqlite3"
+    SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+# Hits whose recency update is held back before it is written in one batch
+_TOUCH_BATCH = 64
+
+
+class SummaryCache:
+    """
+    Persistent chunk-summary cache.
+
+    Entries live in a single SQLite file keyed by a content hash (see make_key).
+    Once the stored size exceeds max_bytes, least-recently-used entries are
+    evicted. Each process keeps a running total of the size, re-read from
+    the database only when another connection has committed since (PRAGMA
+    data_version) and again before evicting, so processes sharing the file
+    agree on it without a full SUM per write. Recency
+    updates from hits are batched and written with the next put (or every
+    _TOUCH_BATCH hits). SQLite errors are logged and treated as misses (or
+    empty stats), so a broken cache never fails a summary.
+    hits/misses/evictions count lookups for this process only.
+    """
+
+    def __init__(self, path: str = SUMMARY_CACHE_PATH, max_bytes: int = SUMMARY_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, float] = {}
+        self._bytes = 0           # running total of stored sizes
+        self._version = None      # PRAGMA data_version when _bytes was last read
+        self._last_used = 0.0
+
+    @staticmethod
+    def make_key(text: str, model: str, min_length: int, max_length: int, mode: str) -> str:
+        h = hashlib.sha256()
+        for part in (mode, model, str(min_length), str(max_length), text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _now(self) -> float:
+        # strictly increasing, so LRU order survives coarse clocks
+        self._last_used = max(time.time(), self._last_used + 1e-6)
+        return self._last_used
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path.as_posix(), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_used ON summaries(used)")
+            self._conn = conn
+            self._sync_size(conn)
+        return self._conn
+
+    def _failed(self, action: str, exc: Exception) -> None:
+        logger.warning("Summary cache %s failed (%s); continuing without it", action, exc)
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            try:
+                db = self._db()
+                row = db.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._touched[key] = self._now()
+                    if len(self._touched) >= _TOUCH_BATCH:
+                        self._flush_touched(db)
+                        db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._failed("lookup", e)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, summary: str) -> None:
+        size = len(key) + len(summary.encode("utf-8"))
+        with self._lock:
+            try:
+                db = self._db()
+                self._touched.pop(key, None)
+                self._flush_touched(db)
+                self._sync_size(db)
+                old = db.execute("SELECT size FROM summaries WHERE key = ?", (key,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary, size, used) VALUES (?, ?, ?, ?)",
+                    (key, summary, size, self._now()),
+                )
+                self._bytes += size - (old[0] if old else 0)
+                self._evict(db)
+                db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._failed("write", e)
+
+    def _flush_touched(self, db: sqlite3.Connection) -> None:
+        if self._touched:
+            db.executemany("UPDATE summaries SET used = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def _sync_size(self, db: sqlite3.Connection) -> None:
+        # data_version only changes when another connection commits
+        version = db.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version:
+            self._bytes, self._version = self._size(db), version
+
+    @staticmethod
+    def _size(db: sqlite3.Connection) -> int:
+        return db.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        # other processes write and evict too; trust only the stored total
+        total = self._size(db)
+        victims = []
+        if total > self.max_bytes:
+            for key, size in db.execute("SELECT key, size FROM summaries ORDER BY used"):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+            db.executemany("DELETE FROM summaries WHERE key = ?", victims)
+        self._bytes = total
+        self.evictions += len(victims)
+
+    def flush(self) -> None:
+        """Write pending recency updates from cache hits."""
+        with self._lock:
+            try:
+                db = self._db()
+                self._flush_touched(db)
+                db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._failed("write", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            try:
+                db = self._db()
+                db.execute("DELETE FROM summaries")
+                db.commit()
+                self._bytes = 0
+            except (sqlite3.Error, OSError) as e:
+                self._failed("clear", e)
+
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters plus stored entries/bytes (0 if the database can't be read)."""
+        with self._lock:
+            try:
+                db = self._db()
+                entries = db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+                size = self._size(db)
+            except (sqlite3.Error, OSError) as e:
+                self._failed("stats", e)
+                entries = size = 0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+
+
+_CACHE: Optional[SummaryCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> SummaryCache:
+    """Return the process-wide summary cache at SUMMARY_CACHE_PATH."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = SummaryCache()
+            atexit.register(_CACHE.flush)
+        return _CACHE
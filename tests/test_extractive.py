@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("numpy")
+
+from core.extractive import rank_sentences, select_salient, split_sentences, summarize_extractive
+
+
+def test_split_sentences_handles_punctuation_and_blank_lines():
+    text = "First one. Second one!\n\nHEADING WITHOUT STOP\nstill heading"
+    spans = split_sentences(text)
+    assert [text[a:b] for a, b in spans] == ["First one.", "Second one!", "HEADING WITHOUT STOP\nstill heading"]
+
+
+def test_central_sentences_rank_higher():
+    sentences = [
+        "Mitochondria produce energy for the cell.",
+        "The cell uses energy from mitochondria to grow.",
+        "Energy in the cell comes from mitochondria.",
+        "Football is played with eleven players.",
+    ]
+    scores = rank_sentences(sentences)
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores[3] == min(scores)
+
+
+def test_summary_keeps_document_order_and_budget():
+    text = (
+        "Volcanoes form where magma reaches the surface. "
+        "The weather was pleasant on Tuesday. "
+        "Magma that reaches the surface is called lava. "
+        "Volcanoes erupt lava, ash and gases from magma."
+    )
+    out = summarize_extractive(text, target_words=15)
+    assert "Tuesday" not in out
+    picked = [s for s in split_sentences(text) if text[s[0]:s[1]] in out]
+    assert picked == sorted(picked)
+
+
+
+def test_select_salient_drops_off_topic_sentences_in_order():
+    text = (
+        "Enzymes speed up chemical reactions in cells. "
+        "My cousin bought a red bicycle yesterday. "
+        "Enzymes lower the activation energy of reactions. "
+        "Temperature changes how fast enzymes catalyse reactions."
+    )
+    spans = select_salient(text, 0.6)
+    kept = [text[a:b] for a, b in spans]
+    assert "My cousin bought a red bicycle yesterday." not in kept
+    assert spans == sorted(spans)
+    assert select_salient(text, 1.0) == split_sentences(text)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("requests")
+
+import core.hf_client as hf_client
+import core.summarize as summarize
+from core.hf_client import AsyncHFInferenceClient, HFInferenceClient
+from core.summary_cache import SummaryCache
+
+
+class _StubInferenceAPI(BaseHTTPRequestHandler):
+    """Answers like the HF Inference API; the first call per input returns 503."""
+    seen = {}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["inputs"]
+        with self.lock:
+            self.seen[text] = self.seen.get(text, 0) + 1
+            first = self.seen[text] == 1
+        if text == "broken":
+            self._reply(400, {"error": "bad input"})
+        elif first:
+            self._reply(503, {"error": "Model is currently loading", "estimated_time": 0.01})
+        else:
+            self._reply(200, [{"summary_text": text.upper()}])
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    _StubInferenceAPI.seen = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubInferenceAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/models/stub"
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_503_and_keeps_indices(stub_url):
+    client = HFInferenceClient("token", api_url=stub_url, max_concurrency=3, backoff_base=0.01)
+    texts = [f"chunk {i}" for i in range(8)]
+    results = dict(client.summarize_many(texts, 5, 20))
+    assert [results[i] for i in range(len(texts))] == [t.upper() for t in texts]
+    assert all(n == 2 for n in _StubInferenceAPI.seen.values())
+
+
+def test_client_errors_are_not_retried(stub_url):
+    client = HFInferenceClient("token", api_url=stub_url, backoff_base=0.01)
+    with pytest.raises(RuntimeError, match="HF API error: 400"):
+        client.summarize("broken", 5, 20)
+    assert _StubInferenceAPI.seen["broken"] == 1
+
+
+def test_gives_up_after_max_retries(stub_url):
+    client = HFInferenceClient("token", api_url=stub_url, max_retries=0, backoff_base=0.01)
+    with pytest.raises(RuntimeError, match="HF API error: 503"):
+        client.summarize("once", 5, 20)
+
+
+def test_async_client_retries_503_and_keeps_order(stub_url):
+    pytest.importorskip("httpx")
+    texts = [f"chunk {i}" for i in range(8)]
+
+    async def run():
+        client = AsyncHFInferenceClient("token", api_url=stub_url, max_concurrency=3, backoff_base=0.01)
+        try:
+            done = await client.summarize_all(texts, 5, 20)
+            with pytest.raises(RuntimeError, match="HF API error: 400"):
+                await client.summarize("broken", 5, 20)
+            return done
+        finally:
+            await hf_client.aclose()
+
+    assert asyncio.run(run()) == [t.upper() for t in texts]
+    assert all(n == 2 for t, n in _StubInferenceAPI.seen.items() if t != "broken")
+    assert _StubInferenceAPI.seen["broken"] == 1
+
+
+def test_async_summarize_shares_chunks_and_cache_with_sync(monkeypatch, tmp_path):
+    httpx = pytest.importorskip("httpx")
+    sent = []
+
+    def handler(request):
+        text = json.loads(request.content)["inputs"]
+        sent.append(text)
+        return httpx.Response(200, json=[{"summary_text": text.upper()}])
+
+    def summarize_many(self, chunks, min_length, max_length, lengths=None):
+        for j, chunk in enumerate(chunks):
+            yield j, chunk.upper()
+
+    cache = SummaryCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    monkeypatch.setattr(summarize, "get_cache", lambda: cache)
+    monkeypatch.setattr(HFInferenceClient, "summarize_many", summarize_many)
+    text = " ".join(f"Sentence {i} talks about topic {i % 7}." for i in range(60))
+    config = {"mode": "online", "api_key": "x", "chunking": "content", "length_policy": "proportional"}
+
+    async def run(cfg):
+        hf_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await summarize.summarize_text_async(text, 5, 20, cfg)
+        finally:
+            await hf_client.aclose()
+
+    out = asyncio.run(run({**config, "cache": False}))
+    assert sent == [c for c, _, _ in summarize._iter_spans(text, "online", config)]
+    assert out == summarize.summarize_text(text, 5, 20, config)
+
+    # the sync run above filled the cache; the async path must hit the same keys
+    sent.clear()
+    assert asyncio.run(run(config)) == out
+    assert sent == []
+
+
+def test_async_failure_cancels_the_remaining_requests():
+    httpx = pytest.importorskip("httpx")
+    started = []
+
+    async def handler(request):
+        text = json.loads(request.content)["inputs"]
+        started.append(text)
+        if text == "broken":
+            return httpx.Response(400, json={"error": "bad input"})
+        await asyncio.sleep(0.5)
+        return httpx.Response(200, json=[{"summary_text": text}])
+
+    async def run():
+        hf_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = AsyncHFInferenceClient("token", max_concurrency=2, backoff_base=0.01)
+        try:
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            with pytest.raises(RuntimeError, match="HF API error: 400"):
+                await client.summarize_all(["broken"] + [f"slow {i}" for i in range(6)], 5, 20)
+            elapsed = loop.time() - t0
+            await asyncio.sleep(0.6)  # give any leftover requests time to start
+            return elapsed
+        finally:
+            await hf_client.aclose()
+
+    assert asyncio.run(run()) < 0.4  # didn't wait for the slow requests
+    assert len(started) <= 3
+
+
+def test_async_cache_io_runs_off_the_event_loop(monkeypatch, tmp_path):
+    httpx = pytest.importorskip("httpx")
+    threads = []
+
+    class RecordingCache(SummaryCache):
+        def get(self, key):
+            threads.append(threading.current_thread())
+            return super().get(key)
+
+        def put(self, key, summary):
+            threads.append(threading.current_thread())
+            super().put(key, summary)
+
+    cache = RecordingCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    monkeypatch.setattr(summarize, "get_cache", lambda: cache)
+
+    def handler(request):
+        return httpx.Response(200, json=[{"summary_text": json.loads(request.content)["inputs"][:10]}])
+
+    async def run():
+        hf_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await summarize.summarize_text_async("Some notes about cells. " * 20, 5, 20, {"mode": "online", "api_key": "x"})
+        finally:
+            await hf_client.aclose()
+
+    assert asyncio.run(run())
+    assert len(threads) == 2 and threading.main_thread() not in threads
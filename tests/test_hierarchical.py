@@ -0,0 +1,82 @@
+import re
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+from core.summarize import ChunkSummary, summarize_hierarchical
+
+
+class TwoTokenWords:
+    """Fast-tokenizer stand-in: every word is two tokens, so words undercount."""
+
+    is_fast = True
+    model_max_length = 120
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False, verbose=True):
+        offsets = []
+        for m in re.finditer(r"\S+", text):
+            mid = (m.start() + m.end() + 1) // 2
+            offsets += [(m.start(), mid), (mid, m.end())]
+        return {"input_ids": list(range(len(offsets))), "offset_mapping": offsets}
+
+
+def test_reduce_inputs_fit_the_token_window(monkeypatch):
+    tokenizer = TwoTokenWords()
+    budget = summarize._chunk_token_budget(tokenizer)
+    inputs = []
+
+    def fake_spans(spans, mode, min_length, max_length, config, progress_callback=None):
+        for i, (chunk, a, b) in enumerate(spans):
+            inputs.append(len(tokenizer(chunk)["input_ids"]))
+            yield ChunkSummary(index=i, summary=" ".join(chunk.split()[:20]), start=a, end=b)
+
+    monkeypatch.setattr(summarize, "_get_tokenizer", lambda model_dir=None: (tokenizer, threading.Lock()))
+    monkeypatch.setattr(summarize, "_summarize_spans", fake_spans)
+    text = " ".join(f"w{i}" + ("." if i % 9 == 8 else "") for i in range(3000))
+
+    out = summarize_hierarchical(text, 5, 40, {"mode": "offline", "workers": 1}, target_words=30)
+    assert len(out.split()) <= 30
+    assert len(inputs) > 3000 * 2 // budget  # map chunks plus reduces
+    assert max(inputs) <= budget
+
+
+def test_summarize_iter_hands_oversized_text_to_hierarchical(monkeypatch):
+    calls = []
+
+    def fake_hierarchical(text, min_length, max_length, config, target_words=None, progress_callback=None):
+        calls.append(len(text.split()))
+        return "short summary"
+
+    monkeypatch.setattr(summarize, "summarize_hierarchical", fake_hierarchical)
+    monkeypatch.setattr(summarize, "OFFLINE_MODE_MAX_WORDS", 100)
+    text = "word " * 500
+
+    results = list(summarize.summarize_iter(text, 5, 40, {"mode": "offline"}))
+    assert calls == [500]
+    assert [(r.index, r.summary, r.start, r.end) for r in results] == [(0, "short summary", 0, len(text))]
+
+
+def test_map_windows_share_the_document_target(monkeypatch):
+    targets = []
+
+    def fake_spans(spans, mode, min_length, max_length, config, progress_callback=None):
+        targets.append(config.get("target_words"))
+        for i, (chunk, a, b) in enumerate(spans):
+            yield ChunkSummary(index=i, summary=" ".join(chunk.split()[:5]), start=a, end=b)
+
+    monkeypatch.setattr(summarize, "_summarize_spans", fake_spans)
+    # stay in online mode (word-sized chunks, no local tokenizer)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_WORDS", 10 ** 6)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_CHARS", 10 ** 7)
+    text = " ".join(f"Sentence {i} is about topic {i % 7}." for i in range(2000))
+
+    summarize_hierarchical(text, 5, 40, {"mode": "online", "workers": 1, "batch_size": 1}, target_words=600)
+    shares = [t for t in targets if t != 600]
+    assert len(shares) > 1 and abs(sum(shares) - 600) <= len(shares)
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core import HEAVY_DEPENDENCIES
+
+
+@pytest.mark.parametrize("module", ["core.summarize", "core.io", "core.ocr_reader", "core.quiz_gen", "core.export_pdf"])
+def test_core_import_defers_heavy_dependencies(module, tmp_path):
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    # run from an empty directory: importing must not create models/ or output/
+    env_path = str(PROJECT_ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {env_path!r}); {code}"],
+        cwd=tmp_path, capture_output=True, text=True, check=True,
+    )
+    loaded = {m.split(".")[0] for m in proc.stdout.strip().split(",")}
+    assert not loaded.intersection(HEAVY_DEPENDENCIES)
+    assert list(tmp_path.iterdir()) == []
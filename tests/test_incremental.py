@@ -0,0 +1,102 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+from core.summarize import ChunkSummary, _iter_content_spans, summarize_incremental
+
+
+def _notes(n, seed=0):
+    rng = random.Random(seed)
+    words = "cell energy plant water light carbon sugar protein enzyme membrane".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(5, 25))).capitalize() + "." for _ in range(n)]
+
+
+def test_content_chunks_survive_an_insertion():
+    sents = _notes(600)
+    before = [c for c, _, _ in _iter_content_spans(" ".join(sents), "online")]
+    after = [c for c, _, _ in _iter_content_spans(" ".join(sents[:300] + ["A new paragraph."] + sents[300:]), "online")]
+    assert all(len(c.split()) <= 350 for c in before)
+    assert len(set(before) - set(after)) <= 2
+
+
+def test_incremental_reuses_manifest(monkeypatch):
+    calls = []
+
+    def fake_spans(spans, mode, min_length, max_length, config, progress_callback=None, only=None):
+        only = range(len(spans)) if only is None else only
+        calls.append(len(only))
+        for i in only:
+            chunk, a, b = spans[i]
+            yield ChunkSummary(index=i, summary=f"S{len(chunk)}", start=a, end=b)
+
+    monkeypatch.setattr(summarize, "_summarize_spans", fake_spans)
+    # stay in online mode (word-sized chunks, no local tokenizer) for a long text
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_WORDS", 10 ** 6)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_CHARS", 10 ** 7)
+    sents = _notes(600, seed=1)
+    config = {"mode": "online", "api_key": "x"}
+
+    first = summarize_incremental(" ".join(sents), 5, 20, config)
+    assert first.reused == 0 and first.computed == calls[0] > 1
+
+    edited = " ".join(sents[:300] + ["A new paragraph."] + sents[300:])
+    second = summarize_incremental(edited, 5, 20, config, manifest=first.manifest)
+    assert second.computed <= 2 and second.reused == len(second.manifest["chunks"]) - second.computed
+
+    # different generation lengths invalidate the manifest
+    third = summarize_incremental(edited, 5, 40, config, manifest=second.manifest)
+    assert third.reused == 0
+
+    with pytest.raises(ValueError):
+        summarize_incremental(edited, 5, 20, {"mode": "fast"})
+
+
+def test_incremental_budgets_match_a_full_run(monkeypatch):
+    pytest.importorskip("requests")
+    import core.hf_client as hf_client
+
+    seen = {}
+
+    def summarize_many(self, chunks, min_length, max_length, lengths=None):
+        for j, chunk in enumerate(chunks):
+            seen[chunk] = lengths[j]
+            yield j, f"S{len(chunk)}"
+
+    monkeypatch.setattr(hf_client.HFInferenceClient, "summarize_many", summarize_many)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_WORDS", 10 ** 6)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_CHARS", 10 ** 7)
+    sents = _notes(600, seed=2)
+    edited = " ".join(sents[:300] + ["A new paragraph."] + sents[300:])
+    config = {"mode": "online", "api_key": "x", "cache": False, "length_policy": "proportional", "target_words": 100}
+
+    first = summarize_incremental(" ".join(sents), 5, 200, config)
+    seen.clear()
+    second = summarize_incremental(edited, 5, 200, config, manifest=first.manifest)
+    changed = dict(seen)
+    assert 0 < len(changed) == second.computed
+
+    seen.clear()
+    summarize_incremental(edited, 5, 200, config)
+    assert all(seen[chunk] == lengths for chunk, lengths in changed.items())
+
+
+def test_target_change_invalidates_the_manifest(monkeypatch):
+    monkeypatch.setattr(summarize, "_summarize_spans", lambda spans, *a, only=None, **k: (
+        ChunkSummary(index=i, summary=f"S{i}", start=spans[i][1], end=spans[i][2]) for i in only
+    ))
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_WORDS", 10 ** 6)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_CHARS", 10 ** 7)
+    text = " ".join(_notes(600, seed=3))
+    config = {"mode": "online", "api_key": "x", "length_policy": "proportional"}
+
+    first = summarize_incremental(text, 5, 200, {**config, "target_words": 400})
+    assert summarize_incremental(text, 5, 200, {**config, "target_words": 400}, manifest=first.manifest).computed == 0
+    # a tighter target shrinks every chunk's budget, so nothing may be reused
+    assert summarize_incremental(text, 5, 200, {**config, "target_words": 100}, manifest=first.manifest).reused == 0
+    assert summarize_incremental(text, 5, 200, config, manifest=first.manifest).reused == 0
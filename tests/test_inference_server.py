@@ -0,0 +1,140 @@
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("Unix domain sockets not available", allow_module_level=True)
+
+from core.inference_server import InferenceServer, connect, is_running
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "d.sock")
+    srv = InferenceServer(path)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_ping_and_errors_share_one_connection(server):
+    import os
+    import stat
+
+    assert stat.S_IMODE(os.stat(server).st_mode) == 0o600
+    assert is_running(server)
+    with connect(server) as client:
+        assert client.ping()["requests"] == 2
+        with pytest.raises(RuntimeError, match="unknown op"):
+            list(client.request({"op": "nope"}))
+        # the connection survives an error frame
+        assert client.ping()["requests"] == 4
+
+
+def test_missing_daemon_means_in_process(tmp_path):
+    assert connect(str(tmp_path / "absent.sock")) is None
+    assert not is_running(str(tmp_path / "absent.sock"))
+
+
+def _fake_batches(fail_after=None):
+    def fake(chunks, min_length, max_length, batch_size, progress_callback=None, backend=None, lengths=None):
+        for start in range(0, len(chunks), batch_size):
+            if fail_after is not None and start >= fail_after:
+                raise RuntimeError("model crashed")
+            yield [(i, f"{chunks[i]}:{min_length}-{max_length}") for i in range(start, min(start + batch_size, len(chunks)))]
+    return fake
+
+
+def test_summarize_op_streams_one_frame_per_batch(server, monkeypatch):
+    import core.summarize as summarize
+
+    monkeypatch.setattr(summarize, "_iter_batch_results", _fake_batches())
+    with connect(server) as client:
+        got = list(client.summarize(["a", "b", "c"], 10, 50, 2, "torch"))
+    model = summarize._model_id("torch")
+    assert got == [(0, "a:10-50", 2, 3, model), (1, "b:10-50", 2, 3, model), (2, "c:10-50", 3, 3, model)]
+
+
+def test_daemon_failure_mid_request_falls_back_in_process(server, monkeypatch):
+    import core.summarize as summarize
+
+    monkeypatch.setattr(summarize, "_iter_batch_results", _fake_batches(fail_after=2))
+    local = []
+
+    def in_process(chunks, min_length, max_length, batch_size, progress_callback=None, backend=None, lengths=None):
+        local.extend(chunks)
+        return ((j, f"local {c}") for j, c in enumerate(chunks))
+
+    monkeypatch.setattr(summarize, "_iter_batched", in_process)
+    got = {i: s for i, s, _ in summarize._iter_daemon(connect(server), ["a", "b", "c", "d"], 10, 50, 2, "torch", None)}
+    assert got == {0: "a:10-50", 1: "b:10-50", 2: "local c", 3: "local d"}
+    assert local == ["c", "d"]
+
+
+def test_client_refuses_socket_owned_by_someone_else(server, monkeypatch, tmp_path):
+    import os
+
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(server).st_uid + 1)
+    assert connect(server) is None
+    (tmp_path / "plain.sock").write_text("not a socket")
+    monkeypatch.undo()
+    assert connect(str(tmp_path / "plain.sock")) is None
+
+
+def test_default_socket_lives_in_private_directory(monkeypatch, tmp_path):
+    import os
+    import stat
+    import tempfile
+
+    import core.inference_server as inference_server
+
+    shared = tmp_path / "shared_runtime"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    monkeypatch.setattr(inference_server, "INFERENCE_SOCKET", "")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(shared))
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+
+    path = Path(inference_server.default_socket_path())
+    assert path.parent == tmp_path / f"studysage-{os.getuid()}"  # world-readable runtime dir is skipped
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+
+
+def test_cache_keys_use_the_model_that_produced_the_summary(server, monkeypatch, tmp_path):
+    import core.summarize as summarize
+    from core.summary_cache import SummaryCache
+
+    main = threading.main_thread()
+    # the daemon runs another precision than this process
+    monkeypatch.setattr(
+        summarize, "_model_id", lambda backend: "local-fp32" if threading.current_thread() is main else "daemon-int8"
+    )
+    monkeypatch.setattr(summarize, "_iter_batch_results", _fake_batches(fail_after=2))
+    monkeypatch.setattr(
+        summarize, "_iter_batched",
+        lambda chunks, *a, **k: ((j, f"local {c}") for j, c in enumerate(chunks)),
+    )
+    monkeypatch.setattr(summarize, "_connect_daemon", lambda config: connect(server))
+    cache = SummaryCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    monkeypatch.setattr(summarize, "get_cache", lambda: cache)
+    spans = [("a", 0, 1), ("b", 2, 3), ("c", 4, 5)]
+    config = {"cache": True, "length_policy": "fixed", "batch_size": 2}
+
+    got = sorted((r.index, r.summary) for r in summarize._summarize_spans(spans, "offline", 10, 50, config))
+    assert got == [(0, "a:10-50"), (1, "b:10-50"), (2, "local c")]
+
+    def cached(chunk, model):
+        return cache.get(SummaryCache.make_key(chunk, model, 10, 50, "offline"))
+
+    assert cached("a", "daemon-int8") == "a:10-50" and cached("a", "local-fp32") is None
+    assert cached("c", "local-fp32") == "local c"  # in-process fallback keeps its own key
+    # a second run is served from the cache under the daemon's key
+    assert all(r.cached for r in summarize._summarize_spans(spans[:2], "offline", 10, 50, config))
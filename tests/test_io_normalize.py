@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.io import load_text_from_file, normalize_pages, normalize_text
+
+
+def _page(n, body):
+    return f"CS101 Lecture Notes\nUniversity of Somewhere\n{body}\nConfidential draft\nPage {n} of 4"
+
+
+def test_repeated_headers_footers_and_page_numbers_are_dropped():
+    bodies = [
+        "Stacks are last in, first out.",
+        "Queues are first in, first out.",
+        "Heaps keep the minimum at the root.",
+        "Hash tables give average constant-time lookup.",
+    ]
+    text, removed = normalize_pages([_page(i + 1, b) for i, b in enumerate(bodies)])
+    assert text.split("\n") == bodies
+    assert removed == sum(len(_page(i + 1, b)) for i, b in enumerate(bodies)) + 3 - len(text)
+
+
+def test_hyphenation_duplicates_and_whitespace():
+    raw = "The infor-\nmation   is\tstored.\n\n\n\nRepeated  paragraph here.\n\nrepeated paragraph HERE.\n\nwell-known term"
+    text, removed = normalize_text(raw)
+    assert text == "The information is stored.\n\nRepeated paragraph here.\n\nwell-known term"
+    assert removed == len(raw) - len(text)
+
+
+def test_single_page_keeps_lines_and_loader_can_skip_normalizing(tmp_path):
+    f = tmp_path / "notes.txt"
+    f.write_text("Page 1\nOnly  page.", encoding="utf-8")
+    assert load_text_from_file(str(f)) == "Page 1\nOnly page."
+    assert load_text_from_file(str(f), normalize=False) == "Page 1\nOnly  page."
+
+
+def test_hyphenated_compounds_keep_their_hyphen():
+    raw = (
+        "A well-\nknown result about self-\ncontained proofs.\n"
+        "The docu-\nment is long; every document has an abstract.\n"
+        "Some state-of-the-\nart methods beat state-of-the-art baselines."
+    )
+    text, _ = normalize_text(raw)
+    assert "well-known" in text and "self-contained" in text
+    assert "The document is long" in text
+    assert "state-of-the-art methods" in text
+
+
+def test_short_slides_keep_repeated_lines():
+    slides = [f"Example {i}\nx = {i} * y\n{i} / 6" for i in range(1, 7)]
+    text, _ = normalize_pages(slides)
+    assert [ln for ln in text.split("\n") if ln.startswith("Example")] == [f"Example {i}" for i in range(1, 7)]
+    assert "1 / 6" not in text and "x = 1 * y" in text
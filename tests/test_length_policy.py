@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.summarize import _batches, _generation_budgets
+
+
+def test_proportional_budgets_shrink_short_chunks_and_fit_target():
+    chunks = ["word " * 350, "word " * 350, "word " * 40]
+    assert _generation_budgets(chunks, "online", 30, 200, {"length_policy": "fixed"}) is None
+
+    budgets = _generation_budgets(chunks, "online", 30, 200, {"length_policy": "proportional"})
+    assert budgets[0] == budgets[1] == (30, 200)
+    assert budgets[2][1] < 40 and budgets[2][0] < budgets[2][1]
+
+    capped = _generation_budgets(chunks, "online", 30, 200, {"length_policy": "proportional", "target_words": 150})
+    assert sum(hi for _, hi in capped) <= 200
+
+    with pytest.raises(ValueError, match="Unknown length policy"):
+        _generation_budgets(chunks, "online", 30, 200, {"length_policy": "bogus"})
+
+
+def test_batches_split_on_budget_jumps():
+    chunks = ["a" * n for n in (10, 900, 950, 1000)]
+    assert _batches(chunks, 4, None) == [[0, 1, 2, 3]]
+    assert _batches(chunks, 4, [(2, 20), (30, 190), (30, 200), (30, 200)]) == [[0], [1, 2, 3]]
@@ -0,0 +1,148 @@
+import gc
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+
+
+class FakeSummarizer:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.lengths = []
+        self.fail = fail
+
+    def __call__(self, texts, batch_size, truncation, max_length, min_length, do_sample):
+        self.calls.append(list(texts))
+        self.lengths.append((min_length, max_length))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        time.sleep(0.05)
+        return [{"summary_text": t.upper()} for t in texts]
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeSummarizer()
+    entry = (model, threading.Lock())
+    monkeypatch.setattr(summarize, "_get_entry", lambda *a, **k: entry)
+    monkeypatch.setattr(summarize, "_BATCHERS", {})
+    monkeypatch.setattr(summarize, "OFFLINE_MICROBATCH_WAIT_MS", 100)
+    monkeypatch.setattr(summarize, "OFFLINE_MICROBATCH_MAX_SIZE", 8)
+    return model
+
+
+def _concurrently(jobs, batch_size=1, lengths=None, stagger=0.0):
+    barrier = threading.Barrier(len(jobs))
+    results = [None] * len(jobs)
+    errors = []
+
+    def one(k):
+        barrier.wait()
+        time.sleep(stagger * k)
+        try:
+            results[k] = summarize._summarize_batched(jobs[k], *(lengths[k] if lengths else (10, 50)), batch_size)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=one, args=(k,)) for k in range(len(jobs))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_forward_passes(fake_model):
+    jobs = [[f"doc{k} chunk{j}" for j in range(2)] for k in range(4)]
+    results, errors = _concurrently(jobs)
+    assert not errors
+    assert results == [[c.upper() for c in job] for job in jobs]
+    assert len(fake_model.calls) < 8  # fewer passes than one per chunk
+    assert max(len(c) for c in fake_model.calls) > 1
+
+
+def test_lone_caller_keeps_its_batch_size(fake_model):
+    assert summarize._summarize_batched(["a", "bb", "ccc"], 10, 50, 2) == ["A", "BB", "CCC"]
+    assert [len(c) for c in fake_model.calls] == [2, 1]
+
+
+def test_model_errors_reach_every_caller(fake_model):
+    fake_model.fail = True
+    _, errors = _concurrently([["x"], ["y"]])
+    assert len(errors) == 2 and all("exploded" in str(e) for e in errors)
+
+
+def test_callers_arriving_together_share_one_pass(fake_model):
+    results, errors = _concurrently([["a"], ["b"], ["c"], ["d"]], stagger=0.01)
+    assert not errors
+    assert [len(c) for c in fake_model.calls] == [4]
+
+
+def test_callers_with_different_lengths_never_share_a_pass(fake_model):
+    results, errors = _concurrently([["short"], ["long"], ["also short"]], lengths=[(30, 200), (120, 180), (30, 200)])
+    assert not errors
+    assert results == [["SHORT"], ["LONG"], ["ALSO SHORT"]]
+    passes = dict(zip(map(tuple, fake_model.lengths), fake_model.calls))
+    assert sorted(passes[(30, 200)]) == ["also short", "short"]
+    assert passes[(120, 180)] == ["long"]
+
+
+def test_scheduler_does_not_keep_evicted_model_alive(monkeypatch):
+    registry = {"model": (FakeSummarizer(), threading.Lock())}
+    monkeypatch.setattr(summarize, "_get_entry", lambda *a, **k: registry["model"])
+    monkeypatch.setattr(summarize, "_BATCHERS", {})
+    monkeypatch.setattr(summarize, "OFFLINE_MICROBATCH_WAIT_MS", 5)
+    assert summarize._summarize_batched(["x"], 10, 50, 1) == ["X"]
+
+    ref = weakref.ref(registry.pop("model")[0])
+    time.sleep(0.05)  # scheduler is back to waiting for work
+    gc.collect()
+    assert ref() is None
+
+
+def _with_timeout(fn, seconds=5.0):
+    out = []
+
+    def call():
+        try:
+            out.append((fn(), None))
+        except Exception as e:
+            out.append((None, e))
+
+    t = threading.Thread(target=call, daemon=True)
+    t.start()
+    t.join(seconds)
+    assert out, "call never returned"
+    result, error = out[0]
+    if error is not None:
+        raise error
+    return result
+
+
+def test_empty_submission_leaves_the_scheduler_running(fake_model):
+    assert _with_timeout(lambda: summarize._summarize_batched([], 10, 50, 2)) == []
+    assert summarize._get_batcher(None).submit([], 2) == []
+    assert _with_timeout(lambda: summarize._summarize_batched(["a"], 10, 50, 2)) == ["A"]
+
+
+def test_scheduler_errors_fail_the_round_not_the_thread(fake_model, monkeypatch):
+    run_round = summarize._MicroBatcher._run_round
+    broken = [True]
+
+    def flaky(self, taken):
+        if broken.pop() if broken else False:
+            raise KeyError("scheduler bug")
+        run_round(self, taken)
+
+    monkeypatch.setattr(summarize._MicroBatcher, "_run_round", flaky)
+    with pytest.raises(KeyError):
+        _with_timeout(lambda: summarize._summarize_batched(["a"], 10, 50, 2))
+    assert _with_timeout(lambda: summarize._summarize_batched(["b"], 10, 50, 2)) == ["B"]
@@ -0,0 +1,31 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+
+
+def test_idle_models_are_evicted_but_busy_ones_are_kept(monkeypatch):
+    monkeypatch.setattr(summarize, "_REGISTRY", {})
+    monkeypatch.setattr(summarize, "_LAST_USED", {})
+    monkeypatch.setattr(summarize, "_MODEL_EVENTS", {"loads": 0, "unloads": 0})
+    idle, busy, fresh = ("idle", -1, "torch"), ("busy", -1, "torch"), ("fresh", -1, "torch")
+    for key in (idle, busy, fresh):
+        summarize._REGISTRY[key] = (object(), threading.Lock())
+    summarize._LAST_USED.update({idle: time.monotonic() - 600, busy: time.monotonic() - 600, fresh: time.monotonic()})
+
+    with summarize._REGISTRY[busy][1]:  # mid-inference
+        assert summarize.evict_idle(300) == 1
+    assert set(summarize._REGISTRY) == {busy, fresh}
+
+    stats = summarize.model_stats()
+    assert stats["unloads"] == 1
+    assert set(stats["loaded"]) == {"busy@torch", "fresh@torch"}
+    assert stats["rss_bytes"] is None or stats["rss_bytes"] > 0
+
+    assert summarize.unload_models() == 2
+    assert summarize._REGISTRY == {}
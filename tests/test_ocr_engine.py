@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.ocr_reader as ocr_reader
+
+
+def _fake_tesserocr(inits, fail_langs=()):
+    class PyTessBaseAPI:
+        def __init__(self, lang, oem):
+            if lang in fail_langs:
+                raise RuntimeError(f"Failed to init API for {lang}")
+            inits.append(lang)
+            self.lang = lang
+
+        def SetVariable(self, name, value):
+            return True
+
+        def SetPageSegMode(self, psm):
+            self.psm = psm
+
+        def SetImage(self, img):
+            time.sleep(0.02)
+            self.img = img
+
+        def Recognize(self, timeout):
+            return True
+
+        def GetUTF8Text(self):
+            return f"{self.img} {self.lang} psm{self.psm}"
+
+        def AllWordConfidences(self):
+            return [90, 80, -1]
+
+        def Clear(self):
+            pass
+
+        def End(self):
+            pass
+
+    return types.SimpleNamespace(PyTessBaseAPI=PyTessBaseAPI, OEM=types.SimpleNamespace(DEFAULT=3))
+
+
+def test_handles_are_pooled_per_language(monkeypatch):
+    inits = []
+    monkeypatch.setitem(sys.modules, "tesserocr", _fake_tesserocr(inits))
+    engine = ocr_reader.TesserocrEngine(pool_size=2)
+
+    assert engine.recognize("page", "eng", 6) == ocr_reader.OcrResult("page eng psm6", 85.0)
+    assert engine.recognize("page", "eng", 3).text == "page eng psm3"
+    assert inits == ["eng"]  # traineddata loaded once, not per call
+
+    threads = [threading.Thread(target=engine.recognize, args=("page", "hin", 6)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 <= inits.count("hin") <= 2
+
+
+def test_in_process_failure_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", _fake_tesserocr([], fail_langs={"guj"}))
+    engine = ocr_reader.TesserocrEngine()
+    monkeypatch.setattr(ocr_reader, "get_engine", lambda name=None: engine if name is None else fallback)
+    fallback = types.SimpleNamespace(
+        name="pytesseract", recognize=lambda img, lang, psm, timeout: ocr_reader.OcrResult(f"cli {lang}", 50.0)
+    )
+
+    assert ocr_reader._tesseract("page", "eng", 6).text == "page eng psm6"
+    assert ocr_reader._tesseract("page", "guj", 6).text == "cli guj"
+
+
+def _slow_passes(monkeypatch, outputs, delays, calls=None):
+    def fake(img, lang, psm, deadline=None):
+        if calls is not None:
+            calls.append((lang, psm))
+        time.sleep(delays.get(lang, 0.05))
+        return outputs.get(lang, ocr_reader.OcrResult("garbled text here", 30.0))
+
+    monkeypatch.setattr(ocr_reader, "_tesseract", fake)
+    monkeypatch.setattr(ocr_reader, "_OCR_EXECUTOR", None)
+    monkeypatch.setattr(ocr_reader, "OCR_MAX_WORKERS", 4)
+    monkeypatch.setattr(ocr_reader.os, "cpu_count", lambda: 4)
+
+
+PASSES = [(f"eng+{g}", p) for g in ("hin", "guj", "ben", "mar", "tam", "tel") for p in (6, 3)]
+
+
+def test_candidate_passes_run_concurrently_and_stop_when_confident(monkeypatch):
+    calls = []
+    hindi = ocr_reader.OcrResult("नमस्ते दुनिया " * 5, 91.0)
+    _slow_passes(monkeypatch, {"eng+hin": hindi}, {"eng+tel": 0.3}, calls)
+
+    t0 = time.perf_counter()
+    assert ocr_reader._best_pass("img", PASSES, ocr_reader.OcrResult("short", 20.0)) == hindi
+    assert time.perf_counter() - t0 < 0.3  # neither sequential nor waiting on the slow candidate
+    assert len(calls) < len(PASSES)
+
+
+def test_deadline_returns_best_result_so_far(monkeypatch):
+    good = ocr_reader.OcrResult("partly readable notes", 70.0)
+    _slow_passes(monkeypatch, {"eng+hin": good}, {"eng+hin": 0.01, "eng+guj": 0.01, "eng+ben": 0.01, "eng+mar": 5.0})
+
+    t0 = time.perf_counter()
+    assert ocr_reader._best_pass("img", PASSES, deadline=time.monotonic() + 0.3) == good
+    assert time.perf_counter() - t0 < 1.0
+    assert ocr_reader._best_pass("img", PASSES, good, deadline=time.monotonic() - 1) == good
+
+
+def test_ties_go_to_the_earlier_pass_and_empty_text_ranks_last(monkeypatch):
+    monkeypatch.setattr(
+        ocr_reader, "_tesseract",
+        lambda img, lang, psm, deadline=None: ocr_reader.OcrResult(f"{lang} text" if lang != "eng+ccc" else "", 99.0),
+    )
+    monkeypatch.setattr(ocr_reader, "_OCR_EXECUTOR", None)
+    monkeypatch.setattr(ocr_reader, "OCR_CONFIDENCE_STOP", 101)
+    best = ocr_reader._best_pass("img", [("eng+ccc", 6), ("eng+aaa", 6), ("eng+bbb", 6)])
+    assert best.text == "eng+aaa text"
+
+
+class FakeEngine:
+    name = "fake"
+
+    def __init__(self, script, outputs):
+        self.script = script
+        self.outputs = outputs
+
+    def detect_script(self, img, timeout):
+        return self.script, 5.0
+
+    def recognize(self, img, lang, psm, timeout):
+        return ocr_reader.OcrResult(self.outputs.get(lang, ""), 60.0)
+
+
+def _ocr_with(monkeypatch, engine):
+    monkeypatch.setattr(ocr_reader, "_cv2_preprocess_screen", lambda path: types.SimpleNamespace(size=(800, 600)))
+    monkeypatch.setattr(ocr_reader, "get_engine", lambda name=None: engine)
+    monkeypatch.setattr(ocr_reader, "_OCR_EXECUTOR", None)
+    monkeypatch.setattr(ocr_reader, "_STATS", dict.fromkeys(ocr_reader._STATS, 0))
+    return ocr_reader.extract_text_from_image("page.png", lang="auto"), ocr_reader.ocr_stats()
+
+
+def test_detected_script_needs_only_its_own_passes(monkeypatch):
+    hindi = "प्रकाश संश्लेषण पौधों में ऊर्जा बनाने की प्रक्रिया है " * 2
+    text, stats = _ocr_with(monkeypatch, FakeEngine("Devanagari", {"eng+hin": hindi}))
+    assert text == hindi
+    assert stats["passes"] == 2
+    assert stats["script_detected"] == stats["script_confirmed"] == 1
+
+
+def test_unconfirmed_script_falls_back_to_candidate_search(monkeypatch):
+    bengali = "সালোকসংশ্লেষণ উদ্ভিদের খাদ্য তৈরির প্রক্রিয়া " * 2
+    text, stats = _ocr_with(monkeypatch, FakeEngine("Gujarati", {"eng+guj": "1l|", "eng+ben": bengali}))
+    assert text == bengali
+    assert stats["script_rejected"] == 1 and stats["script_confirmed"] == 0
+    assert stats["passes"] > 2
+
+
+def test_image_to_data_rows_become_text_and_mean_confidence():
+    data = {
+        "text": ["", "Cell", "biology", "", "Mitochondria", "make", "ATP"],
+        "conf": ["-1", "96", "90", "-1", "80.5", "85", "90.5"],
+        "block_num": [1, 1, 1, 2, 2, 2, 2],
+        "par_num": [1, 1, 1, 1, 1, 1, 1],
+        "line_num": [1, 1, 1, 1, 1, 1, 2],
+    }
+    result = ocr_reader._result_from_data(data)
+    assert result.text == "Cell biology\n\nMitochondria make\nATP"
+    assert result.confidence == 88.4
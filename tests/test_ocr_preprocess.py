@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+import core.ocr_reader as ocr_reader
+
+
+def _page(tmp_path, name, noise=0.0, tint=(1.0, 1.0, 1.0)):
+    img = np.full((600, 1200, 3), 250, np.uint8)
+    for k in range(8):
+        cv2.putText(img, "Mitochondria produce ATP for the cell", (30, 60 + 65 * k),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (20, 20, 20), 2, cv2.LINE_AA)
+    rng = np.random.default_rng(1)
+    img = np.clip(img * np.array(tint) + rng.normal(0, noise, img.shape), 0, 255).astype(np.uint8)
+    path = tmp_path / f"{name}.png"
+    cv2.imwrite(path.as_posix(), img)
+    return path
+
+
+def test_auto_picks_profile_from_image_statistics(tmp_path):
+    def pick(path):
+        return ocr_reader.choose_profile(ocr_reader._image_stats(cv2.imread(path.as_posix())))
+
+    assert pick(_page(tmp_path, "scan")) == "scan"
+    assert pick(_page(tmp_path, "photo", noise=4, tint=(0.8, 0.85, 0.95))) == "fast"
+    assert pick(_page(tmp_path, "screen", noise=16, tint=(0.85, 0.9, 1.0))) == "screen"
+
+
+@pytest.mark.parametrize("profile", ["fast", "scan", "auto"])
+def test_profiles_return_upscaled_grayscale(tmp_path, profile):
+    pil = ocr_reader._cv2_preprocess_screen(_page(tmp_path, "p", noise=4).as_posix(), profile)
+    assert pil.mode == "L"
+    assert pil.size == (2040, 1020)  # min side < 900, so scaled by 1.7
+
+
+def test_unknown_profile_is_rejected_and_gamma_lut_is_reused(tmp_path):
+    with pytest.raises(ValueError):
+        ocr_reader._cv2_preprocess_screen("missing.png", "sharpen")
+    assert ocr_reader._gamma_lut(1 / 1.3) is ocr_reader._gamma_lut(1 / 1.3)
+    assert ocr_reader._gamma_lut(1 / 1.3)[0] == 0 and ocr_reader._gamma_lut(1 / 1.3)[255] == 255
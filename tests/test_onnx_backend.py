@@ -0,0 +1,113 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+from core.summarize import RuntimeProfile, _atomic_build, _model_id, _resolve_backend, onnx_model_path
+
+
+class _Saved:
+    def __init__(self, files):
+        self.files = files
+
+    def save_pretrained(self, out):
+        for name in self.files:
+            (Path(out) / name).write_text(name, encoding="utf-8")
+
+
+@pytest.fixture
+def fake_optimum(monkeypatch):
+    """optimum, onnxruntime.quantization and AutoTokenizer stand-ins; records exports."""
+    exports = []
+
+    class ORTModelForSeq2SeqLM:
+        @staticmethod
+        def from_pretrained(src, export=False):
+            exports.append(Path(src))
+            return _Saved(["config.json", "encoder_model.onnx", "decoder_model.onnx"])
+
+    def quantize_dynamic(src, dst, weight_type):
+        Path(dst).write_text("int8:" + Path(src).read_text(encoding="utf-8"), encoding="utf-8")
+
+    ort = types.ModuleType("optimum.onnxruntime")
+    ort.ORTModelForSeq2SeqLM = ORTModelForSeq2SeqLM
+    quant = types.ModuleType("onnxruntime.quantization")
+    quant.quantize_dynamic = quantize_dynamic
+    quant.QuantType = types.SimpleNamespace(QInt8="QInt8")
+    transformers = types.ModuleType("transformers")
+    transformers.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda src: _Saved(["tokenizer.json"]))
+    monkeypatch.setitem(sys.modules, "optimum", types.ModuleType("optimum"))
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", ort)
+    monkeypatch.setitem(sys.modules, "onnxruntime", types.ModuleType("onnxruntime"))
+    monkeypatch.setitem(sys.modules, "onnxruntime.quantization", quant)
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+    return exports
+
+
+def test_backend_names_are_validated(monkeypatch):
+    assert _resolve_backend("ONNX-INT8") == "onnx-int8"
+    monkeypatch.setattr(summarize, "OFFLINE_BACKEND", "onnx")
+    assert _resolve_backend(None) == "onnx"
+    with pytest.raises(ValueError, match="Unknown offline backend 'tensorrt'"):
+        _resolve_backend("tensorrt")
+
+
+def test_atomic_build_renames_a_finished_temp_dir(tmp_path):
+    target = tmp_path / "model-onnx"
+    seen = []
+
+    def build(out):
+        seen.append(out)
+        assert out != target and not target.exists()
+        (out / "config.json").write_text("{}", encoding="utf-8")
+
+    assert _atomic_build(target, build) == target
+    assert (target / "config.json").exists()
+    assert _atomic_build(target, build) == target and len(seen) == 1  # built once
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model-onnx"]
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path):
+    target = tmp_path / "model-onnx"
+
+    def build(out):
+        (out / "encoder_model.onnx").write_text("partial", encoding="utf-8")
+        raise RuntimeError("export crashed")
+
+    with pytest.raises(RuntimeError, match="export crashed"):
+        _atomic_build(target, build)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_onnx_export_and_quantization_are_cached(tmp_path, fake_optimum):
+    src = tmp_path / "distilbart"
+    src.mkdir()
+    onnx_dir = onnx_model_path(model_dir=src)
+    int8_dir = onnx_model_path(quantize=True, model_dir=src)
+    assert onnx_model_path(quantize=True, model_dir=src) == int8_dir
+    assert fake_optimum == [src]  # exported once, reused by the int8 build
+
+    assert onnx_dir.name == "distilbart-onnx" and int8_dir.name == "distilbart-onnx-int8"
+    assert (int8_dir / "encoder_model.onnx").read_text(encoding="utf-8").startswith("int8:")
+    assert (int8_dir / "tokenizer.json").exists() and (int8_dir / "config.json").exists()
+
+
+def test_missing_optimum_is_a_clear_error(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", None)
+    with pytest.raises(RuntimeError, match="pip install optimum"):
+        onnx_model_path(model_dir=tmp_path)
+
+
+def test_cache_keys_differ_per_backend_and_precision(monkeypatch):
+    monkeypatch.setattr(summarize, "_PROFILE", RuntimeProfile())
+    ids = {b: _model_id(b) for b in ("torch", "onnx", "onnx-int8", "api")}
+    assert ids["torch"] == ids["api"] == summarize.MODEL_NAME
+    assert len({ids["torch"], ids["onnx"], ids["onnx-int8"]}) == 3
+
+    monkeypatch.setattr(summarize, "_PROFILE", RuntimeProfile(precision="int8"))
+    assert _model_id("torch") not in ids.values()
@@ -44,7 +44,9 @@ def test_centralized_output_directory():
     
     print("\n✅ All applications are using the same centralized output directory!")
     
-    # Verify the directory exists
+    # The directory is created on first export rather than at import time
+    from core.export_pdf import _new_canvas
+    _new_canvas("summary.pdf")
     output_path = Path(OUTPUT_DIR)
     assert output_path.exists(), f"Output directory {output_path} does not exist"
     print(f"✅ Output directory {output_path} exists!")
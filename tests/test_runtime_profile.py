@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+from core.summarize import RuntimeProfile, calibration_candidates, load_runtime_profile, save_runtime_profile
+
+
+def test_saved_profile_round_trips_and_wins_over_config(tmp_path):
+    path = tmp_path / "profile.json"
+    assert load_runtime_profile(path) == RuntimeProfile(0, 0, "fp32")  # config defaults
+
+    save_runtime_profile(RuntimeProfile(3, 1, "int8"), path, seconds=1.5)
+    assert load_runtime_profile(path) == RuntimeProfile(3, 1, "int8")
+    assert json.loads(path.read_text())["seconds"] == 1.5
+
+
+def test_profile_from_another_machine_or_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"intra_op_threads": 2, "inter_op_threads": 1, "precision": "bf16",
+                                "cpu_count": (os.cpu_count() or 1) + 1}))
+    assert load_runtime_profile(path).precision == "fp32"
+    path.write_text("{not json")
+    assert load_runtime_profile(path).precision == "fp32"
+
+
+def test_candidates_cover_grid_and_reject_unknown_precision():
+    profiles = calibration_candidates([4, 2], [1], ["fp32", "int8"])
+    assert len(profiles) == 4
+    assert {p.precision for p in profiles} == {"fp32", "int8"}
+    with pytest.raises(ValueError):
+        calibration_candidates([1], [1], ["fp16"])
+
+
+def test_cache_identity_depends_on_precision(monkeypatch):
+    monkeypatch.setattr(summarize, "_PROFILE", RuntimeProfile(0, 0, "fp32"))
+    assert summarize._model_id("torch") == summarize.MODEL_NAME
+    monkeypatch.setattr(summarize, "_PROFILE", RuntimeProfile(0, 0, "int8"))
+    assert summarize._model_id("torch").endswith("@torch-int8")
+    assert summarize._model_id("api") == summarize.MODEL_NAME
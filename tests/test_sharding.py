@@ -0,0 +1,79 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import core.summarize as summarize
+from core.summarize import _iter_sharded, _resolve_workers, auto_worker_count
+
+
+class ThreadPool(ThreadPoolExecutor):
+    """Stands in for the spawn-based process pool."""
+
+    def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+        super().__init__(max_workers=max_workers)
+
+
+def fake_worker(chunks, min_length, max_length, batch_size, backend, lengths=None):
+    # later shards finish first, so completion order differs from document order
+    time.sleep(0.1 * (10 - int(chunks[0].split()[1])) / 10)
+    return [c.upper() for c in chunks]
+
+
+@pytest.fixture
+def stub_pool(monkeypatch):
+    monkeypatch.setattr(summarize, "ProcessPoolExecutor", ThreadPool)
+    monkeypatch.setattr(summarize, "_worker_summarize", fake_worker)
+    monkeypatch.setattr(summarize, "get_model_path", lambda: None)
+    monkeypatch.setattr(summarize, "_POOL", None)
+    monkeypatch.setattr(summarize, "_POOL_KEY", None)
+    monkeypatch.setattr(summarize, "_POOL_USERS", {})
+    yield
+    summarize.shutdown_workers()
+
+
+def test_worker_count_resolution(monkeypatch):
+    assert _resolve_workers(None) == 1
+    assert _resolve_workers(3) == _resolve_workers(" 3 ") == 3
+    assert _resolve_workers(0) == _resolve_workers("0") == _resolve_workers("lots") == 1
+
+    monkeypatch.setattr(summarize.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(summarize, "_available_ram", lambda: None)
+    assert auto_worker_count() == _resolve_workers("AUTO") == 4
+    monkeypatch.setattr(summarize, "_available_ram", lambda: 2 * summarize._WORKER_RAM_BYTES)
+    assert auto_worker_count() == 2
+    monkeypatch.setattr(summarize, "_available_ram", lambda: 1)
+    monkeypatch.setattr(summarize.os, "cpu_count", lambda: None)
+    assert auto_worker_count() == 1
+
+
+def test_shards_keep_indices_and_report_progress(stub_pool):
+    chunks = [f"chunk {i}" for i in range(10)]
+    progress = []
+    results = list(_iter_sharded(chunks, 5, 20, 2, 3, lambda s, d, t: progress.append((d, t)), backend="torch"))
+
+    assert sorted(i for i, _ in results) == list(range(10))
+    assert [i for i, _ in results] != list(range(10))  # completion order, not document order
+    assert all(s == chunks[i].upper() for i, s in results)
+    assert [d for d, _ in progress] == sorted(d for d, _ in progress) and progress[-1] == (10, 10)
+    assert summarize._POOL_ACTIVE == 0 and summarize._POOL_USERS == {}
+
+
+def test_pool_in_use_is_not_replaced_under_its_users(stub_pool):
+    chunks = [f"chunk {i}" for i in range(6)]
+    first = _iter_sharded(chunks, 5, 20, 1, 2, backend="torch")
+    got = [next(first)]
+    old = summarize._POOL
+
+    # a different worker count needs a new pool while `first` is still running
+    assert len(list(_iter_sharded(chunks, 5, 20, 1, 3, backend="torch"))) == 6
+    assert summarize._POOL is not old and not old._shutdown
+
+    got += list(first)
+    assert sorted(i for i, _ in got) == list(range(6))
+    assert old._shutdown and old not in summarize._POOL_USERS
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("requests")
+
+import core.hf_client as hf_client
+import core.summarize as summarize
+from core.summarize import summarize_iter, summarize_text
+
+
+def _notes(n):
+    return " ".join(f"Sentence {i} talks about topic {i % 7} in some detail." for i in range(n))
+
+
+@pytest.fixture
+def reversed_api(monkeypatch):
+    """HF client that answers the last chunk first, echoing each chunk's first word pair."""
+
+    def summarize_many(self, chunks, min_length, max_length, lengths=None):
+        for j in reversed(range(len(chunks))):
+            yield j, " ".join(chunks[j].split()[:2])
+
+    monkeypatch.setattr(hf_client.HFInferenceClient, "summarize_many", summarize_many)
+    # stay in online mode (word-sized chunks, no local tokenizer) for a long text
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_WORDS", 10 ** 6)
+    monkeypatch.setattr(summarize, "ONLINE_MODE_MAX_CHARS", 10 ** 7)
+
+
+def test_results_carry_index_and_source_offsets(reversed_api):
+    text = _notes(120)
+    results = list(summarize_iter(text, 5, 20, {"mode": "online", "api_key": "x", "cache": False}))
+
+    assert [r.index for r in results] == list(range(len(results)))[::-1] and len(results) > 1
+    ordered = sorted(results, key=lambda r: r.index)
+    assert ordered[0].start == 0 and ordered[-1].end == len(text)
+    for prev, cur in zip(ordered, ordered[1:]):
+        assert prev.end <= cur.start
+    for r in ordered:
+        assert r.summary == " ".join(text[r.start:r.end].split()[:2])
+
+    joined = summarize_text(text, 5, 20, {"mode": "online", "api_key": "x", "cache": False})
+    assert joined == " ".join(r.summary for r in ordered)
+
+
+def test_offsets_map_back_through_precompression(reversed_api):
+    text = _notes(120)
+    config = {"mode": "online", "api_key": "x", "cache": False, "compress_ratio": 0.5}
+    ordered = sorted(summarize_iter(text, 5, 20, config), key=lambda r: r.index)
+
+    for prev, cur in zip(ordered, ordered[1:]):
+        assert prev.end <= cur.start
+    for r in ordered:
+        assert 0 <= r.start < r.end <= len(text)
+        assert text[r.start:].startswith(r.summary)
+
+
+@pytest.mark.parametrize("ratio", [0, -0.5, 1.5])
+def test_compress_ratio_outside_unit_interval_is_rejected(reversed_api, ratio):
+    config = {"mode": "online", "api_key": "x", "cache": False, "compress_ratio": ratio}
+    with pytest.raises(ValueError, match="compress_ratio"):
+        summarize_text(_notes(20), 5, 20, config)
@@ -0,0 +1,102 @@
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.summary_cache import SummaryCache
+
+
+def test_key_depends_on_all_parameters():
+    base = SummaryCache.make_key("chunk", "model", 30, 200, "offline")
+    assert base == SummaryCache.make_key("chunk", "model", 30, 200, "offline")
+    assert base != SummaryCache.make_key("chunk!", "model", 30, 200, "offline")
+    assert base != SummaryCache.make_key("chunk", "other", 30, 200, "offline")
+    assert base != SummaryCache.make_key("chunk", "model", 31, 200, "offline")
+    assert base != SummaryCache.make_key("chunk", "model", 30, 201, "offline")
+    assert base != SummaryCache.make_key("chunk", "model", 30, 200, "online")
+
+
+def test_hits_misses_and_persistence(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SummaryCache(path, max_bytes=1024 * 1024)
+    assert cache.get("k") is None
+    cache.put("k", "summary")
+    assert cache.get("k") == "summary"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    reopened = SummaryCache(path, max_bytes=1024 * 1024)
+    assert reopened.get("k") == "summary"
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = SummaryCache(tmp_path / "cache.sqlite3", max_bytes=250)
+    for k in ("a", "b", "c"):
+        cache.put(k, "x" * 99)  # 100 bytes each with the key
+    assert cache.get("a") is None  # oldest entry evicted
+    assert cache.get("b") is not None
+    cache.put("d", "x" * 99)  # "c" is now least recently used
+    assert cache.get("c") is None
+    assert cache.get("b") is not None
+    assert cache.stats()["bytes"] <= 250
+    assert cache.stats()["evictions"] == 2
+
+
+def test_processes_sharing_the_file_agree_on_size(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = SummaryCache(path, max_bytes=250)
+    second = SummaryCache(path, max_bytes=250)
+    second.stats()  # both connections open before anything is written
+    first.put("a", "x" * 99)
+    first.put("b", "x" * 99)
+    second.put("c", "x" * 99)  # second never saw a or b being written
+    assert first.get("a") is None
+    assert first.stats()["bytes"] == second.stats()["bytes"] == 200
+
+
+def test_hits_batch_recency_writes(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SummaryCache(path, max_bytes=1024 * 1024)
+    cache.put("k", "summary")
+
+    def used():
+        with sqlite3.connect(path.as_posix()) as db:
+            return db.execute("SELECT used FROM summaries WHERE key = 'k'").fetchone()[0]
+
+    before = used()
+    assert cache.get("k") == "summary"
+    assert used() == before  # no write per hit
+    cache.flush()
+    assert used() > before
+
+
+def test_sqlite_errors_are_misses(tmp_path, caplog):
+    path = tmp_path / "cache.sqlite3"
+    path.write_bytes(b"not a database" * 100)
+    cache = SummaryCache(path, max_bytes=1024 * 1024)
+    with caplog.at_level(logging.WARNING, logger="core.summary_cache"):
+        assert cache.get("k") is None
+        cache.put("k", "summary")
+    assert cache.misses == 1
+    assert "Summary cache" in caplog.text
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+    cache.clear()
+
+
+def test_size_is_not_summed_on_every_put(tmp_path):
+    cache = SummaryCache(tmp_path / "cache.sqlite3", max_bytes=10_000)
+    cache.put("warm", "up")
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    for i in range(20):
+        cache.put(f"k{i}", "x" * 40)
+    assert not [q for q in statements if "SUM(" in q]
+
+    cache.put("big", "x" * 10_000)  # over budget: re-read the total, then evict
+    assert [q for q in statements if "SUM(" in q] and cache.evictions > 0
+    assert cache.stats()["bytes"] <= 10_000
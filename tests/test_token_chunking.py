@@ -0,0 +1,67 @@
+import re
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.summarize import _chunk_token_budget, _iter_token_chunk_spans
+
+
+def _offsets(text):
+    """Whitespace tokens, with long words split into 4-character pieces like subwords."""
+    out = []
+    for m in re.finditer(r"\S+", text):
+        out += [(a, min(a + 4, m.end())) for a in range(m.start(), m.end(), 4)]
+    return out
+
+
+def _check(text, budget):
+    offsets = _offsets(text)
+    spans = list(_iter_token_chunk_spans(text, offsets, budget))
+    starts = [a for a, _ in offsets]
+    for chunk, a, b in spans:
+        assert chunk == text[a:b]
+        assert len([s for s in starts if a <= s < b]) <= budget
+    # consecutive spans tile the tokens: nothing dropped, nothing repeated
+    covered = [s for _, a, b in spans for s in starts if a <= s < b]
+    assert covered == starts
+    return spans
+
+
+def test_unpunctuated_run_longer_than_budget():
+    text = "\t" + " ".join(f"word{i}" for i in range(200))  # two tokens per word
+    spans = _check(text, 25)
+    assert len(spans) >= 400 // 25
+    # cut between words, never inside one
+    assert all(not text[b:b + 1].strip() for _, _, b in spans[:-1])
+
+    glued = "x" * 500  # no whitespace at all: cut exactly at the budget
+    assert [b - a for _, a, b in _check(glued, 30)] == [120, 120, 120, 120, 20]
+
+
+def test_spans_map_back_and_prefer_sentence_ends():
+    text = " ".join(f"Sentence number {i} has a few words in it." for i in range(40))
+    spans = _check(text, 50)
+    assert all(chunk.endswith(".") for chunk, _, _ in spans)
+    assert text.find(spans[0][0]) == spans[0][1]
+
+    lines = "\n".join(f"heading {i} no punctuation here" for i in range(40))
+    assert all(chunk.endswith("here") for chunk, _, _ in _check(lines, 30))
+
+
+class _Tokenizer:
+    model_max_length = 64
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+
+def test_every_chunk_fits_the_window():
+    tokenizer = _Tokenizer()
+    budget = _chunk_token_budget(tokenizer)
+    assert budget + tokenizer.num_special_tokens_to_add() <= tokenizer.model_max_length
+    text = " ".join(("supercalifragilistic" if i % 5 == 0 else "a b.") for i in range(500))
+    for max_tokens in (16, budget, 1000):
+        assert _check(text, max_tokens)
+    assert list(_iter_token_chunk_spans("   ", [], 16)) == [("", 3, 3)]